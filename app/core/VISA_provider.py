@@ -3,8 +3,24 @@ import pyvisa
 from typing import Optional, Union, Type
 from types import TracebackType
 import logging
+import threading
 import time
 
+_rm_lock = threading.Lock()
+_resource_manager = None
+
+def get_resource_manager() -> pyvisa.ResourceManager:
+    """
+    Общий ResourceManager для всего приложения.
+    Создание менеджера загружает бэкенд и опрашивает транспорты, поэтому
+    он создаётся один раз при первом обращении и дальше переиспользуется.
+    """
+    global _resource_manager
+    with _rm_lock:
+        if _resource_manager is None:
+            _resource_manager = pyvisa.ResourceManager()
+        return _resource_manager
+
 class VISError(Exception):
     """Базовое исключение для ошибок VISA"""
     pass
@@ -27,7 +43,7 @@ class VISAProvider:
             'timeout': 5000,  # таймаут в мс
             'read_terminator': '\n',
             'write_terminator': '\n',
-            'chunk_size': 4096,
+            'chunk_size': 1024 * 1024,  # крупные блоки осциллограмм читаются за меньшее число вызовов
             'query_delay': 0.1
         }
     }
@@ -36,7 +52,7 @@ class VISAProvider:
                  logger: Optional[logging.Logger] = None, **kwargs):
         self.resource_name = resource_name
         self.device_type = device_type
-        self.rm = pyvisa.ResourceManager()
+        self.rm = get_resource_manager()
         self.session = None
         self.is_connected = False
         self.settings = self.DEFAULT_SETTINGS.get(device_type, {}).copy()
@@ -99,9 +99,18 @@ class DataManager:
     
     def parse_file(self, subject_code, file_path, analysis_index):
         """Парсинг файла и добавление в данные предмета"""
+        success, result = self.read_file(file_path)
+        if not success:
+            return False, result
+        return self.store_file_data(subject_code, file_path, analysis_index, result)
+    
+    @staticmethod
+    def read_file(file_path):
+        """
+        Чтение файла данных без изменения состояния DataManager: можно вызывать
+        из пула потоков. Возвращает (True, {'channels', 'params'}) или (False, текст ошибки)
+        """
         try:
-            self.initialize_subject(subject_code)
-            
             file_format = file_path.split('.')[-1].lower()
             
             # СОЗДАЕМ НОВЫЙ ПАРСЕР ДЛЯ КАЖДОГО ФАЙЛА - это исправляет баг с общими каналами
@@ -114,29 +123,43 @@ class DataManager:
             file_name = os.path.basename(file_path)
             file_name_without_ext = file_name.split('.')[0]
             
-            # Пытаемся извлечь параметры из имени файла
-            params = self.extract_params_from_filename(file_name_without_ext)
+            logger.debug(f"Файл {file_name} прочитан. Каналы: {list(data_parser.get_channel_names())}")
+            
+            return True, {
+                'channels': {
+                    channel_name: channel
+                    for channel_name, channel in data_parser.channels.items()
+                    if channel.amplitude.size
+                },
+                # Пытаемся извлечь параметры из имени файла
+                'params': DataManager.extract_params_from_filename(file_name_without_ext)
+            }
+            
+        except Exception as e:
+            logger.error(f"Ошибка при загрузке файла {file_path}: {str(e)}")
+            return False, f'Ошибка при загрузке файла: {str(e)}'
+    
+    def store_file_data(self, subject_code, file_path, analysis_index, file_data):
+        """Добавление прочитанного файла (результат read_file) в данные предмета"""
+        try:
+            self.initialize_subject(subject_code)
+            
+            file_name = os.path.basename(file_path)
             
             # Сохраняем данные анализа
-            self.subjects_data[subject_code]['analyses'][analysis_index] = {
+            analysis_data = {
                 'path': file_path,
                 'original_file_name': file_name,
                 'file_name': file_name,
-                'channels': {},
-                'params': params
+                'channels': file_data['channels'],
+                'params': file_data['params']
             }
             
-            for channel_name in data_parser.get_channel_names():
-                channel = data_parser.get_channel(channel_name)
-                if channel and not channel.data.empty:
-                    self.subjects_data[subject_code]['analyses'][analysis_index]['channels'][channel_name] = channel
-            
             # Создаём процессор для файла
-            self.subjects_data[subject_code]['analyses'][analysis_index]['processor'] = Processor(
-                self.subjects_data[subject_code]['analyses'][analysis_index]
-            )
+            analysis_data['processor'] = Processor(analysis_data)
+            self.subjects_data[subject_code]['analyses'][analysis_index] = analysis_data
             
-            logger.debug(f"Файл {file_name} загружен. Каналы: {list(data_parser.get_channel_names())}")
+            logger.debug(f"Файл {file_name} загружен. Каналы: {list(analysis_data['channels'])}")
             
             return True, file_name
             
@@ -144,7 +167,8 @@ class DataManager:
             logger.error(f"Ошибка при загрузке файла {file_path}: {str(e)}")
             return False, f'Ошибка при загрузке файла: {str(e)}'
     
-    def extract_params_from_filename(self, filename):
+    @staticmethod
+    def extract_params_from_filename(filename):
         """Извлечение параметров из имени файла"""
         parts = filename.split('_')
         
@@ -218,17 +242,15 @@ class DataManager:
             for channel_name, channel_obj in channels_data.items():
                 try:
                     # Извлекаем данные из объекта канала прибора
-                    if hasattr(channel_obj, 'data') and channel_obj.data is not None:
-                        df = channel_obj.data
-                        
+                    if hasattr(channel_obj, 'amplitude') and channel_obj.amplitude is not None:
                         # Проверяем, что данные не пустые
-                        if not df.empty and len(df.columns) >= 2:
+                        if channel_obj.amplitude.size and channel_obj.time.size:
                             # СОЗДАЕМ КАНАЛ В ФОРМАТЕ parser.Channel
                             channel = Channel(channel_name)
                             
-                            # Извлекаем время и амплитуду (первые две колонки)
-                            time_data = df.iloc[:, 0]
-                            amplitude_data = df.iloc[:, 1]
+                            # Извлекаем время и амплитуду
+                            time_data = channel_obj.time
+                            amplitude_data = channel_obj.amplitude
                             
                             # Устанавливаем данные в канал
                             channel.set_data(time_data, amplitude_data)
@@ -250,9 +272,9 @@ class DataManager:
                             
                             logger.debug(f"Канал {channel_name} обработан: {len(time_data)} точек")
                         else:
-                            logger.warning(f"Канал {channel_name}: пустые данные или недостаточно колонок")
+                            logger.warning(f"Канал {channel_name}: пустые данные")
                     else:
-                        logger.warning(f"Канал {channel_name}: нет данных или атрибута 'data'")
+                        logger.warning(f"Канал {channel_name}: нет данных канала")
                         
                 except Exception as e:
                     logger.error(f"Ошибка обработки канала {channel_name}: {str(e)}")
@@ -476,8 +498,7 @@ class DataManager:
                     # Восстанавливаем данные каналов
                     channels = {}
                     for channel_name, channel_data in analysis_info['channels_data'].items():
-                        channel = type('Channel', (), {})()
-                        channel.name = channel_data['name']
+                        channel = Channel(channel_data['name'])
                         channel.data = pd.DataFrame(channel_data['data'])
                         channels[channel_name] = channel
                     
@@ -523,10 +544,10 @@ class DataManager:
             # ЛОГИРУЕМ ДАННЫЕ ПРИ ЗАПРОСЕ
             logger.debug(f"=== ДАННЫЕ АНАЛИЗА ПРИ ЗАПРОСЕ: {subject_code}, {analysis_index} ===")
             for channel_name, channel in analysis_data['channels'].items():
-                if hasattr(channel, 'data'):
-                    logger.debug(f"Канал {channel_name}: shape={channel.data.shape}, empty={channel.data.empty}")
+                if hasattr(channel, 'amplitude'):
+                    logger.debug(f"Канал {channel_name}: points={channel.amplitude.size}")
                 else:
-                    logger.warning(f"Канал {channel_name}: нет атрибута data")
+                    logger.warning(f"Канал {channel_name}: нет данных канала")
             
             return analysis_data
         return None
@@ -3,10 +3,79 @@ from typing import Dict, Any, Callable
 from functools import wraps
 
 import numpy as np
+import pandas as pd
 
 import logging
 logger = logging.getLogger(__name__)
 
+SMOOTHING_WINDOW = 15  # Окно скользящего среднего в точках
+
+
+def _trailing_mean(values: np.ndarray, window: int, out: np.ndarray,
+                   absolute: bool = False) -> np.ndarray:
+    """
+    Скользящее среднее по окну [i, i + window) вдоль последней оси.
+    
+    Эквивалентно values[::-1].rolling(window, min_periods=1).mean()[::-1],
+    но считается сдвинутыми сложениями numpy без построения Series и без
+    прогрева при первом вызове. На хвосте массива окно укорачивается до
+    оставшихся точек. Накопление идёт в out, он же возвращается.
+    
+    Как и в pandas, NaN пропускаются: среднее берётся по числам окна,
+    а NaN получается только там, где в окне нет ни одного числа.
+    
+    При absolute=True усредняется модуль значений: он пишется сразу
+    в рабочий буфер, отдельный массив под np.abs не создаётся.
+    """
+    n = values.shape[-1]
+    padded = np.zeros(values.shape[:-1] + (n + window - 1,), dtype=np.float64)
+    if absolute:
+        np.abs(values, out=padded[..., :n])
+    else:
+        padded[..., :n] = values
+    
+    # Пропуски считаются нулями, делим на число настоящих точек в окне
+    valid = ~np.isnan(padded)
+    valid[..., n:] = False
+    has_nan = not valid[..., :n].all()
+    if has_nan:
+        padded[~valid] = 0.0
+    
+    out[...] = padded[..., :n]
+    for shift in range(1, window):
+        out += padded[..., shift:shift + n]
+    
+    if not has_nan:
+        out /= np.minimum(window, n - np.arange(n))
+        return out
+    
+    counts = valid[..., :n].astype(np.int64)
+    for shift in range(1, window):
+        counts += valid[..., shift:shift + n]
+    np.divide(out, counts, out=out, where=counts > 0)
+    out[counts == 0] = np.nan
+    return out
+
+
+def _level_bands(amplitude: np.ndarray, freqs: np.ndarray, level) -> tuple:
+    """
+    Границы полосы, в которой амплитуда не ниже level, для каждой строки матрицы.
+    
+    level может быть числом или столбцом (каналы, 1). Нижняя граница - первая
+    точка выше уровня, верхняя - последняя. Для строк, где уровень нигде не
+    достигнут, полоса и границы равны нулю.
+    
+    Возвращает (ширины полос, нижние частоты, верхние частоты).
+    """
+    above = amplitude >= level
+    has_band = above.any(axis=1)
+    points_num = above.shape[1]
+    
+    low_freqs = np.where(has_band, freqs[above.argmax(axis=1)], 0.0)
+    high_freqs = np.where(has_band, freqs[points_num - 1 - above[:, ::-1].argmax(axis=1)], 0.0)
+    return high_freqs - low_freqs, low_freqs, high_freqs
+
+
 class Processor:
     '''
     Description
@@ -58,6 +127,7 @@ class Processor:
         self.params = data['params']
         self._cache = {}
         self._precomputed = {}  # Для данных, не зависящих от параметров
+        self._scratch = []  # Предвыделенные буферы АЧХ по блокам каналов
         self._rounding_precision = 12
         self._update_derived_params()
 
@@ -105,11 +175,55 @@ class Processor:
         self._update_derived_params()
         
         # Сбрасываем только тот кэш, который зависит от параметров
-        keys_to_clear = ['cropped_data', 'freq_response', 'channel_parameters']
+        keys_to_clear = ['cropped_data', 'smoothedplot', 'freq_response', 'freqresponse_linear', 'freqresponse_dB',
+                         'channel_parameters']
         for key in keys_to_clear:
             if key in self._cache:
                 del self._cache[key]
     
+    def detached_copy(self) -> 'Processor':
+        """
+        Копия процессора для пересчёта в фоновом потоке.
+        
+        Каналы и уже посчитанные данные разделяются с исходным процессором,
+        а параметры, словари кэша и буферы АЧХ у копии свои: пока она
+        пересчитывается, исходный процессор можно читать из потока GUI.
+        Результат пересчёта забирается методом adopt.
+        """
+        clone = Processor.__new__(Processor)
+        clone.channels = dict(self.channels)
+        clone.params = dict(self.params)
+        clone._cache = dict(self._cache)
+        clone._precomputed = dict(self._precomputed)
+        clone._scratch = [
+            {key: np.empty_like(buffer) for key, buffer in scratch.items()}
+            for scratch in self._scratch
+        ]
+        clone._rounding_precision = self._rounding_precision
+        clone._update_derived_params()
+        return clone
+    
+    def adopt(self, clone: 'Processor'):
+        """Перенос параметров и кэша пересчитанной копии (detached_copy), вызывается в потоке GUI"""
+        self.params.update(clone.params)
+        self._update_derived_params()
+        self._cache = clone._cache
+        self._precomputed = clone._precomputed
+        self._scratch = clone._scratch
+    
+    def precompute(self):
+        """
+        Заполнение кэша данными для графиков и таблиц.
+        
+        Позволяет выполнить тяжёлый расчёт заранее, например в фоновом
+        потоке, после чего свойства процессора возвращают готовые данные.
+        """
+        self._precompute_raw_extremums()
+        self._get_channel_parameters()
+        # Округлённые данные графиков кэшируются при первом обращении
+        self.rawplot
+        self.smoothedplot
+    
     def set_signal_start_channel(self, channel_name: str):
         """Установка канала для определения начала сигнала"""
         if channel_name in self.channels:
@@ -117,8 +231,14 @@ class Processor:
             # Сбрасываем кэш, зависящий от начала сигнала
             if 'cropped_data' in self._cache:
                 del self._cache['cropped_data']
+            if 'smoothedplot' in self._cache:
+                del self._cache['smoothedplot']
             if 'freq_response' in self._cache:
                 del self._cache['freq_response']
+            if 'freqresponse_linear' in self._cache:
+                del self._cache['freqresponse_linear']
+            if 'freqresponse_dB' in self._cache:
+                del self._cache['freqresponse_dB']
             if 'channel_parameters' in self._cache:
                 del self._cache['channel_parameters']
         
@@ -132,25 +252,55 @@ class Processor:
         self.gain = self.params.get('gain', 7)
         self.bandwidth = self.end_freq - self.start_freq
 
+    def _amplitude_blocks(self):
+        """
+        Амплитуды каналов, сгруппированные для векторной обработки.
+        
+        Каналы одинаковой длины (обычный случай для одного файла) складываются
+        в одну матрицу (каналы, точки), чтобы сглаживание и поиск экстремумов
+        выполнялись одним вызовом numpy сразу для всех каналов. Каналы другой
+        длины попадают в свои матрицы.
+        
+        Возвращает список пар (имена каналов, матрица амплитуд).
+        """
+        if 'amplitude_blocks' in self._precomputed:
+            return self._precomputed['amplitude_blocks']
+        
+        groups = {}
+        for name, channel in self.channels.items():
+            amplitude = channel.amplitude
+            groups.setdefault(len(amplitude), []).append((name, amplitude))
+        
+        blocks = [
+            ([name for name, _ in group], np.vstack([amplitude for _, amplitude in group]))
+            for group in groups.values()
+        ]
+        
+        self._precomputed['amplitude_blocks'] = blocks
+        return blocks
+
     def _precompute_raw_extremums(self):
         """Предварительное вычисление экстремумов исходных данных"""
         if 'raw_extremums' in self._precomputed:
             return self._precomputed['raw_extremums']
             
-        raw_extremums = {}
-        for name, channel in self.channels.items():
-            amplitude = channel.data['Амплитуда'].values
-            max_amp = np.max(amplitude)
-            min_amp = np.min(amplitude)
-            maxamp_idx = np.argmax(amplitude)
-            minamp_idx = np.argmin(amplitude)
+        extremums_by_name = {}
+        for names, block in self._amplitude_blocks():
+            max_amps = block.max(axis=1)
+            min_amps = block.min(axis=1)
+            maxamp_idxs = block.argmax(axis=1)
+            minamp_idxs = block.argmin(axis=1)
             
-            raw_extremums[name] = {
-                'max_amp': max_amp,
-                'min_amp': min_amp,
-                'maxamp_idx': maxamp_idx,
-                'minamp_idx': minamp_idx
-            }
+            for row, name in enumerate(names):
+                extremums_by_name[name] = {
+                    'max_amp': max_amps[row],
+                    'min_amp': min_amps[row],
+                    'maxamp_idx': maxamp_idxs[row],
+                    'minamp_idx': minamp_idxs[row]
+                }
+        
+        # Сохраняем исходный порядок каналов
+        raw_extremums = {name: extremums_by_name[name] for name in self.channels}
         
         self._precomputed['raw_extremums'] = raw_extremums
         return raw_extremums
@@ -160,13 +310,12 @@ class Processor:
         Заранее подготавливает сглаженные данные для всех каналов.
         
         Этот метод:
-        1. Создает копию исходных данных для каждого канала
-        2. Добавляет столбец с абсолютными значениями амплитуд
-        3. Применяет скользящее среднее для сглаживания данных
-        4. Сохраняет результат в кэш, чтобы не вычислять повторно
+        1. Применяет скользящее среднее к модулю амплитуд каждого канала
+        2. Сохраняет результат в кэш, чтобы не вычислять повторно
+        3. Возвращает словарь {имя канала: массив сглаженных амплитуд}
         
         Особенности:
-        - Использует обратный порядок данных для корректного сглаживания
+        - Окно сглаживания смотрит вперёд: точка усредняется с последующими
         - Работает одинаково при любых параметрах обработки
         - Выполняется один раз при первом обращении
         
@@ -174,22 +323,33 @@ class Processor:
         Этот метод автоматически вызывается при работе других методов класса
         когда требуются сглаженные данные.
         """
-        if 'smoothed_data' in self._precomputed:
-            return self._precomputed['smoothed_data']
+        if 'smoothed' in self._precomputed:
+            return self._precomputed['smoothed']
             
-        smoothed_data = {}
-        for name, channel in self.channels.items():
-            data_copy = channel.data.copy()
-            data_copy['ABS_Amplitude'] = np.abs(data_copy['Амплитуда'])
-            data_copy['Smoothed'] = (
-                data_copy['ABS_Amplitude'][::-1]
-                .rolling(window=15, min_periods=1)
-                .mean()[::-1]
+        # Сглаживаем сразу все каналы одинаковой длины одним вызовом
+        smoothed_blocks = []
+        smoothed_rows = {}
+        self._scratch = []
+        for names, block in self._amplitude_blocks():
+            smoothed_block = _trailing_mean(
+                block, SMOOTHING_WINDOW, np.empty(block.shape, dtype=np.float64),
+                absolute=True
             )
-            smoothed_data[name] = data_copy
+            smoothed_blocks.append((names, smoothed_block))
+            for row, name in enumerate(names):
+                smoothed_rows[name] = smoothed_block[row]
+            
+            # Буферы под АЧХ выделяются один раз, при пересчёте пишем в них на месте
+            self._scratch.append({
+                'linear': np.empty(block.shape, dtype=smoothed_block.dtype),
+                'db': np.empty(block.shape, dtype=smoothed_block.dtype)
+            })
         
-        self._precomputed['smoothed_data'] = smoothed_data
-        return smoothed_data
+        smoothed = {name: smoothed_rows[name] for name in self.channels}
+        
+        self._precomputed['smoothed_blocks'] = smoothed_blocks
+        self._precomputed['smoothed'] = smoothed
+        return smoothed
 
     def _get_signal_start_index(self):
         """
@@ -209,30 +369,29 @@ class Processor:
         """
         logger.debug("=== НАЧАЛО _get_signal_start_index ===")
     
-        smoothed_data = self._precompute_smoothed_data()
-        if not smoothed_data:
-            logger.error("Нет smoothed_data для определения начала сигнала")
+        if not self.channels:
+            logger.error("Нет каналов для определения начала сигнала")
             return 0
         
         # Используем выбранный канал для определения начала сигнала
-        if self.params['signal_start_channel'] not in smoothed_data:
-            logger.error(f"Канал {self.params['signal_start_channel']} не найден в smoothed_data")
+        if self.params['signal_start_channel'] not in self.channels:
+            logger.error(f"Канал {self.params['signal_start_channel']} не найден среди каналов")
             return 0
             
-        signal_channel = smoothed_data[self.params['signal_start_channel']]
-        total_points = len(signal_channel)
+        signal_channel = self.channels[self.params['signal_start_channel']]
+        total_points = len(signal_channel.time)
         
         # Находим индекс максимального значения
-        max_idx = signal_channel['Амплитуда'].idxmax()
-        max_amp = signal_channel['Амплитуда'].max()
+        max_idx = int(np.nanargmax(signal_channel.amplitude))
+        max_amp = signal_channel.amplitude[max_idx]
         logger.debug(f"Максимальная амплитуда: {max_amp} на индексе {max_idx}")
         
         # Применяем смещение cut_second с защитой от выхода за границы
-        if len(signal_channel) < 2:
+        if total_points < 2:
             logger.error("Недостаточно данных для вычисления time_step")
             return 0
             
-        time_step = signal_channel['Время'].iloc[1] - signal_channel['Время'].iloc[0]
+        time_step = signal_channel.time[1] - signal_channel.time[0]
         offset_points = int(self.cut_second / time_step) if time_step > 0 else 0
         
         # ЗАЩИТА: не позволяем signal_start выйти за границы массива
@@ -259,31 +418,30 @@ class Processor:
         """
         logger.debug("=== НАЧАЛО _get_cropped_indices ===")
     
-        smoothed_data = self._precompute_smoothed_data()
-        if not smoothed_data:
-            logger.error("Нет smoothed_data для вычисления индексов")
+        if not self.channels:
+            logger.error("Нет каналов для вычисления индексов")
             return 0, 0
         
         # Используем выбранный канал для определения начала сигнала
-        if self.params['signal_start_channel'] not in smoothed_data:
-            logger.error(f"Канал {self.params['signal_start_channel']} не найден в smoothed_data")
+        if self.params['signal_start_channel'] not in self.channels:
+            logger.error(f"Канал {self.params['signal_start_channel']} не найден среди каналов")
             return 0, 0
             
-        signal_channel = smoothed_data[self.params['signal_start_channel']]
-        total_points = len(signal_channel)
+        signal_channel = self.channels[self.params['signal_start_channel']]
+        total_points = len(signal_channel.time)
         
         logger.debug(f"Используем канал: {self.params['signal_start_channel']}")
-        logger.debug(f"Данные канала shape: {signal_channel.shape}")
+        logger.debug(f"Точек в канале: {total_points}")
         
         # Вычисление signal_start с защитой
         signal_start = self._get_signal_start_index()
         
         # Вычисление time_step
-        if len(signal_channel) < 2:
+        if total_points < 2:
             logger.error("Недостаточно данных для вычисления time_step")
             return 0, 0
             
-        time_step = signal_channel['Время'].iloc[1] - signal_channel['Время'].iloc[0]
+        time_step = signal_channel.time[1] - signal_channel.time[0]
         
         # ВЫЧИСЛЕНИЕ МАКСИМАЛЬНО ВОЗМОЖНОГО points_to_crop
         max_possible_points = total_points - signal_start
@@ -318,18 +476,23 @@ class Processor:
         - Данные берутся из предварительно сглаженных значений
         
         Пример использования:
-        Этот метод автоматически вызывается при обращении к свойству cropped_data
-        или при расчете частотной характеристики.
+        Этот метод вызывается при обращении к свойству cropped_data.
+        Внутренние расчёты работают со срезами массивов и таблицы не строят.
         """
         if 'cropped_data' in self._cache:
             return self._cache['cropped_data']
             
-        smoothed_data = self._precompute_smoothed_data()
+        smoothed = self._precompute_smoothed_data()
         signal_start, points_to_crop = self._get_cropped_indices()
+        crop = slice(signal_start, signal_start + points_to_crop)
         
         cropped_data = {
-            name: data.iloc[signal_start:signal_start + points_to_crop]
-            for name, data in smoothed_data.items()
+            name: pd.DataFrame({
+                'Время': channel.time[crop],
+                'Амплитуда': channel.amplitude[crop],
+                'Smoothed': smoothed[name][crop]
+            }, index=pd.RangeIndex(crop.start, crop.start + len(channel.time[crop])))
+            for name, channel in self.channels.items()
         }
         
         self._cache['cropped_data'] = cropped_data
@@ -345,9 +508,17 @@ class Processor:
         3. Рассчитывает АЧХ в линейном масштабе и в децибелах
         4. Применяет коэффициент усиления (gain) к амплитудам
         
-        Возвращает словарь с двумя вариантами АЧХ:
+        Каналы одной длины обрабатываются одной матрицей (каналы, точки).
+        Результаты записываются в буферы self._scratch без новых аллокаций,
+        поэтому массивы предыдущего расчёта перезаписываются при следующем.
+        Наружу эти массивы не отдаются: свойства freqresponse_linear и
+        freqresponse_dB возвращают округлённые копии.
+        
+        Возвращает словарь с вариантами АЧХ:
         - 'linear': данные в линейном масштабе (амплитуда)
         - 'dB': данные в логарифмическом масштабе (децибелы)
+        - 'linear_blocks': список (имена каналов, частоты, матрица амплитуд)
+          для пакетного расчёта параметров
         
         Пример использования:
         Этот метод автоматически вызывается при обращении к свойствам
@@ -356,30 +527,47 @@ class Processor:
         if 'freq_response' in self._cache:
             return self._cache['freq_response']
             
-        cropped_data = self._get_cropped_data()
-        first_channel_data = list(cropped_data.values())[0]
-        # Вычисляем временное смещение
-        timeshifted = first_channel_data['Время'] - first_channel_data['Время'].iloc[0]
-
-        # Вычисляем частоты
-        freqs = self.start_freq + (self.bandwidth / self.record_time) * timeshifted
-        
-        freq_response_linear = {}
-        freq_response_dB = {}
-        for name, data in cropped_data.items():
-            amplitude_linear = data['Smoothed'].values * self.gain
-            freq_response_linear[name] = {
-                'freq': freqs.values,
-                'amplitude': amplitude_linear
-            }
-            freq_response_dB[name] = {
-                'freq': freqs.values,
-                'db_amplitude': 20 * np.log10(data['Smoothed'].values)
-            }
+        self._precompute_smoothed_data()
+        signal_start, points_to_crop = self._get_cropped_indices()
+        first_channel = next(iter(self.channels.values()))
+        first_channel_time = first_channel.time[signal_start:signal_start + points_to_crop]
+        smoothed_blocks = self._precomputed['smoothed_blocks']
+
+        # Частоты равномерно растут вместе со временем, поэтому строим их
+        # арифметической прогрессией без промежуточных Series
+        points_num = max(block[:, signal_start:signal_start + points_to_crop].shape[1]
+                         for _, block in smoothed_blocks)
+        time_step = first_channel_time[1] - first_channel_time[0] if len(first_channel_time) > 1 else 0.0
+        freq_slope = self.bandwidth / self.record_time
+        freqs = self.start_freq + (freq_slope * time_step) * np.arange(points_num, dtype=np.float64)
+
+        linear_by_name = {}
+        db_by_name = {}
+        linear_blocks = []
+        for (names, smoothed_block), scratch in zip(smoothed_blocks, self._scratch):
+            smoothed = smoothed_block[:, signal_start:signal_start + points_to_crop]
+            n = smoothed.shape[1]
+            block_freqs = freqs[:n]
+            
+            linear_matrix = np.multiply(smoothed, self.gain, out=scratch['linear'][:, :n])
+            db_matrix = np.log10(smoothed, out=scratch['db'][:, :n])
+            db_matrix *= 20.0
+            linear_blocks.append((names, block_freqs, linear_matrix))
+            
+            for row, name in enumerate(names):
+                linear_by_name[name] = {
+                    'freq': block_freqs,
+                    'amplitude': linear_matrix[row]
+                }
+                db_by_name[name] = {
+                    'freq': block_freqs,
+                    'db_amplitude': db_matrix[row]
+                }
         
         self._cache['freq_response'] = {
-            'linear': freq_response_linear,
-            'dB': freq_response_dB
+            'linear': {name: linear_by_name[name] for name in self.channels},
+            'dB': {name: db_by_name[name] for name in self.channels},
+            'linear_blocks': linear_blocks
         }
         return self._cache['freq_response']
 
@@ -404,49 +592,34 @@ class Processor:
             return self._cache['channel_parameters']
             
         freq_data = self._get_freq_response_data()
-        linear_data = freq_data['linear']
-        channel_params = {}
+        params_by_name = {}
         
-        for name, data in linear_data.items():
-            amplitude = data['amplitude']
-            freq = data['freq']
-            
-            max_amp = np.max(amplitude)
-            max_amp_idx = np.argmax(amplitude)
-            resonance_freq = freq[max_amp_idx]
+        # Все каналы блока считаются одной матрицей: argmax и поиск границ
+        # полос выполняются по строкам без цикла по точкам в Python
+        for names, freqs, amplitude in freq_data['linear_blocks']:
+            max_amps = amplitude.max(axis=1)
+            resonance_freqs = freqs[amplitude.argmax(axis=1)]
             
-            half_power_level = max_amp * 0.707
-            above_half_power = amplitude >= half_power_level
-            if np.any(above_half_power):
-                low_idx = np.where(above_half_power)[0][0]
-                high_idx = np.where(above_half_power)[0][-1]
-                bandwidth_707 = freq[high_idx] - freq[low_idx]
-                bandwidth_707_range = (freq[low_idx], freq[high_idx])
-            else:
-                bandwidth_707 = 0
-                bandwidth_707_range = (0, 0)
+            bandwidths_707, lows_707, highs_707 = _level_bands(amplitude, freqs, max_amps[:, None] * 0.707)
+            bandwidths_fixed, lows_fixed, highs_fixed = _level_bands(amplitude, freqs, self.fixedlevel)
             
-            above_fixed_level = amplitude >= self.fixedlevel
-            if np.any(above_fixed_level):
-                low_idx_fixed = np.where(above_fixed_level)[0][0]
-                high_idx_fixed = np.where(above_fixed_level)[0][-1]
-                bandwidth_fixed = freq[high_idx_fixed] - freq[low_idx_fixed]
-                bandwidth_fixed_range = (freq[low_idx_fixed], freq[high_idx_fixed])
-            else:
-                bandwidth_fixed = 0
-                bandwidth_fixed_range = (0, 0)
-            
-            q_factor = resonance_freq / bandwidth_707 if bandwidth_707 > 0 else 0
+            q_factors = np.divide(
+                resonance_freqs, bandwidths_707,
+                out=np.zeros_like(resonance_freqs), where=bandwidths_707 > 0
+            )
             
-            channel_params[name] = {
-                'max_amplitude': max_amp*2, #NOTE : тут надо быть крайне аккуратным, т.к. с физической точки зрения мы ничего не сделали, а только умножили на 2 значение выводимое пользователю
-                'resonance_frequency': resonance_freq,
-                'bandwidth_707': bandwidth_707,
-                'bandwidth_707_range': bandwidth_707_range,
-                'bandwidth_fixed': bandwidth_fixed,
-                'bandwidth_fixed_range': bandwidth_fixed_range,
-                'q_factor': q_factor
-            }
+            for row, name in enumerate(names):
+                params_by_name[name] = {
+                    'max_amplitude': max_amps[row]*2, #NOTE : тут надо быть крайне аккуратным, т.к. с физической точки зрения мы ничего не сделали, а только умножили на 2 значение выводимое пользователю
+                    'resonance_frequency': resonance_freqs[row],
+                    'bandwidth_707': bandwidths_707[row],
+                    'bandwidth_707_range': (lows_707[row], highs_707[row]),
+                    'bandwidth_fixed': bandwidths_fixed[row],
+                    'bandwidth_fixed_range': (lows_fixed[row], highs_fixed[row]),
+                    'q_factor': q_factors[row]
+                }
+        
+        channel_params = {name: params_by_name[name] for name in self.channels}
         
         self._cache['channel_parameters'] = channel_params
         return channel_params
@@ -497,7 +670,17 @@ class Processor:
     @rounded_property
     def smoothed_data(self):
         """Сглаженные данные (не зависят от параметров)"""
-        return self._precompute_smoothed_data()
+        if 'smoothed_data' not in self._precomputed:
+            smoothed = self._precompute_smoothed_data()
+            self._precomputed['smoothed_data'] = {
+                name: pd.DataFrame({
+                    'Время': channel.time,
+                    'Амплитуда': channel.amplitude,
+                    'Smoothed': smoothed[name]
+                })
+                for name, channel in self.channels.items()
+            }
+        return self._precomputed['smoothed_data']
 
     @property
     @rounded_property
@@ -506,41 +689,50 @@ class Processor:
         return self._get_cropped_data()
 
     @property
-    @rounded_property
     def rawplot(self):
-        """Данные для исходного графика"""
-        raw_data = self.raw_data
-        return {
-            name: {
-                'time': data['Время'].values,
-                'amplitude': data['Амплитуда'].values
-            } for name, data in raw_data.items()
-        }
+        """
+        Данные для исходного графика. Округляются один раз: пока данные каналов
+        не менялись, возвращаются те же массивы и графики их повторно не передают
+        """
+        if 'rawplot' not in self._precomputed:
+            self._precomputed['rawplot'] = self._round_data({
+                name: {
+                    'time': channel.time,
+                    'amplitude': channel.amplitude
+                } for name, channel in self.channels.items()
+            })
+        return self._precomputed['rawplot']
 
     @property
-    @rounded_property
     def smoothedplot(self):
-        """Данные для графика сглаженных сигналов"""
-        cropped_data = self._get_cropped_data()
-        return {
-            name: {
-                'time': data['Время'].values - data['Время'].values[0],
-                'smoothed_amplitude': data['Smoothed'].values
-            } for name, data in cropped_data.items()
-        }
+        """Данные для графика сглаженных сигналов, округляются один раз на набор параметров"""
+        if 'smoothedplot' not in self._cache:
+            smoothed = self._precompute_smoothed_data()
+            signal_start, points_to_crop = self._get_cropped_indices()
+            crop = slice(signal_start, signal_start + points_to_crop)
+            self._cache['smoothedplot'] = self._round_data({
+                name: {
+                    'time': channel.time[crop] - channel.time[crop][0],
+                    'smoothed_amplitude': smoothed[name][crop]
+                } for name, channel in self.channels.items()
+            })
+        return self._cache['smoothedplot']
 
     @property
-    @rounded_property
     def freqresponse_linear(self):
-        """Данные для графика АЧХ в линейной шкале"""
-        freq_data = self._get_freq_response_data()
-        return freq_data['linear']
+        """Данные для графика АЧХ в линейной шкале, округляются один раз на расчёт АЧХ"""
+        if 'freqresponse_linear' not in self._cache:
+            freq_data = self._get_freq_response_data()
+            self._cache['freqresponse_linear'] = self._round_data(freq_data['linear'])
+        return self._cache['freqresponse_linear']
 
     @property
     def freqresponse_dB(self):
-        """Данные для графика АЧХ в дБ"""
-        freq_data = self._get_freq_response_data()
-        return freq_data['dB']
+        """Данные для графика АЧХ в дБ, округляются один раз на расчёт АЧХ"""
+        if 'freqresponse_dB' not in self._cache:
+            freq_data = self._get_freq_response_data()
+            self._cache['freqresponse_dB'] = self._round_data(freq_data['dB'])
+        return self._cache['freqresponse_dB']
 
     @property
     @rounded_property
@@ -550,9 +742,9 @@ class Processor:
     
     @property
     def analysis_start_time(self):
-        cropped_data = self._get_cropped_data()
-        first_channel = list(cropped_data.values())[0]
-        return first_channel['Время'].iloc[0]
+        signal_start, points_to_crop = self._get_cropped_indices()
+        first_channel = next(iter(self.channels.values()))
+        return first_channel.time[signal_start:signal_start + points_to_crop][0]
 
     @property
     @rounded_property
@@ -568,6 +760,22 @@ class Processor:
         extremums = self._precompute_raw_extremums()
         return {name: data['min_amp'] for name, data in extremums.items()}
 
+    def amp_bounds(self, channel_names=None):
+        """
+        Общие минимум и максимум амплитуды исходных данных каналов channel_names
+        (по умолчанию всех), None, если ни одного из них нет в процессоре
+        """
+        extremums = self._precompute_raw_extremums()
+        names = tuple(name for name in (extremums if channel_names is None else channel_names)
+                      if name in extremums)
+        bounds_cache = self._precomputed.setdefault('amp_bounds', {})
+        if names not in bounds_cache:
+            bounds_cache[names] = (
+                float(min(extremums[name]['min_amp'] for name in names)),
+                float(max(extremums[name]['max_amp'] for name in names))
+            ) if names else None
+        return bounds_cache[names]
+
     @property
     def raw_maxamp_idx(self):
         """Индексы максимальной амплитуды в исходных данных по каналам"""
@@ -3,13 +3,149 @@
 from modules.gwinstekprovider import GWInstekProvider
 from modules.tektronixprovider import TektronixProvider
 from modules.rigolprovider import RigolProvider
+from core.VISA_provider import get_resource_manager
 
 import time
-import pyvisa
+import threading
 import numpy as np
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
+MAX_PROBE_WORKERS = 16  # Максимум одновременных опросов *IDN?
+PROBE_TIMEOUT_MS = 500  # Таймаут ответа на *IDN? при обнаружении
+PROGRESS_INTERVAL_MS = 250  # Период обновления прогресса измерения
+
+# Провайдеры приборов по типу, который возвращает classify_idn.
+# Новый производитель подключается добавлением записи, без правки потоков
+GENERATOR_PROVIDERS = {
+    'rigol': RigolProvider,
+    'tektronix': TektronixProvider,
+}
+OSCILLOSCOPE_PROVIDERS = {
+    'gwinstek': GWInstekProvider,
+    'tektronix': TektronixProvider,
+}
+
+
+def create_provider(providers: dict, provider_type: str, resource, kind: str):
+    """Создание провайдера по типу из реестра, kind - название прибора для сообщения об ошибке"""
+    provider_class = providers.get(provider_type)
+    if provider_class is None:
+        raise ValueError(f"Неизвестный тип {kind}: {provider_type}")
+    return provider_class(resource)
+
+
+# Признаки типа прибора в ответе *IDN? по производителям, в порядке приоритета
+IDN_VENDORS = (
+    ('tektronix', 'tektronix', {
+        'oscilloscopes': ('mdo', 'dpo', 'tds'),
+        'generators': ('afg', 'fg'),
+    }),
+    ('rigol', 'rigol', {'generators': ()}),
+    ('gw', 'gwinstek', {'oscilloscopes': ()}),
+)
+
+
+@lru_cache(maxsize=256)
+def classify_idn(idn: str) -> tuple:
+    """
+    Определение типа прибора по ответу *IDN?.
+    
+    Возвращает (виды, провайдер), где виды - кортеж из 'oscilloscopes'
+    и/или 'generators'. Для неизвестного прибора - ((), None). Результат
+    кэшируется, так как при повторном обнаружении ответы те же.
+    """
+    idn_lower = idn.lower()
+    for vendor, provider, kinds in IDN_VENDORS:
+        if vendor not in idn_lower:
+            continue
+        # Пустой список моделей означает, что производитель выпускает только такие приборы
+        matched = tuple(
+            kind for kind, models in kinds.items()
+            if not models or any(model in idn_lower for model in models)
+        )
+        return matched, provider
+    return (), None
+
+
+def read_channels(oscilloscope, update_signal, check_cancel=lambda: None):
+    """
+    Чтение всех каналов осциллографа пулом потоков.
+    
+    Обмен с прибором провайдер сериализует своей блокировкой, а преобразование
+    принятых данных одного канала идёт одновременно с передачей следующего.
+    check_cancel вызывается перед чтением и после каждого канала и прерывает
+    чтение исключением, ещё не начатые чтения при этом отменяются.
+    Возвращает словарь {'CH1': Channel, ...} в порядке номеров каналов.
+    """
+    channels = list(range(1, oscilloscope.chnum + 1))
+    results = {}
+    if not channels:
+        return results
+    check_cancel()
+    
+    with ThreadPoolExecutor(max_workers=len(channels)) as executor:
+        # В лог пишем только о прочитанных каналах: сообщение о начале чтения
+        # пришло бы почти одновременно со стартом и лишь удваивало бы трафик сигналов
+        futures = {executor.submit(oscilloscope.get_channel_data, ch): ch for ch in channels}
+        
+        try:
+            for future in as_completed(futures):
+                check_cancel()
+                
+                ch = futures[future]
+                channel = future.result()
+                if channel:
+                    results[ch] = channel
+                    update_signal.emit(f"Канал {ch} прочитан")
+        except BaseException:
+            for pending in futures:
+                pending.cancel()
+            raise
+    
+    return {f"CH{ch}": results[ch] for ch in sorted(results)}
+
+
+class Cancelled(Exception):
+    """Работа потока остановлена через stop()"""
+    pass
+
+
+class CancellableRunner:
+    """
+    Примесь для рабочих потоков с отменой.
+    
+    stop() выставляет threading.Event, а поток проверяет его в точках отмены
+    через _check_cancel() или ждёт на нём через _sleep(). Оба способа бросают
+    Cancelled, поэтому run() обрабатывает остановку в одном месте, а приборы
+    отключают их менеджеры контекста.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stop_event = threading.Event()
+    
+    @property
+    def is_running(self):
+        return not self._stop_event.is_set()
+    
+    def _check_cancel(self):
+        """Точка отмены: бросает Cancelled, если вызван stop()"""
+        if self._stop_event.is_set():
+            raise Cancelled()
+    
+    def _sleep(self, timeout_ms):
+        """Ожидание без удержания GIL, прерывается сразу по stop()"""
+        if self._stop_event.wait(timeout_ms / 1000):
+            raise Cancelled()
+    
+    def stop(self):
+        """Запрос остановки потока"""
+        self._stop_event.set()
+
+
 class InstrumentDetectorThread(QThread):
     """Поток для асинхронного обнаружения приборов"""
     detection_finished = pyqtSignal(dict)
@@ -26,62 +162,58 @@ class InstrumentDetectorThread(QThread):
                 'generators': []
             }
             
-            rm = pyvisa.ResourceManager()
+            rm = get_resource_manager()
             resources = rm.list_resources()
             
-            for resource in resources:
-                try:
-                    # Пытаемся идентифицировать прибор
-                    instr = rm.open_resource(resource)
-                    instr.write('*IDN?')
-                    time.sleep(0.1)
-                    idn = instr.read()
-                    instr.close()
-                    
-                    # Анализируем ответ на идентификацию
-                    if 'tektronix' in idn.lower():
-                        # Проверяем, является ли осциллографом
-                        if any(model in idn.lower() for model in ['mdo', 'dpo', 'tds']):
-                            instruments['oscilloscopes'].append({
-                                'resource': resource,
-                                'idn': idn,
-                                'provider': 'tektronix'
-                            })
-                        # Проверяем, является ли генератором
-                        if any(model in idn.lower() for model in ['afg', 'fg']):
-                            instruments['generators'].append({
-                                'resource': resource,
-                                'idn': idn,
-                                'provider': 'tektronix'
-                            })
-                    
-                    elif 'rigol' in idn.lower():
-                        instruments['generators'].append({
-                            'resource': resource,
-                            'idn': idn,
-                            'provider': 'rigol'
-                        })
-                    
-                    elif 'gw' in idn.lower():
-                        instruments['oscilloscopes'].append({
-                            'resource': resource,
-                            'idn': idn,
-                            'provider': 'gwinstek'
-                        })
-                    
-                except Exception as e:
-                    # Пропускаем приборы, которые не отвечают на запрос идентификации
+            # Опрашиваем приборы параллельно: время обнаружения определяется
+            # самым медленным прибором, а не суммой всех опросов
+            idn_responses = []
+            if resources:
+                with ThreadPoolExecutor(max_workers=min(MAX_PROBE_WORKERS, len(resources))) as executor:
+                    futures = [executor.submit(self._probe, rm, resource) for resource in resources]
+                    idn_responses = [future.result() for future in futures]
+            
+            for response in idn_responses:
+                # Пропускаем приборы, которые не отвечают на запрос идентификации
+                if response is None:
                     continue
+                resource, idn = response
+                
+                # Анализируем ответ на идентификацию
+                kinds, provider = classify_idn(idn)
+                for kind in kinds:
+                    instruments[kind].append({
+                        'resource': resource,
+                        'idn': idn,
+                        'provider': provider
+                    })
             
             self.detection_finished.emit(instruments)
                     
         except Exception as e:
             self.detection_error.emit(f"Ошибка при обнаружении приборов: {str(e)}")
+    
+    @staticmethod
+    def _probe(rm, resource):
+        """Запрос идентификации одного прибора, возвращает (resource, idn) или None"""
+        try:
+            instr = rm.open_resource(resource)
+            try:
+                # query() возвращается сразу по символу окончания строки,
+                # поэтому фиксированная пауза между записью и чтением не нужна
+                instr.timeout = PROBE_TIMEOUT_MS
+                instr.read_termination = '\n'
+                idn = instr.query('*IDN?')
+            finally:
+                instr.close()
+            return resource, idn
+        except Exception:
+            return None
 
-class InstrumentWorker(QThread):
+class InstrumentWorker(CancellableRunner, QThread):
     """Рабочий поток для асинхронной работы с приборами"""
     update_signal = pyqtSignal(str)
-    progress_signal = pyqtSignal(int)
+    progress_signal = pyqtSignal(int, str)  # Процент и сообщение для лога одним сигналом
     finished_signal = pyqtSignal(dict)
     error_signal = pyqtSignal(str)
     
@@ -92,59 +224,30 @@ class InstrumentWorker(QThread):
         self.generator_type = generator_type
         self.oscilloscope_type = oscilloscope_type
         self.params = params
-        self.is_running = True
         
     def run(self):
         """Основной метод потока - выполнение измерения"""
+        # stage описывает текущий шаг для сообщения об ошибке, а выключение
+        # выхода и отключение приборов при любом исходе делают их менеджеры контекста
+        stage = "Ошибка подключения к генератору"
         try:
             self.update_signal.emit("Подключение к приборам...")
-            
-            # Подключаемся к генератору
-            try:
-                if self.generator_type == 'rigol':
-                    generator = RigolProvider(self.generator_resource)
-                elif self.generator_type == 'tektronix':
-                    generator = TektronixProvider(self.generator_resource)
-                else:
-                    raise ValueError(f"Неизвестный тип генератора: {self.generator_type}")
-                
-                generator.connect()
+            generator = create_provider(
+                GENERATOR_PROVIDERS, self.generator_type, self.generator_resource, "генератора"
+            )
+            with generator:
                 self.update_signal.emit(f"Подключено к генератору: {generator.model_name}")
-            except Exception as e:
-                self.error_signal.emit(f"Ошибка подключения к генератору: {str(e)}")
-                return
-                
-            # Подключаемся к осциллографу
-            try:
-                if self.oscilloscope_type == 'gwinstek':
-                    oscilloscope = GWInstekProvider(self.oscilloscope_resource)
-                elif self.oscilloscope_type == 'tektronix':
-                    oscilloscope = TektronixProvider(self.oscilloscope_resource)
-                else:
-                    raise ValueError(f"Неизвестный тип осциллографа: {self.oscilloscope_type}")
                 
-                oscilloscope.connect()
-                self.update_signal.emit(f"Подключено к осциллографу: {oscilloscope.model_name}")
-            except Exception as e:
-                generator.disconnect()
-                self.error_signal.emit(f"Ошибка подключения к осциллографа: {str(e)}")
-                return
-            
-            # Настраиваем генератор
-            try:
-                self.update_signal.emit("Настройка генератора...")
-                
-                if self.generator_type == 'rigol':
-                    generator.configure_sweep(
-                        start_freq=self.params['start_freq'],
-                        stop_freq=self.params['end_freq'],
-                        sweep_time=self.params['record_time'],
-                        function="SIN",
-                        amplitude=self.params['amplitude'],
-                        offset=self.params['offset']
-                    )
-                elif self.generator_type == 'tektronix':
-                    # Реализовать настройку для Tektronix при необходимости
+                stage = "Ошибка подключения к осциллографа"
+                oscilloscope = create_provider(
+                    OSCILLOSCOPE_PROVIDERS, self.oscilloscope_type, self.oscilloscope_resource, "осциллографа"
+                )
+                with oscilloscope:
+                    self.update_signal.emit(f"Подключено к осциллографу: {oscilloscope.model_name}")
+                    
+                    stage = "Ошибка настройки генератора"
+                    self.update_signal.emit("Настройка генератора...")
+                    # Синусоида - форма по умолчанию у всех генераторов
                     generator.configure_sweep(
                         start_freq=self.params['start_freq'],
                         stop_freq=self.params['end_freq'],
@@ -152,96 +255,63 @@ class InstrumentWorker(QThread):
                         amplitude=self.params['amplitude'],
                         offset=self.params['offset']
                     )
-                
-                self.update_signal.emit("Генератор настроен")
-            except Exception as e:
-                generator.disconnect()
-                oscilloscope.disconnect()
-                self.error_signal.emit(f"Ошибка настройки генератора: {str(e)}")
-                return
-            
-            # Запускаем генератор
-            try:
-                self.update_signal.emit("Запуск генератора...")
-                time.sleep(0.5)
-                generator.set_output(True)
-                self.update_signal.emit("Генератор запущен")
-            except Exception as e:
-                generator.disconnect()
-                oscilloscope.disconnect()
-                self.error_signal.emit(f"Ошибка запуска генератора: {str(e)}")
-                return
-            
-            # Ждем завершения измерения
-            try:
-                total_time = self.params['record_time']
-                step = 0.1  # шаг обновления прогресса (секунды)
-                
-                for i in range(int(total_time / step)):
-                    if not self.is_running:
-                        break
+                    self.update_signal.emit("Генератор настроен")
                     
-                    progress = min(100, int((i * step) / total_time * 100))
-                    self.progress_signal.emit(progress)
-                    self.update_signal.emit(f"Измерение... {progress}%")
-                    self.msleep(int(step * 1000))  # неблокирующая задержка
-                
-                if self.is_running:
-                    self.progress_signal.emit(100)
-                    self.update_signal.emit("Измерение завершено")
-            except Exception as e:
-                generator.set_output(False)
-                generator.disconnect()
-                oscilloscope.disconnect()
-                self.error_signal.emit(f"Ошибка во время измерения: {str(e)}")
-                return
-            
-            # Собираем данные с осциллографа
-            try:
-                self.update_signal.emit("Чтение данных с осциллографа...")
-                channels_data = {}
-                
-                for ch in range(1, oscilloscope.chnum + 1):
-                    if not self.is_running:
-                        break
+                    stage = "Ошибка запуска генератора"
+                    self.update_signal.emit("Запуск генератора...")
+                    # Пауза перед включением выхода прерывается по stop() сразу
+                    self._sleep(500)
+                    generator.set_output(True)
+                    self.update_signal.emit("Генератор запущен")
                     
-                    self.update_signal.emit(f"Чтение канала {ch}...")
-                    channel = oscilloscope.get_channel_data(ch)
-                    if channel:
-                        channels_data[f"CH{ch}"] = channel
-                        self.update_signal.emit(f"Канал {ch} прочитан")
-                
-                if self.is_running:
+                    stage = "Ошибка во время измерения"
+                    self._wait_for_sweep(self.params['record_time'])
+                    
+                    stage = "Ошибка чтения данных"
+                    self.update_signal.emit("Чтение данных с осциллографа...")
+                    channels_data = read_channels(oscilloscope, self.update_signal, self._check_cancel)
                     self.update_signal.emit("Все данные получены")
-            except Exception as e:
-                generator.set_output(False)
-                generator.disconnect()
-                oscilloscope.disconnect()
-                self.error_signal.emit(f"Ошибка чтения данных: {str(e)}")
-                return
+                    
+                    stage = "Ошибка при отключении приборов"
+            self.update_signal.emit("Приборы отключены")
+        except Cancelled:
+            self.update_signal.emit("Измерение остановлено, приборы отключены")
+            return
+        except Exception as e:
+            self.error_signal.emit(f"{stage}: {str(e)}")
+            return
+        
+        self.finished_signal.emit(channels_data)
+    
+    def _wait_for_sweep(self, total_time):
+        """Ожидание окончания развертки с выдачей прогресса, прерывается через stop()"""
+        deadline = time.monotonic() + total_time
+        last_progress = -1
+        
+        # Спим до дедлайна на событии остановки: поток просыпается
+        # только для обновления прогресса или сразу по stop()
+        while True:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                break
             
-            # Выключаем генератор и отключаемся
-            try:
-                generator.set_output(False)
-                generator.disconnect()
-                oscilloscope.disconnect()
-                self.update_signal.emit("Приборы отключены")
-            except Exception as e:
-                self.error_signal.emit(f"Ошибка при отключении приборов: {str(e)}")
-                return
+            self._sleep(min(PROGRESS_INTERVAL_MS, remaining_ms))
             
-            if self.is_running:
-                self.finished_signal.emit(channels_data)
-                
-        except Exception as e:
-            self.error_signal.emit(f"Неожиданная ошибка: {str(e)}")
+            elapsed = total_time - (deadline - time.monotonic())
+            progress = min(100, int(elapsed / total_time * 100))
+            if progress == last_progress:
+                continue
+            last_progress = progress
+            self.progress_signal.emit(progress, f"Измерение... {progress}%")
+        
+        self.progress_signal.emit(100, "Измерение завершено")
     
     def stop(self):
         """Остановка измерения"""
-        self.is_running = False
+        super().stop()
         self.update_signal.emit("Остановка измерения...")
 
-class OscilloscopeReaderThread(QThread):
+class OscilloscopeReaderThread(CancellableRunner, QThread):
     """Поток для чтения данных с осциллографа без измерения"""
     update_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(dict)
@@ -254,51 +324,27 @@ class OscilloscopeReaderThread(QThread):
         
     def run(self):
         """Основной метод потока - чтение данных с осциллографа"""
+        stage = "Ошибка подключения к осциллографу"
         try:
             self.update_signal.emit("Подключение к осциллографу...")
-            
-            # Подключаемся к осциллографу
-            try:
-                if self.oscilloscope_type == 'gwinstek':
-                    oscilloscope = GWInstekProvider(self.oscilloscope_resource)
-                elif self.oscilloscope_type == 'tektronix':
-                    oscilloscope = TektronixProvider(self.oscilloscope_resource)
-                else:
-                    raise ValueError(f"Неизвестный тип осциллографа: {self.oscilloscope_type}")
-                
-                oscilloscope.connect()
+            oscilloscope = create_provider(
+                OSCILLOSCOPE_PROVIDERS, self.oscilloscope_type, self.oscilloscope_resource, "осциллографа"
+            )
+            with oscilloscope:
                 self.update_signal.emit(f"Подключено к осциллографу: {oscilloscope.model_name}")
-            except Exception as e:
-                self.error_signal.emit(f"Ошибка подключения к осциллографу: {str(e)}")
-                return
-            
-            # Собираем данные с осциллографа
-            try:
-                self.update_signal.emit("Чтение данных с осциллографа...")
-                channels_data = {}
-                
-                for ch in range(1, oscilloscope.chnum + 1):
-                    self.update_signal.emit(f"Чтение канала {ch}...")
-                    channel = oscilloscope.get_channel_data(ch)
-                    if channel:
-                        channels_data[f"CH{ch}"] = channel
-                        self.update_signal.emit(f"Канал {ch} прочитан")
                 
+                stage = "Ошибка чтения данных"
+                self.update_signal.emit("Чтение данных с осциллографа...")
+                channels_data = read_channels(oscilloscope, self.update_signal, self._check_cancel)
                 self.update_signal.emit("Все данные получены")
-            except Exception as e:
-                oscilloscope.disconnect()
-                self.error_signal.emit(f"Ошибка чтения данных: {str(e)}")
-                return
-            
-            # Отключаемся
-            try:
-                oscilloscope.disconnect()
-                self.update_signal.emit("Осциллограф отключен")
-            except Exception as e:
-                self.error_signal.emit(f"Ошибка при отключении осциллографа: {str(e)}")
-                return
-            
-            self.finished_signal.emit(channels_data)
                 
+                stage = "Ошибка при отключении осциллографа"
+            self.update_signal.emit("Осциллограф отключен")
+        except Cancelled:
+            self.update_signal.emit("Чтение остановлено, осциллограф отключен")
+            return
         except Exception as e:
-            self.error_signal.emit(f"Неожиданная ошибка: {str(e)}")
\ No newline at end of file
+            self.error_signal.emit(f"{stage}: {str(e)}")
+            return
+        
+        self.finished_signal.emit(channels_data)
@@ -1,8 +1,40 @@
 # core/parser.py
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
 
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'  # Быстрое чтение xlsx на Rust
+except ImportError:
+    EXCEL_ENGINE = None  # Движок pandas по умолчанию (openpyxl)
+
+PARSE_CACHE_SIZE = 8  # Сколько последних разобранных файлов держать в памяти
+_PARSE_CACHE = OrderedDict()  # (путь, mtime, размер, тип) -> {имя канала: Channel}, массивы только для чтения
+_PARSE_CACHE_LOCK = threading.Lock()  # Файлы могут разбираться одновременно из пула потоков
+
+# Раскладка каналов на листе Excel по умолчанию (формат Tektronix):
+# 3 столбца метаданных, затем время и амплитуда
+DEFAULT_EXCEL_LAYOUTS = [
+    {
+        'metadata_cols': slice(0, 3),   # A:C
+        'time_col': 3,                  # D
+        'amplitude_col': 4              # E
+    },
+    {
+        'metadata_cols': slice(6, 9),   # G:I
+        'time_col': 9,                  # J
+        'amplitude_col': 10             # K
+    }
+]
+_LAYOUT_CACHE = {}  # сигнатура заголовка листа -> раскладка каналов
+
 @dataclass
 class ChannelMetadata:
     '''Метаданные канала осциллографа'''
@@ -18,34 +50,75 @@ class ChannelMetadata:
 class Channel:
     def __init__(self, name):
         self.name = name
-        self.data = pd.DataFrame(columns=['Время','Амплитуда'])
+        # Данные хранятся двумя непрерывными массивами, DataFrame строится только по запросу.
+        # Время в float64, чтобы шаг дискретизации не терял точность на длинных записях,
+        # амплитуда в float32 - разрядности АЦП осциллографа (8-12 бит) этого с запасом хватает
+        self.time = np.empty(0, dtype=np.float64)
+        self.amplitude = np.empty(0, dtype=np.float32)
+        self._data = None
         self.metadata = ChannelMetadata(channel_name=name)
         self.raw_metadata = {}
 
-    def set_data(self, time_data: pd.Series, amplitude_data: pd.Series):
+    def set_data(self, time_data, amplitude_data):
+        '''Принимает Series или массивы numpy, время хранится в float64, амплитуда в float32'''
+        self.time = np.ascontiguousarray(time_data, dtype=np.float64)
+        self.amplitude = np.ascontiguousarray(amplitude_data, dtype=np.float32)
+        self._data = None
 
-        self.data = pd.DataFrame({
-            'Время' : time_data.values,
-            'Амплитуда' : amplitude_data.values
-        })
+    def set_raw_data(self, raw_samples, time_step: float, scale: float = 1.0,
+                     offset: float = 0.0, raw_offset: float = 0.0):
+        '''
+        Заполнение канала отсчётами АЦП без промежуточных списков Python.
+        raw_samples - массив numpy или байты big-endian int16, как их передаёт осциллограф.
+        Амплитуда = (отсчёт - raw_offset) * scale + offset, время - сетка с шагом time_step.
+        '''
+        if isinstance(raw_samples, (bytes, bytearray, memoryview)):
+            raw_samples = np.frombuffer(raw_samples, dtype='>i2')
 
-    def set_metadata_from_dict(self, metadata_dict: Dict[str, Any]):
+        amplitude = np.asarray(raw_samples).astype(np.float32)
+        if raw_offset:
+            amplitude -= raw_offset
+        amplitude *= scale
+        if offset:
+            amplitude += offset
 
-        self.raw_metadata = metadata_dict
-        self.metadata = metadata_dict
+        self.set_data(np.arange(len(amplitude), dtype=np.float64) * time_step, amplitude)
 
-        for raw_key, value in metadata_dict.items():
-            if not isinstance(raw_key, str):
-                continue
+    @property
+    def data(self) -> pd.DataFrame:
+        '''Данные в виде DataFrame для кода, которому нужна таблица; массивы не копируются'''
+        if self._data is None:
+            self._data = pd.DataFrame({
+                'Время' : self.time,
+                'Амплитуда' : self.amplitude
+            }, copy=False)
+        return self._data
 
-            raw_key_lower = raw_key.lower()
+    @data.setter
+    def data(self, frame: pd.DataFrame):
+        self.set_data(frame.iloc[:, 0], frame.iloc[:, 1])
 
-            #временная заглушка т.к в расчётах метаданные не используются
-            #print(raw_key)
+    def copy(self) -> 'Channel':
+        '''
+        Новый канал с теми же массивами времени и амплитуды. Замена данных
+        или метаданных у копии не затрагивает исходный канал
+        '''
+        channel = Channel(self.name)
+        channel.time = self.time
+        channel.amplitude = self.amplitude
+        channel.metadata = copy.copy(self.metadata)
+        channel.raw_metadata = dict(self.raw_metadata)
+        return channel
 
+    def set_metadata_from_dict(self, metadata_dict: Dict[str, Any]):
+
+        #временная заглушка т.к в расчётах метаданные не используются,
+        #разбор полей в ChannelMetadata пока не нужен
+        self.raw_metadata = metadata_dict
+        self.metadata = metadata_dict
 
     def __repr__(self):
-        return f'Канал {self.name}, размер массива {len(self.data)}'
+        return f'Канал {self.name}, размер массива {len(self.time)}'
             
 
 
@@ -66,12 +139,37 @@ class DataParser:
             bool: успешность парсинга
         '''
         try:
+            # Неизменившийся файл повторно не разбираем: ключ включает время
+            # изменения и размер, так что перезаписанный файл будет прочитан заново
+            stat = os.stat(file_path)
+            cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, file_type)
+            with _PARSE_CACHE_LOCK:
+                cached_channels = _PARSE_CACHE.get(cache_key)
+                if cached_channels is not None:
+                    _PARSE_CACHE.move_to_end(cache_key)
+            if cached_channels is not None:
+                # Каждый вызов получает свои каналы, общими остаются только массивы
+                self.channels.update({name: channel.copy() for name, channel in cached_channels.items()})
+                return True
+
             if file_type == 'csv':
-                return self._parse_csv(file_path)
+                success = self._parse_csv(file_path)
             elif file_type == 'xlsx' or file_type == 'xls':
-                return self._parse_excel(file_path)
+                success = self._parse_excel(file_path)
             else:
                 raise ValueError(f'Неподдерживаемый формат файла: {file_type}')
+
+            if success:
+                # Массивы делятся между всеми, кто разберёт этот файл: запись
+                # на месте запрещена, менять данные канала можно только заменой массивов
+                for channel in self.channels.values():
+                    channel.time.flags.writeable = False
+                    channel.amplitude.flags.writeable = False
+                with _PARSE_CACHE_LOCK:
+                    _PARSE_CACHE[cache_key] = {name: channel.copy() for name, channel in self.channels.items()}
+                    if len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+                        _PARSE_CACHE.popitem(last=False)
+            return success
             
         except Exception as e:
             print(f'Функция чтения файла не работает')
@@ -80,25 +178,20 @@ class DataParser:
     def _parse_excel(self, file_path: str) -> bool:
         '''Парсинг Excel файла с данными осциллографа'''
         try:
-            with pd.ExcelFile(file_path) as xlsx:
-                #Абсолютно глупо, что что бы получить название канала, надо указать название канала в структуре
-                #Переделать что бы читалось из метаданных
-
-                channel_structures = [
-                    {
-                        'metadata_cols': 'A:C',
-                        'time_col': 'D',
-                        'amplitude_col': 'E'
-                    },
-                    {
-                        'metadata_cols': 'G:I',
-                        'time_col': 'J',
-                        'amplitude_col': 'K'
-                    }
-                ]
+            with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as xlsx:
+                # Лист читается один раз, каналы берутся срезами по номерам столбцов
+                sheet = pd.read_excel(xlsx, sheet_name=0, header=None)
+
+                # Файлы одной модели осциллографа имеют одинаковый заголовок,
+                # поэтому раскладка определяется один раз и берётся из кэша
+                signature = self._sheet_signature(sheet)
+                channel_structures = _LAYOUT_CACHE.get(signature)
+                if channel_structures is None:
+                    channel_structures = self._detect_excel_layouts(sheet)
+                    _LAYOUT_CACHE[signature] = channel_structures
 
                 for channel_info in channel_structures:
-                    channel = self._parse_excel_channel(xlsx, channel_info)
+                    channel = self._parse_excel_channel(sheet, channel_info)
                     if channel:
                         self.channels[channel.name] = channel
                 
@@ -108,28 +201,42 @@ class DataParser:
             return False
 
     
-    def _parse_excel_channel(self, xlsx: pd.ExcelFile, channel_info: Dict[str, str]) -> Optional[Channel]:
+    @staticmethod
+    def _sheet_signature(sheet: pd.DataFrame) -> tuple:
+        '''Сигнатура листа: ширина и текстовые ячейки первой строки (названия метаданных)'''
+        first_row = sheet.iloc[0] if len(sheet) else []
+        return (sheet.shape[1],) + tuple(
+            (col, value) for col, value in enumerate(first_row) if isinstance(value, str)
+        )
+
+    @staticmethod
+    def _detect_excel_layouts(sheet: pd.DataFrame) -> List[Dict[str, Any]]:
+        '''
+        Поиск каналов на листе по ключу 'Source' в блоке метаданных.
+        За 3 столбцами метаданных канала идут столбцы времени и амплитуды.
+        Если ключ не найден, используется раскладка по умолчанию.
+        '''
+        head = sheet.iloc[:16]
+        layouts = [
+            {
+                'metadata_cols': slice(col, col + 3),
+                'time_col': col + 3,
+                'amplitude_col': col + 4
+            }
+            for col in range(sheet.shape[1] - 4)
+            if (head.iloc[:, col] == 'Source').any()
+        ]
+        return layouts or DEFAULT_EXCEL_LAYOUTS
+
+    def _parse_excel_channel(self, sheet: pd.DataFrame, channel_info: Dict[str, Any]) -> Optional[Channel]:
         try:
-            metadata_df = pd.read_excel(
-                xlsx,
-                usecols=channel_info['metadata_cols'],
-                header=None,
-                nrows=16
-            ).dropna(how='all').T
-
-            metadata_dict = dict(zip(metadata_df.iloc[0], metadata_df.iloc[1]))
-
-            time_data = pd.read_excel(
-                xlsx,
-                usecols=channel_info['time_col'],
-                header=None
-            ).squeeze()
-
-            amplitude_data = pd.read_excel(
-                xlsx,
-                usecols=channel_info['amplitude_col'],
-                header=None
-            ).squeeze()
+            metadata_df = sheet.iloc[:16, channel_info['metadata_cols']].dropna(how='all')
+
+            # Ключи в первом столбце, значения во втором - транспонирование не нужно
+            metadata_dict = dict(zip(metadata_df.iloc[:, 0], metadata_df.iloc[:, 1]))
+
+            time_data = sheet.iloc[:, channel_info['time_col']]
+            amplitude_data = sheet.iloc[:, channel_info['amplitude_col']]
 
             channel = Channel(metadata_dict['Source'])
             channel.set_data(time_data, amplitude_data) # type: ignore
@@ -137,32 +244,38 @@ class DataParser:
 
             return channel
         except Exception as e:
-            print(f"Ошибка парсинга канала {channel_info['name']}: {e}")
+            print(f"Ошибка парсинга канала (столбец {channel_info['time_col']}): {e}")
             return None
 
     def _parse_csv(self, file_path: str) -> bool:
         '''Парсинг CSV файла с данными осциллографа'''
         try:
             #Используем контекстный менеджер для чтения CSV
+            #Файл читается целиком C-парсером, без разбиения на куски с разными типами
             with open(file_path, 'r', encoding='utf-8') as file:
-                df = pd.read_csv(file, header=None)
+                # Амплитуды сразу читаются в float32, без промежуточного float64
+                df = pd.read_csv(file, header=None, engine='c', low_memory=False,
+                                 dtype={4: np.float32, 10: np.float32})
+            
+            metadata_ch1 = df.iloc[:16, 0:3].dropna(how='all')
+            metadata_ch2 = df.iloc[:16, 6:9].dropna(how='all')
             
-            # Остальной код без изменений
-            metadata_ch1 = df.iloc[:16, 0:3].dropna(how='all').T
-            metadata_ch2 = df.iloc[:16, 6:9].dropna(how='all').T
-            data = df.iloc[:, [3, 4, 9, 10]]
+            # Столбцы данных берём массивами numpy, без промежуточного DataFrame
+            time_ch1, amplitude_ch1, time_ch2, amplitude_ch2 = (
+                df.iloc[:, col].to_numpy() for col in (3, 4, 9, 10)
+            )
             
             # Преобразование метаданных в словари
-            metadata_dict_ch1 = dict(zip(metadata_ch1.iloc[0], metadata_ch1.iloc[1]))
-            metadata_dict_ch2 = dict(zip(metadata_ch2.iloc[0], metadata_ch2.iloc[1]))
+            metadata_dict_ch1 = dict(zip(metadata_ch1.iloc[:, 0], metadata_ch1.iloc[:, 1]))
+            metadata_dict_ch2 = dict(zip(metadata_ch2.iloc[:, 0], metadata_ch2.iloc[:, 1]))
             
             # Создание и настройка каналов
             channel1 = Channel(metadata_dict_ch1['Source'])
-            channel1.set_data(data.iloc[:, 0], data.iloc[:, 1])
+            channel1.set_data(time_ch1, amplitude_ch1)
             channel1.set_metadata_from_dict(metadata_dict_ch1)
             
             channel2 = Channel(metadata_dict_ch2['Source'])
-            channel2.set_data(data.iloc[:, 2], data.iloc[:, 3])
+            channel2.set_data(time_ch2, amplitude_ch2)
             channel2.set_metadata_from_dict(metadata_dict_ch2)
             
             self.channels[channel1.name] = channel1
@@ -0,0 +1,83 @@
+# gui/button_delegate.py
+
+import re
+
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+from PyQt6.QtCore import pyqtSignal, Qt, QEvent, QModelIndex, QSize
+from PyQt6.QtGui import QColor, QPalette
+
+from utils.constants import BUTTON_STYLES
+
+# Состояние кнопки в ячейке: стиль normal/success/warning/error, '' - без подсветки,
+# None - неактивная кнопка
+BUTTON_STATE_ROLE = Qt.ItemDataRole.UserRole
+# Цвета подсветки кнопок берутся из тех же rgba, что и таблицы стилей кнопок
+BUTTON_COLORS = {
+    style_type: QColor(*map(int, re.findall(r'\d+', style)))
+    for style_type, style in BUTTON_STYLES.items()
+}
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """
+    Ячейка, нарисованная как кнопка: виджетов на строку не создаётся,
+    рисуются только видимые ячейки. Надпись - DisplayRole, стиль - BUTTON_STATE_ROLE.
+    Ячейка без надписи рисуется обычным образом и нажатий не принимает.
+    """
+    clicked = pyqtSignal(QModelIndex)
+
+    def paint(self, painter, option, index):
+        text = index.data(Qt.ItemDataRole.DisplayRole)
+        if text is None:
+            super().paint(painter, option, index)
+            return
+
+        style_type = index.data(BUTTON_STATE_ROLE)
+
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(1, 1, -1, -1)
+        button.text = text
+        button.palette = option.palette
+        button.fontMetrics = option.fontMetrics
+        button.state = QStyle.StateFlag.State_Raised
+        if style_type is not None:
+            button.state |= QStyle.StateFlag.State_Enabled
+        else:
+            button.palette.setCurrentColorGroup(QPalette.ColorGroup.Disabled)
+
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+
+        # Подсветка состояния ложится между рамкой и надписью, как фон из таблицы стилей
+        style.drawControl(QStyle.ControlElement.CE_PushButtonBevel, button, painter, widget)
+        color = BUTTON_COLORS.get(style_type)
+        if color is not None:
+            painter.fillRect(button.rect.adjusted(1, 1, -1, -1), color)
+        style.drawControl(QStyle.ControlElement.CE_PushButtonLabel, button, painter, widget)
+
+    def sizeHint(self, option, index):
+        text = index.data(Qt.ItemDataRole.DisplayRole)
+        # Размер как у настоящей кнопки с той же надписью
+        button = QStyleOptionButton()
+        button.text = text or ''
+        button.fontMetrics = option.fontMetrics
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        size = style.sizeFromContents(
+            QStyle.ContentsType.CT_PushButton, button,
+            option.fontMetrics.size(Qt.TextFlag.TextShowMnemonic, button.text), widget
+        )
+        if text is None:
+            # Ячейка без кнопки той же высоты, чтобы строки представления были одинаковыми
+            return QSize(super().sizeHint(option, index).width(), size.height())
+        return size
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and option.rect.contains(event.position().toPoint())
+                and index.data(Qt.ItemDataRole.DisplayRole) is not None):
+            if index.data(BUTTON_STATE_ROLE) is not None:
+                self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,27 @@
+# gui/file_load_task.py
+
+from PyQt6.QtCore import pyqtSignal, QObject, QRunnable
+
+from core.data_manager import DataManager
+
+
+class FileLoadSignals(QObject):
+    """Сигналы задачи загрузки: QRunnable не является QObject"""
+    finished = pyqtSignal(int, bool, str, object)  # key, success, file_path, данные или текст ошибки
+
+
+class FileLoadTask(QRunnable):
+    """
+    Чтение файла данных в пуле потоков, результат передаётся в GUI сигналом
+    (соединение с объектом из потока GUI - очередь, слот выполняется в потоке GUI)
+    """
+
+    def __init__(self, key, file_path):
+        super().__init__()
+        self.key = key
+        self.file_path = file_path
+        self.signals = FileLoadSignals()
+
+    def run(self):
+        success, result = DataManager.read_file(self.file_path)
+        self.signals.finished.emit(self.key, success, self.file_path, result)
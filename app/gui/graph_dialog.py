@@ -5,14 +5,36 @@ from PyQt6.QtWidgets import (
     QComboBox, QTextEdit, QSizePolicy
 )
 
-from PyQt6.QtCore import Qt, QPoint
+from PyQt6.QtCore import Qt, QPoint, QTimer, QThread
 from PyQt6.QtGui import QCursor
 
+import numpy as np
+from functools import lru_cache
+
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
 
+REPLOT_DELAY_MS = 150  # Пауза после последнего изменения параметра перед пересчётом
+COORDS_INTERVAL_MS = 33  # Период обновления подсказки с координатами курсора (~30 Гц)
+
+
+@lru_cache(maxsize=64)
+def _format_channel_parameters(channel_name, fixedlevel, max_amplitude, resonance_frequency,
+                               bandwidth_707, bandwidth_707_range, bandwidth_fixed,
+                               bandwidth_fixed_range, q_factor):
+    """Текст панели параметров канала, для уже выводившихся значений берётся из кэша"""
+    text = f"Параметры канала {channel_name}:\n\n"
+    text += f"Максимальная амплитуда: {max_amplitude:.4f} В\n"
+    text += f"Резонансная частота: {resonance_frequency:.2f} Гц\n"
+    text += f"Ширина полосы (0.707): {bandwidth_707:.2f} Гц\n"
+    text += f"  (от {bandwidth_707_range[0]:.2f} до {bandwidth_707_range[1]:.2f} Гц)\n"
+    text += f"Ширина полосы (уровень {fixedlevel:.2f}): {bandwidth_fixed:.2f} Гц\n"
+    text += f"  (от {bandwidth_fixed_range[0]:.2f} до {bandwidth_fixed_range[1]:.2f} Гц)\n"
+    text += f"Добротность: {q_factor:.2f}"
+    return text
+
 
 class CustomNavigationToolbar(NavigationToolbar):
     def __init__(self, canvas, parent=None):
@@ -22,22 +44,65 @@ class CustomNavigationToolbar(NavigationToolbar):
         self.coord_label.setStyleSheet("background-color: white; border: 1px solid black;")
         self.coord_label.hide()
         
+        # События движения мыши приходят сотнями в секунду, подсказка же
+        # обновляется по таймеру последними координатами
+        self._coords = None
+        self._coords_timer = QTimer(self)
+        self._coords_timer.setSingleShot(True)
+        self._coords_timer.setInterval(COORDS_INTERVAL_MS)
+        self._coords_timer.timeout.connect(self._show_mouse_coords)
+        
     def addmousecoords(self):
         self.canvas.mpl_connect('motion_notify_event', self._update_mouse_coords)
 
     def _update_mouse_coords(self, event):
         if event.inaxes:
-            x, y = event.xdata, event.ydata
-            text = f"x: {x:.3f}, y: {y:.3f}"
-            self.coord_label.setText(text)
-            self.coord_label.adjustSize()
-            
-            # Позиционируем метку рядом с курсором (глобальные координаты)
-            pos = QCursor.pos()
-            self.coord_label.move(pos + QPoint(15, 15))
-            self.coord_label.show()
+            self._coords = (event.xdata, event.ydata)
+            if not self._coords_timer.isActive():
+                self._coords_timer.start()
         else:
+            self._coords_timer.stop()
             self.coord_label.hide()
+    
+    def _show_mouse_coords(self):
+        x, y = self._coords
+        text = f"x: {x:.3f}, y: {y:.3f}"
+        if text != self.coord_label.text():
+            # Размер метки пересчитываем только при изменении длины текста
+            resize = len(text) != len(self.coord_label.text())
+            self.coord_label.setText(text)
+            if resize:
+                self.coord_label.adjustSize()
+        
+        # Позиционируем метку рядом с курсором (глобальные координаты),
+        # сдвиги на пару пикселей не двигают окно подсказки
+        pos = QCursor.pos() + QPoint(15, 15)
+        if (pos - self.coord_label.pos()).manhattanLength() > 2:
+            self.coord_label.move(pos)
+        if self.coord_label.isHidden():
+            self.coord_label.show()
+
+class ProcessorUpdateThread(QThread):
+    """
+    Поток пересчёта процессора: применение параметров и расчёт данных для графиков.
+    Считается копия процессора (Processor.detached_copy), исходный в это время
+    читают главное окно и другие диалоги; результат переносится в потоке GUI
+    """
+    
+    def __init__(self, processor, signal_start_channel, new_params, parent=None):
+        super().__init__(parent)
+        self.processor = processor
+        self.signal_start_channel = signal_start_channel
+        self.new_params = new_params
+    
+    def run(self):
+        """Основной метод потока - пересчёт с заполнением кэша процессора"""
+        # Без новых параметров только досчитывается то, чего ещё нет в кэше
+        if self.new_params is not None:
+            self.processor.set_signal_start_channel(self.signal_start_channel)
+            self.processor.update_params(self.new_params)
+        self.processor.precompute()
+
 
 class GraphDialog(QDialog):
     '''Диалоговое окно с графиками и настройками параметров'''
@@ -47,15 +112,27 @@ class GraphDialog(QDialog):
         self.channels = channels
         self.params = params
         self.processor = processor
+        # Отображаются только каналы, которые есть и в диалоге, и в процессоре
+        self._active_channels = tuple(name for name in self.channels if name in processor.channels)
         self.params['selected_channel']  = processor.params.get('selected_channel', 'CH2') # По умолчанию выбираем CH2 
         self.params['signal_start_channel'] = processor.params.get('signal_start_channel', 'CH1')  # По умолчанию для определения начала сигнала
         self.setWindowTitle(f'Графики и настройка параметров - {file_name}')
         self.setGeometry(200, 200, 1200, 800)
         
+        # Изменения спинбоксов перезапускают таймер, поэтому серия изменений
+        # (удержание стрелки, набор числа) даёт один пересчёт по последнему значению
+        self._replot_timer = self._create_debounce_timer(self.param_changed)
+        self._apply_timer = self._create_debounce_timer(self.apply_values)
+        
+        # Пересчёт процессора идёт в фоновом потоке, пока он работает,
+        # графики процессор не читают, а новые параметры ждут своей очереди
+        self._update_thread = None
+        self._pending_params = None
+        
         self.init_ui()
-        # Устанавливаем начальный канал для определения начала сигнала
-        self.update_plots()
-        self.update_frequency_forecast()  # Добавляем начальный расчет прогноза
+        # Первый расчёт тоже идёт в фоне: окно открывается сразу,
+        # а графики и прогноз заполняются по готовности данных
+        self._start_processor_update(None)
     
     def init_ui(self):
         '''Инициализация пользовательского интерфейса'''
@@ -90,7 +167,7 @@ class GraphDialog(QDialog):
         self.start_freq_spin = QSpinBox()
         self.start_freq_spin.setRange(0, 100000)
         self.start_freq_spin.setValue(int(self.params.get('start_freq', 0)))
-        self.start_freq_spin.valueChanged.connect(self.param_changed)
+        self.start_freq_spin.valueChanged.connect(self.schedule_replot)
         settings_layout.addWidget(self.start_freq_spin, row, 1)
         row += 1
         
@@ -98,7 +175,7 @@ class GraphDialog(QDialog):
         self.end_freq_spin = QSpinBox()
         self.end_freq_spin.setRange(0, 100000)
         self.end_freq_spin.setValue(int(self.params.get('end_freq', 0)))
-        self.end_freq_spin.valueChanged.connect(self.param_changed)
+        self.end_freq_spin.valueChanged.connect(self.schedule_replot)
         settings_layout.addWidget(self.end_freq_spin, row, 1)
         row += 1
         
@@ -107,7 +184,7 @@ class GraphDialog(QDialog):
         self.record_time_spin.setRange(0.1, 100.0)
         self.record_time_spin.setSingleStep(0.1)
         self.record_time_spin.setValue(self.params.get('record_time', 1.0))
-        self.record_time_spin.valueChanged.connect(self.param_changed)
+        self.record_time_spin.valueChanged.connect(self.schedule_replot)
         settings_layout.addWidget(self.record_time_spin, row, 1)
         row += 1
         
@@ -116,7 +193,8 @@ class GraphDialog(QDialog):
         self.cut_second_spin.setRange(-100, 100.0)
         self.cut_second_spin.setSingleStep(0.1)
         self.cut_second_spin.setValue(self.params.get('cut_second', 0.0))
-        self.cut_second_spin.valueChanged.connect(self.apply_values)
+        self.cut_second_spin.valueChanged.connect(self.schedule_apply)
+        self.cut_second_spin.valueChanged.connect(self.preview_strobe)
         settings_layout.addWidget(self.cut_second_spin, row, 1)
         row += 1
         
@@ -126,7 +204,7 @@ class GraphDialog(QDialog):
         self.gain_spin.setRange(0.1, 100.0)
         self.gain_spin.setSingleStep(0.1)
         self.gain_spin.setValue(self.params.get('gain', 7.0))
-        self.gain_spin.valueChanged.connect(self.apply_values)
+        self.gain_spin.valueChanged.connect(self.schedule_apply)
         settings_layout.addWidget(self.gain_spin, row, 1)
         row += 1
         
@@ -135,14 +213,15 @@ class GraphDialog(QDialog):
         self.fixedlevel_spin.setRange(0.0, 100)
         self.fixedlevel_spin.setSingleStep(0.01)
         self.fixedlevel_spin.setValue(self.params.get('fixedlevel', 0.6))
-        self.fixedlevel_spin.valueChanged.connect(self.apply_values)
+        self.fixedlevel_spin.valueChanged.connect(self.schedule_apply)
+        self.fixedlevel_spin.valueChanged.connect(self.preview_fixedlevel)
         settings_layout.addWidget(self.fixedlevel_spin, row, 1)
         row += 1
         
         # Кнопка применения
-        apply_button = QPushButton('Применить значения')
-        apply_button.clicked.connect(self.apply_values)
-        settings_layout.addWidget(apply_button, row, 0, 1, 2)
+        self.apply_button = QPushButton('Применить значения')
+        self.apply_button.clicked.connect(self.apply_values)
+        settings_layout.addWidget(self.apply_button, row, 0, 1, 2)
         row += 1
         
         # Кнопка закрытия
@@ -163,12 +242,61 @@ class GraphDialog(QDialog):
         plots_layout.addWidget(self.toolbar)
         self.toolbar.addmousecoords()
         
-        # Создаем три субплога
-        self.ax1 = self.figure.add_subplot(311)
-        self.ax2 = self.figure.add_subplot(312)
-        self.ax3 = self.figure.add_subplot(313)
+        # Создаем три субплога на одной явной сетке 3x1 вместо разбора кодов 311/312/313
+        grid = self.figure.add_gridspec(3, 1)
+        self.ax1 = self.figure.add_subplot(grid[0])
+        self.ax2 = self.figure.add_subplot(grid[1])
+        self.ax3 = self.figure.add_subplot(grid[2])
+        
+        # Заголовки, подписи и сетка не меняются, задаём их один раз
+        self.ax1.set_title("Исходные сигналы")
+        self.ax1.set_xlabel("Время (с)")
+        self.ax1.set_ylabel("Амплитуда (В)")
+        self.ax1.grid(True)
+        
+        self.ax2.set_title("Сглаженные сигналы")
+        self.ax2.set_xlabel("Время (с)")
+        self.ax2.set_ylabel("Амплитуда (В)")
+        self.ax2.grid(True)
+        
+        self.ax3.set_title("АЧХ (линейная шкала с усилением)")
+        self.ax3.set_xlabel("Частота (Гц)")
+        self.ax3.set_ylabel("Амплитуда сигнала")
+        self.ax3.grid(True)
+        
+        # Автомасштаб matplotlib при каждой отрисовке отключён: пределы пересчитываются
+        # явно в _autoscale_if_changed и только при изменении границ данных
+        for ax in (self.ax1, self.ax2, self.ax3):
+            ax.set_autoscale_on(False)
+        
+        # Линии графиков создаются при первой отрисовке и дальше только получают новые данные
+        self._line_sources = {}  # Линия -> массивы, из которых взяты её текущие данные
+        self._raw_lines = {}
+        self._smoothed_lines = {}
+        self._freq_lines = {}
+        self._data_extents = {}  # Ось -> границы данных при последнем масштабировании
+        
+        # Отступы tight_layout зависят только от подписей осей и размера холста,
+        # поэтому пересчитываются при смене пределов осей и изменении размера
+        self._layout_dirty = True
+        self.canvas.mpl_connect('resize_event', self._on_canvas_resize)
+        
+        # Предпросмотр строба и порогового уровня до пересчёта: статичная часть оси
+        # запоминается один раз, а при изменении перерисовывается только сдвинутый объект
+        self._strobe_artists = []  # Прямоугольник строба и линия его начала
+        self._strobe_proxy = None  # Запись строба в легенде
+        self._preview_artists = []
+        self._backgrounds = {}  # Ось -> сохранённый фон без анимируемых объектов
+        
+        # Линия АЧХ и маркеры создаются один раз, при обновлении у маркеров
+        # меняются положение и подпись, а легенда пересобирается только при смене подписей
+        self._set_line_data(self.ax3, self._freq_lines, 'response', [], [], color='red')
+        self._resonance_line = self.ax3.axvline(x=0, color='green', linestyle='--')
+        self._level707_line = self.ax3.axhline(y=0, color='blue', linestyle='--', label='Уровень 0.707')
+        self._fixedlevel_line = self.ax3.axhline(y=0, color='orange', linestyle='--')
+        self._response_markers = [self._resonance_line, self._level707_line, self._fixedlevel_line]
+        self._legend_labels = {}  # Ось -> подписи в текущей легенде
         
-        self.figure.tight_layout(pad=1.0)
         plots_layout.addWidget(self.canvas)
         
         # ПРАВАЯ ПАНЕЛЬ - Параметры канала и прогноз
@@ -179,6 +307,7 @@ class GraphDialog(QDialog):
         params_layout = QVBoxLayout(params_group)
         self.params_display = QTextEdit()
         self.params_display.setReadOnly(True)
+        self._params_text = None  # Текст, выведенный в params_display последним
         # Убираем фиксированную высоту, чтобы текст мог занимать столько места, сколько нужно
         self.params_display.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
         params_layout.addWidget(self.params_display)
@@ -212,6 +341,82 @@ class GraphDialog(QDialog):
         layout.addWidget(settings_group, 1)
         layout.addWidget(plots_widget, 3)
         layout.addLayout(right_panel, 1)
+        
+        # При вводе с клавиатуры valueChanged приходит по Enter или потере фокуса,
+        # а не на каждую набранную цифру с промежуточными значениями
+        for spin in (self.start_freq_spin, self.end_freq_spin, self.record_time_spin,
+                     self.cut_second_spin, self.gain_spin, self.fixedlevel_spin,
+                     self.sufficient_criterion_spin):
+            spin.setKeyboardTracking(False)
+    
+    def _create_debounce_timer(self, slot):
+        """Однократный таймер, вызывающий slot через REPLOT_DELAY_MS после последнего запуска"""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(REPLOT_DELAY_MS)
+        timer.timeout.connect(slot)
+        return timer
+    
+    def schedule_replot(self):
+        """Отложенное обновление графиков после изменения параметров"""
+        self._replot_timer.start()
+    
+    def schedule_apply(self):
+        """Отложенное применение параметров к процессору"""
+        self._apply_timer.start()
+    
+    def preview_strobe(self, cut_second):
+        """Сдвиг строба на графике сразу при изменении смещения, до пересчёта процессора"""
+        if not self._strobe_artists or not self._strobe_artists[0].get_visible():
+            return
+        rect, start_line = self._strobe_artists
+        # Положение считается от последнего отрисованного строба, процессор в это время
+        # может пересчитываться в фоновом потоке
+        plotted_start, plotted_cut_second = self._strobe_origin
+        start_time = plotted_start + cut_second - plotted_cut_second
+        rect.set_x(start_time)
+        start_line.set_xdata([start_time, start_time])
+        self._blit(self.ax1, self._strobe_artists)
+    
+    def preview_fixedlevel(self, fixedlevel):
+        """Сдвиг линии порогового уровня сразу при изменении, до пересчёта параметров"""
+        if not self._fixedlevel_line.get_visible():
+            return
+        self._fixedlevel_line.set_ydata([fixedlevel, fixedlevel])
+        self._blit(self.ax3, [self._fixedlevel_line])
+    
+    def _blit(self, ax, artists):
+        """
+        Перерисовка только объектов artists на оси ax.
+        
+        При первом вызове объекты помечаются анимируемыми и фон оси
+        запоминается после полной отрисовки без них, дальше каждый кадр -
+        восстановление фона и отрисовка одних этих объектов.
+        """
+        background = self._backgrounds.get(ax)
+        if background is None:
+            for artist in artists:
+                artist.set_animated(True)
+            self._preview_artists += artists
+            self.canvas.draw()
+            background = self._backgrounds[ax] = self.canvas.copy_from_bbox(ax.bbox)
+        
+        self.canvas.restore_region(background)
+        for artist in artists:
+            ax.draw_artist(artist)
+        self.canvas.blit(ax.bbox)
+    
+    def _end_preview(self):
+        """Возврат анимируемых объектов к обычной отрисовке и сброс сохранённых фонов"""
+        for artist in self._preview_artists:
+            artist.set_animated(False)
+        self._preview_artists.clear()
+        self._backgrounds.clear()
+    
+    def resizeEvent(self, event):
+        # Сохранённые фоны соответствуют прежнему размеру холста
+        self._end_preview()
+        super().resizeEvent(event)
     
     def channel_changed(self, channel_name):
         """Обработчик изменения выбранного канала"""
@@ -222,9 +427,7 @@ class GraphDialog(QDialog):
     def signal_start_channel_changed(self, channel_name):
         """Обработчик изменения канала для определения начала сигнала"""
         self.params['signal_start_channel'] = channel_name
-        self.processor.set_signal_start_channel(channel_name)
-        self.update_plots()
-        self.update_frequency_forecast()  # Добавляем обновление прогноза
+        self._start_processor_update({})
     
     def param_changed(self):
         """Обработчик изменения параметров"""
@@ -234,13 +437,14 @@ class GraphDialog(QDialog):
     
     def apply_values(self):
         '''Применение выбранных значений параметров'''
+        # Применение перерисовывает графики, отложенные обновления больше не нужны
+        self._apply_timer.stop()
+        self._replot_timer.stop()
+        
         # Сначала обновляем каналы на случай, если они были изменены
         self.params['signal_start_channel'] = self.signal_start_channel_combo.currentText()
         self.params['selected_channel'] = self.channel_combo.currentText()
         
-        # Устанавливаем канал для определения начала сигнала
-        self.processor.set_signal_start_channel(self.params['signal_start_channel'])
-        
         new_params = {
             'start_freq': self.start_freq_spin.value(),
             'end_freq': self.end_freq_spin.value(),
@@ -250,17 +454,61 @@ class GraphDialog(QDialog):
             'fixedlevel': self.fixedlevel_spin.value()
         }
         
-
-
-        # Обновляем параметры в процессоре
-        self.processor.update_params(new_params)
+        # Канал начала сигнала и параметры применяются в фоновом потоке,
+        # графики обновятся по его завершении
+        self._start_processor_update(new_params)
+    
+    def _processor_busy(self):
+        """Идёт ли пересчёт процессора в фоновом потоке"""
+        return self._update_thread is not None
+    
+    def _start_processor_update(self, new_params):
+        """Запуск пересчёта процессора, во время текущего пересчёта параметры откладываются"""
+        if self._processor_busy():
+            # Промежуточные наборы не считаются, после текущего пересчёта применяется последний
+            self._pending_params = {**(self._pending_params or {}), **(new_params or {})}
+            return
         
-        # Обновляем графики
+        self.apply_button.setEnabled(False)
+        self._update_thread = ProcessorUpdateThread(
+            self.processor.detached_copy(), self.params['signal_start_channel'], new_params, self
+        )
+        self._update_thread.finished.connect(self._on_processor_updated)
+        self._update_thread.start()
+    
+    def _on_processor_updated(self):
+        """Завершение фонового пересчёта: перенос результата, запуск отложенного или обновление графиков"""
+        if self._update_thread is None:
+            return  # Диалог закрыт, результат уже перенесён в done
+        self.processor.adopt(self._update_thread.processor)
+        self._update_thread.deleteLater()
+        self._update_thread = None
+        
+        if self._pending_params is not None:
+            new_params, self._pending_params = self._pending_params, None
+            self._start_processor_update(new_params)
+            return
+        
+        self.apply_button.setEnabled(True)
         self.update_plots()
         self.update_frequency_forecast()
     
+    def done(self, result):
+        # Процессор не должен пересчитываться после закрытия диалога:
+        # идущий пересчёт дожидаемся и забираем, отложенные параметры отбрасываем
+        if self._update_thread is not None:
+            self._update_thread.wait()
+            self.processor.adopt(self._update_thread.processor)
+            self._update_thread.deleteLater()
+            self._update_thread = None
+            self._pending_params = None
+        super().done(result)
+    
     def update_frequency_forecast(self):
         """Обновление прогноза полосы частот для проверки"""
+        if self._processor_busy():
+            return  # Прогноз обновится по окончании пересчёта
+        
         sufficient_criterion = self.sufficient_criterion_spin.value()
         forecast = self.processor.calculate_frequency_forecast(
             self.params['selected_channel'], 
@@ -278,12 +526,65 @@ class GraphDialog(QDialog):
         
         self.forecast_display.setPlainText(forecast_text)
     
+    def _set_line_data(self, ax, lines, key, x, y, **style):
+        """Обновление данных линии key на оси ax, при первом вызове линия создаётся"""
+        line = lines.get(key)
+        if line is None:
+            line, = ax.plot(x, y, **style)
+            lines[key] = line
+        else:
+            # Те же массивы (исходные сигналы не меняются) повторно не передаём:
+            # set_data копирует данные и заставляет линию заново строить путь
+            source = self._line_sources.get(line)
+            if source is None or source[0] is not x or source[1] is not y:
+                line.set_data(x, y)
+            line.set_visible(True)
+            if 'label' in style:
+                line.set_label(style['label'])
+        self._line_sources[line] = (x, y)
+    
+    def _autoscale_if_changed(self, ax):
+        """Пересчёт пределов оси только при изменении границ данных её видимых линий и фигур"""
+        extent = tuple(
+            (float(np.nanmin(x)), float(np.nanmax(x)), float(np.nanmin(y)), float(np.nanmax(y)))
+            for line in ax.get_lines()
+            if line.get_visible()
+            for x, y in [line.get_data()]
+            if len(x)
+        ) + tuple(tuple(patch.get_bbox().bounds) for patch in ax.patches)
+        if self._data_extents.get(ax) == extent:
+            return
+        self._data_extents[ax] = extent
+        ax.relim(visible_only=True)
+        ax.set_autoscale_on(True)
+        ax.autoscale_view()
+        ax.set_autoscale_on(False)
+        self._layout_dirty = True
+    
+    def _on_canvas_resize(self, event):
+        """Пересчёт отступов графиков под новый размер холста"""
+        self.figure.tight_layout(pad=3.0)
+        self._layout_dirty = False
+    
+    def _update_legend(self, ax):
+        """Пересборка легенды оси только при изменении подписей её видимых линий"""
+        handles = [
+            line for line in ax.get_lines()
+            if line.get_visible() and not line.get_label().startswith('_')
+        ]
+        labels = tuple(line.get_label() for line in handles)
+        if self._legend_labels.get(ax) == labels:
+            return
+        self._legend_labels[ax] = labels
+        ax.legend(handles, labels, loc='upper right', fontsize='small')
+    
     def update_plots(self):
         '''Обновление графиков с текущими параметрами'''
-        # Очищаем графики
-        self.ax1.clear()
-        self.ax2.clear()
-        self.ax3.clear()
+        if self._processor_busy():
+            return  # Графики обновятся по окончании пересчёта
+        
+        # Оси не очищаются: у существующих линий, строба и маркеров меняются только данные
+        self._end_preview()
         
         # Получаем данные из процессора
         raw_data = self.processor.rawplot
@@ -295,99 +596,117 @@ class GraphDialog(QDialog):
         record_time = self.record_time_spin.value()
         
         # Строим исходные графики
-        y_min, y_max = float('inf'), float('-inf')
-        for channel_name, data in raw_data.items():
-            if channel_name in self.channels:  # Отображаем только выбранные каналы
-                self.ax1.plot(data['time'], data['amplitude'], label=channel_name)
-                
-                # Определяем min/max амплитуды для отрисовки строба
-                channel_min = self.processor.raw_min_amp[channel_name]
-                channel_max = self.processor.raw_max_amp[channel_name]
-                y_min = min(y_min, channel_min)
-                y_max = max(y_max, channel_max)
+        for channel_name in self._active_channels:
+            data = raw_data[channel_name]
+            self._set_line_data(self.ax1, self._raw_lines, channel_name,
+                                data['time'], data['amplitude'], label=channel_name)
         
         # Добавляем строб (прямоугольник выделения анализируемого отрезка)
-        if y_min != float('inf') and y_max != float('-inf'):
+        # по высоте от общего минимума до максимума амплитуды отображаемых каналов,
+        # посчитанных процессором один раз
+        amp_bounds = self.processor.amp_bounds(self._active_channels)
+        has_strobe = bool(self._active_channels) and amp_bounds is not None
+        if has_strobe:
+            y_min, y_max = amp_bounds
             start_time = self.processor.analysis_start_time
-            rect = Rectangle((start_time, y_min), record_time, y_max - y_min,
-                            linewidth=1, edgecolor='r', facecolor='r', alpha=0.2)
-            self.ax1.add_patch(rect)
-
-            self.ax1.axvline(x=start_time, ymin=y_min, ymax=y_max, 
-                     color='r', linewidth=1, zorder=5)
-
-            # Добавляем запись в легенду
-            self.ax1.plot([], [], color='r', alpha=0.2, linewidth=10, label='Анализируемый отрезок')
+            if not self._strobe_artists:
+                # Строб создаётся один раз после линий каналов, чтобы
+                # его запись в легенде шла после них, дальше он только сдвигается
+                rect = Rectangle((0, 0), 0, 0, linewidth=1, edgecolor='r', facecolor='r', alpha=0.2)
+                self.ax1.add_patch(rect)
+                start_line = self.ax1.axvline(x=0, color='r', linewidth=1, zorder=5)
+                self._strobe_artists = [rect, start_line]
+                
+                # Добавляем запись в легенду
+                self._strobe_proxy, = self.ax1.plot([], [], color='r', alpha=0.2, linewidth=10,
+                                                    label='Анализируемый отрезок')
+            
+            rect, start_line = self._strobe_artists
+            rect.set_bounds(start_time, y_min, record_time, y_max - y_min)
+            start_line.set_xdata([start_time, start_time])
+            start_line.set_ydata([y_min, y_max])
+            self._strobe_origin = (start_time, self.processor.cut_second)
+        for artist in self._strobe_artists:
+            artist.set_visible(has_strobe)
+        if self._strobe_proxy is not None:
+            self._strobe_proxy.set_visible(has_strobe)
+        self._autoscale_if_changed(self.ax1)
         
         # Строим сглаженные графики
-        for channel_name, data in smoothed_data.items():
-            if channel_name in self.channels:  # Отображаем только выбранные каналы
-                self.ax2.plot(data['time'], data['smoothed_amplitude'], label=channel_name)
+        for channel_name in self._active_channels:
+            data = smoothed_data[channel_name]
+            self._set_line_data(self.ax2, self._smoothed_lines, channel_name,
+                                data['time'], data['smoothed_amplitude'], label=channel_name)
+        self._autoscale_if_changed(self.ax2)
+        
+        # Параметры выбранного канала берём один раз: свойство процессора
+        # при каждом обращении заново округляет словари всех каналов
+        params = self.processor.channel_parameters.get(self.params['selected_channel'], {})
         
         # Строим АЧХ только для выбранного канала (линейная шкала с усилением)
+        for line in list(self._freq_lines.values()) + self._response_markers:
+            line.set_visible(False)
         if self.params['selected_channel'] in freq_response:
             data = freq_response[self.params['selected_channel']]
-            self.ax3.plot(data['freq'], data['amplitude'], label=self.params['selected_channel'], color='red')
+            self._set_line_data(self.ax3, self._freq_lines, 'response', data['freq'], data['amplitude'],
+                                label=self.params['selected_channel'], color='red')
             
             # Добавляем маркеры для важных точек
-            params = self.processor.channel_parameters.get(self.params['selected_channel'], {})
             if params:
                 # Резонансная частота
-                self.ax3.axvline(x=params['resonance_frequency'], color='green', linestyle='--', 
-                                label=f'Резонанс: {params["resonance_frequency"]:.2f} Гц')
+                resonance_frequency = params['resonance_frequency']
+                self._resonance_line.set_xdata([resonance_frequency, resonance_frequency])
+                self._resonance_line.set_label(f'Резонанс: {resonance_frequency:.2f} Гц')
                 
                 # Уровень 0.707
-                self.ax3.axhline(y=params['max_amplitude'] * 0.707, color='blue', linestyle='--', 
-                                label='Уровень 0.707')
+                level707 = params['max_amplitude'] * 0.707
+                self._level707_line.set_ydata([level707, level707])
                 
                 # Уровень fixedlevel
                 fixedlevel = self.fixedlevel_spin.value()
-                self.ax3.axhline(y=fixedlevel, color='orange', linestyle='--', 
-                                label=f'Уровень {fixedlevel:.2f}')
-        
-        # Настраиваем графики с улучшенными легендами
-        self.ax1.set_title("Исходные сигналы")
-        self.ax1.set_xlabel("Время (с)")
-        self.ax1.set_ylabel("Амплитуда (В)")
-        self.ax1.legend(loc='upper right', fontsize='small')
-        self.ax1.grid(True)
-        
-        self.ax2.set_title("Сглаженные сигналы")
-        self.ax2.set_xlabel("Время (с)")
-        self.ax2.set_ylabel("Амплитуда (В)")
-        self.ax2.legend(loc='upper right', fontsize='small')
-        self.ax2.grid(True)
+                self._fixedlevel_line.set_ydata([fixedlevel, fixedlevel])
+                self._fixedlevel_line.set_label(f'Уровень {fixedlevel:.2f}')
+                
+                for line in self._response_markers:
+                    line.set_visible(True)
+        self._autoscale_if_changed(self.ax3)
         
-        self.ax3.set_title("АЧХ (линейная шкала с усилением)")
-        self.ax3.set_xlabel("Частота (Гц)")
-        self.ax3.set_ylabel("Амплитуда сигнала")
-        self.ax3.legend(loc='upper right', fontsize='small')
-        self.ax3.grid(True)
+        # Легенды пересобираются, только если изменились подписи
+        for ax in (self.ax1, self.ax2, self.ax3):
+            self._update_legend(ax)
         
         # Обновляем отображение параметров
-        self.update_parameters_display()
-        
-        # Обновляем canvas
-        self.figure.tight_layout(pad=3.0)
-        self.canvas.draw()
+        self.update_parameters_display(params)
+        
+        # Обновляем canvas: draw_idle объединяет запросы перерисовки,
+        # пришедшие до возврата в цикл событий, в одну отрисовку
+        if self._layout_dirty:
+            self.figure.tight_layout(pad=3.0)
+            self._layout_dirty = False
+        self.canvas.draw_idle()
 
-    def update_parameters_display(self):
-        """Обновление отображения параметров выбранного канала"""
-        params = self.processor.channel_parameters.get(self.params['selected_channel'], {})
+    def update_parameters_display(self, params=None):
+        """Обновление отображения параметров выбранного канала, params - уже полученные параметры"""
+        if params is None:
+            params = self.processor.channel_parameters.get(self.params['selected_channel'], {})
         if not params:
-            self.params_display.setPlainText("Параметры не рассчитаны")
+            self._set_params_text("Параметры не рассчитаны")
             return
         
         # Получаем текущие значения параметров из spin-боксов
         fixedlevel = self.fixedlevel_spin.value()
         
-        text = f"Параметры канала {self.params['selected_channel']}:\n\n"
-        text += f"Максимальная амплитуда: {params['max_amplitude']:.4f} В\n"
-        text += f"Резонансная частота: {params['resonance_frequency']:.2f} Гц\n"
-        text += f"Ширина полосы (0.707): {params['bandwidth_707']:.2f} Гц\n"
-        text += f"  (от {params['bandwidth_707_range'][0]:.2f} до {params['bandwidth_707_range'][1]:.2f} Гц)\n"
-        text += f"Ширина полосы (уровень {fixedlevel:.2f}): {params['bandwidth_fixed']:.2f} Гц\n"
-        text += f"  (от {params['bandwidth_fixed_range'][0]:.2f} до {params['bandwidth_fixed_range'][1]:.2f} Гц)\n"
-        text += f"Добротность: {params['q_factor']:.2f}"
-        
+        self._set_params_text(_format_channel_parameters(
+            self.params['selected_channel'], fixedlevel,
+            params['max_amplitude'], params['resonance_frequency'],
+            params['bandwidth_707'], params['bandwidth_707_range'],
+            params['bandwidth_fixed'], params['bandwidth_fixed_range'],
+            params['q_factor']
+        ))
+    
+    def _set_params_text(self, text):
+        """Вывод текста параметров, неизменившийся текст документ заново не раскладывает"""
+        if text == self._params_text:
+            return
+        self._params_text = text
         self.params_display.setPlainText(text)
\ No newline at end of file
@@ -4,11 +4,15 @@ from PyQt6.QtWidgets import (
     QPushButton, QComboBox, QLineEdit, QTextEdit, QProgressBar,
     QFormLayout
 )
-from PyQt6.QtCore import pyqtSignal, QObject
+from PyQt6.QtCore import pyqtSignal, QObject, QSignalBlocker, QTimer, QLocale
+from PyQt6.QtGui import QDoubleValidator
 
 from utils.constants import BUTTON_STYLE_MEASURE, BUTTON_STYLE_STOP, DEFAULT_PARAMS
 from core.instrumenthandler import InstrumentDetectorThread
 
+DEFAULTS_DELAY_MS = 250  # Пауза после последнего изменения частоты перед обновлением настроек
+LOG_MAX_LINES = 500  # Сколько последних сообщений хранит лог
+
 
 class InstrumentManager(QObject):
     """Управление приборами: обнаружение, настройки, логирование"""
@@ -56,6 +60,17 @@ class InstrumentManager(QObject):
         self.offset_edit = QLineEdit(str(DEFAULT_PARAMS['offset']))
         self.sweep_time_edit = QLineEdit(str(DEFAULT_PARAMS['sweep_time']))
         
+        # Недопустимые символы отсекаются ещё при вводе, до разбора числа
+        for edit in (self.start_freq_edit, self.end_freq_edit, self.sweep_time_edit):
+            self._set_number_validator(edit, bottom=0.0)
+        for edit in (self.amplitude_edit, self.offset_edit):
+            self._set_number_validator(edit)
+        
+        # Изменения частот перезапускают таймер, настройки обновляются один раз после ввода
+        self._defaults_timer = QTimer(self)
+        self._defaults_timer.setSingleShot(True)
+        self._defaults_timer.setInterval(DEFAULTS_DELAY_MS)
+        
         # Кнопки
         self.refresh_instruments_button = QPushButton("Обновить список приборов")
         self.measure_button = QPushButton("НАЧАТЬ ЗАПИСЬ")
@@ -76,8 +91,20 @@ class InstrumentManager(QObject):
         self.stop_button.clicked.connect(self.measurement_stopped.emit)
         self.read_oscilloscope_button.clicked.connect(self.oscilloscope_read_requested.emit)
         
-        self.start_freq_edit.textChanged.connect(self.update_generator_defaults)
-        self.end_freq_edit.textChanged.connect(self.update_generator_defaults)
+        self._defaults_timer.timeout.connect(self.update_generator_defaults)
+        self.start_freq_edit.textChanged.connect(self.schedule_generator_defaults)
+        self.end_freq_edit.textChanged.connect(self.schedule_generator_defaults)
+    
+    @staticmethod
+    def _set_number_validator(edit, bottom=None):
+        """Валидатор вещественного числа с точкой в качестве разделителя, как ждёт float()"""
+        locale = QLocale.c()
+        locale.setNumberOptions(QLocale.NumberOption.RejectGroupSeparator)
+        validator = QDoubleValidator(edit)
+        validator.setLocale(locale)
+        if bottom is not None:
+            validator.setBottom(bottom)
+        edit.setValidator(validator)
     
     def apply_styles(self):
         """Применение стилей к UI элементам"""
@@ -86,6 +113,8 @@ class InstrumentManager(QObject):
         self.stop_button.setStyleSheet(BUTTON_STYLE_STOP)
         self.log_text.setMaximumHeight(100)
         self.log_text.setReadOnly(True)
+        # Старые строки вытесняются, и документ лога не растёт за долгую сессию
+        self.log_text.document().setMaximumBlockCount(LOG_MAX_LINES)
     
     def create_instruments_group(self):
         """Создание группы управления приборами"""
@@ -171,6 +200,10 @@ class InstrumentManager(QObject):
     
     def start_instrument_detection(self):
         """Запуск обнаружения приборов"""
+        # Пока идёт опрос, повторный запуск ничего не делает
+        if self.detection_thread is not None and self.detection_thread.isRunning():
+            return
+        
         self.log_message.emit("Обнаружение приборов...")
         self.set_ui_enabled(False)
         
@@ -180,10 +213,12 @@ class InstrumentManager(QObject):
         self.generator_combo.addItem("Обнаружение приборов...")
         self.oscilloscope_combo.addItem("Обнаружение приборов...")
         
-        # Запускаем поток обнаружения
-        self.detection_thread = InstrumentDetectorThread()
-        self.detection_thread.detection_finished.connect(self.on_instruments_detected)
-        self.detection_thread.detection_error.connect(self.on_detection_error)
+        # Запускаем поток обнаружения. Он создаётся один раз и перезапускается,
+        # поэтому обработчики не накапливаются, а работающий поток не теряет ссылку
+        if self.detection_thread is None:
+            self.detection_thread = InstrumentDetectorThread()
+            self.detection_thread.detection_finished.connect(self.on_instruments_detected)
+            self.detection_thread.detection_error.connect(self.on_detection_error)
         self.detection_thread.start()
     
     def on_instruments_detected(self, instruments):
@@ -313,13 +348,20 @@ class InstrumentManager(QObject):
             'type': oscilloscope_data[1]
         }
     
+    def schedule_generator_defaults(self):
+        """Отложенное обновление настроек генератора после изменения частот"""
+        self._defaults_timer.start()
+    
     def update_generator_defaults(self):
         """Обновление настроек генератора на основе последнего измерения"""
         if self.last_measurement_data:
             try:
                 params = self.last_measurement_data['params']
-                self.start_freq_edit.setText(str(params.get('start_freq', DEFAULT_PARAMS['start_freq'])))
-                self.end_freq_edit.setText(str(params.get('end_freq', DEFAULT_PARAMS['end_freq'])))
+                # Поля подключены к этому же обработчику: без блокировки сигналов
+                # каждый setText снова вызывал бы обновление настроек
+                with QSignalBlocker(self.start_freq_edit), QSignalBlocker(self.end_freq_edit):
+                    self.start_freq_edit.setText(str(params.get('start_freq', DEFAULT_PARAMS['start_freq'])))
+                    self.end_freq_edit.setText(str(params.get('end_freq', DEFAULT_PARAMS['end_freq'])))
             except Exception as e:
                 self.log_message.emit(f"Ошибка при обновлении настроек: {str(e)}")
     
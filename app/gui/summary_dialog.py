@@ -1,26 +1,60 @@
 # gui/summary_dialog.py
 
-import os
-import tempfile
+import io
+from itertools import zip_longest
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QMessageBox, QFileDialog, QProgressBar, QCheckBox, QScrollArea, QWidget,
     QFrame
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QSignalBlocker, QThread, pyqtSignal
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import matplotlib.pyplot as plt
+from matplotlib import colormaps
+from matplotlib.colors import to_hex
 import numpy as np
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.drawing.image import Image as XLImage
 from openpyxl.styles import Font, Alignment
+from openpyxl.utils import get_column_letter
 import logging
 
 logger = logging.getLogger(__name__)
 
+EXPORT_IMAGE_DPI = 96  # Разрешение картинки графика в Excel: Excel всё равно показывает её в экранном масштабе
+MAX_DISPLAY_POINTS = 2000  # Предел точек одной линии на экране, экспорт берёт все точки
+INITIAL_VISIBLE_LINES = 5  # Сколько линий строится сразу в режиме отложенного построения
+# Цвета линий задаются явно и в том же виде идут в стиль чекбоксов легенды
+LINE_COLORS = [to_hex(color) for color in colormaps['tab20'].colors]
+
+
+def _decimate_for_display(freqs, amplitude):
+    '''
+    Прореживание АЧХ для отрисовки: точки делятся на корзины, от каждой
+    остаются минимум и максимум амплитуды. Огибающая и пик резонанса
+    сохраняются, а число точек не превышает примерно MAX_DISPLAY_POINTS.
+    '''
+    n = len(amplitude)
+    if n <= MAX_DISPLAY_POINTS:
+        return freqs, amplitude
+    
+    bucket = -(-n // (MAX_DISPLAY_POINTS // 2))
+    buckets = n // bucket
+    body = amplitude[:buckets * bucket].reshape(buckets, bucket)
+    offsets = np.arange(buckets) * bucket
+    idx = np.unique(np.concatenate((
+        body.argmin(axis=1) + offsets,
+        body.argmax(axis=1) + offsets,
+        np.arange(buckets * bucket, n),  # Хвост, не вошедший в целые корзины
+        [0, n - 1]
+    )))
+    return freqs[idx], amplitude[idx]
+
 
 class LegendWidget(QWidget):
     """Виджет легенды с чекбоксами"""
@@ -28,7 +62,8 @@ class LegendWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.checkboxes = {}
-        self.lines_mapping = {}  # checkbox -> line object
+        self.lines_mapping = {}  # checkbox -> line object, None - линия ещё не построена
+        self._line_factories = {}  # checkbox -> функция построения отложенной линии
         self.setup_ui()
     
     def setup_ui(self):
@@ -40,6 +75,16 @@ class LegendWidget(QWidget):
         title_label.setStyleSheet('font-weight: bold; margin: 5px;')
         layout.addWidget(title_label)
         
+        # Кнопки группового переключения
+        buttons_layout = QHBoxLayout()
+        show_all_btn = QPushButton('Показать все')
+        show_all_btn.clicked.connect(lambda: self.set_all_visible(True))
+        hide_all_btn = QPushButton('Скрыть все')
+        hide_all_btn.clicked.connect(lambda: self.set_all_visible(False))
+        buttons_layout.addWidget(show_all_btn)
+        buttons_layout.addWidget(hide_all_btn)
+        layout.addLayout(buttons_layout)
+        
         # Фрейм для чекбоксов
         self.checkbox_frame = QFrame()
         self.checkbox_layout = QVBoxLayout(self.checkbox_frame)
@@ -55,34 +100,174 @@ class LegendWidget(QWidget):
         layout.addWidget(scroll_area)
         self.setLayout(layout)
     
-    def add_line(self, label, line, color):
-        """Добавление линии в легенду"""
+    def add_line(self, label, line, color, create_line=None):
+        """
+        Добавление линии в легенду.
+        
+        Если line=None, линия строится вызовом create_line при первом
+        включении чекбокса, до этого чекбокс снят.
+        """
         checkbox = QCheckBox(label)
-        checkbox.setChecked(True)
+        checkbox.setChecked(line is not None)
         checkbox.setStyleSheet(f"QCheckBox {{ color: {color}; }}")
         
         # Сохраняем связь
         self.checkboxes[label] = checkbox
         self.lines_mapping[checkbox] = line
+        if line is None:
+            self._line_factories[checkbox] = create_line
         
         self.checkbox_layout.addWidget(checkbox)
         
         # Подключаем сигнал
         checkbox.stateChanged.connect(self.on_checkbox_changed)
     
+    def clear(self):
+        """
+        Удаление всех линий из легенды.
+        
+        Элементы снимаются с начала раскладки через takeAt(0), чекбоксы
+        отсоединяются от родителя сразу, без очереди deleteLater.
+        """
+        self.checkboxes.clear()
+        self.lines_mapping.clear()
+        self._line_factories.clear()
+        while (item := self.checkbox_layout.takeAt(0)) is not None:
+            widget = item.widget()
+            if widget:
+                widget.setParent(None)
+    
+    def set_all_visible(self, visible):
+        """
+        Включение или выключение всех линий сразу.
+        
+        Сигналы чекбоксов заблокированы, поэтому перерисовка и подстройка
+        осей выполняются один раз, а не на каждый чекбокс.
+        """
+        for checkbox in self.lines_mapping:
+            with QSignalBlocker(checkbox):
+                checkbox.setChecked(visible)
+            self._set_line_visible(checkbox, visible)
+        
+        if self.lines_mapping and hasattr(self.parent(), 'on_legend_visibility_changed'):
+            self.parent().on_legend_visibility_changed()
+    
+    def _set_line_visible(self, checkbox, visible):
+        """Видимость линии чекбокса; отложенная линия строится при первом включении"""
+        line = self.lines_mapping[checkbox]
+        if line is None:
+            if not visible:
+                return
+            line = self.lines_mapping[checkbox] = self._line_factories.pop(checkbox)()
+        line.set_visible(visible)
+    
     def on_checkbox_changed(self):
         """Обработка изменения состояния чекбокса"""
         checkbox = self.sender()
         if checkbox in self.lines_mapping:
-            line = self.lines_mapping[checkbox]
-            visible = checkbox.isChecked()
-            line.set_visible(visible)
+            self._set_line_visible(checkbox, checkbox.isChecked())
             
             # Передаем сигнал родительскому виджету
             if hasattr(self.parent(), 'on_legend_visibility_changed'):
                 self.parent().on_legend_visibility_changed()
 
 
+class ExcelExportThread(QThread):
+    """Построение и сохранение книги Excel сводного анализа в фоновом потоке"""
+    
+    progress_signal = pyqtSignal(int)  # процент записанных строк данных
+    finished_signal = pyqtSignal(str)  # имя сохранённого файла
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, file_name, blocks, columns, image_data, parent=None):
+        super().__init__(parent)
+        self.file_name = file_name
+        self.blocks = blocks  # (заголовок, строки параметров) каналов в порядке групп колонок
+        self.columns = columns  # массивы (N, 2) частота/амплитуда каналов в порядке групп колонок
+        self.image_data = image_data  # PNG графика
+    
+    def run(self):
+        try:
+            self.write_workbook()
+            logger.info(f"Файл успешно сохранен: {self.file_name}")
+            self.finished_signal.emit(self.file_name)
+        except Exception as e:
+            logger.error(f"Ошибка при экспорте в Excel: {str(e)}", exc_info=True)
+            self.error_signal.emit(str(e))
+    
+    @staticmethod
+    def _styled_cell(ws, value, font):
+        """Ячейка с оформлением для листа в режиме только записи"""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = font
+        return cell
+    
+    def write_workbook(self):
+        """Запись листа строго по строкам: заголовки, параметры каналов, точки, картинка графика"""
+        blocks, columns = self.blocks, self.columns
+        
+        # Создаем Excel workbook в режиме только записи: строки сразу уходят
+        # в XML листа, объекты ячеек для всех точек в памяти не держатся
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Сводный анализ АЧХ")
+        
+        # Устанавливаем ширину колонок
+        ws.column_dimensions['A'].width = 25
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 15
+        ws.column_dimensions['D'].width = 15
+        
+        # Заголовок
+        title_cell = self._styled_cell(ws, "Сводный анализ АЧХ (только видимые графики, абсолютные величины)",
+                                       Font(bold=True, size=16))
+        title_cell.alignment = Alignment(horizontal='center')
+        ws.append([title_cell])
+        ws.merged_cells.add('A1:D1')
+        ws.append([])
+        
+        # Заголовки анализов и параметры каналов по группам из 3 колонок
+        # (с отступом в 2 колонки); таблицы данных всех каналов начинаются
+        # с одной строки, после самого длинного блока параметров
+        params_height = max(len(lines) for _, lines in blocks) if blocks else 0
+        ws.append([value for title, _ in blocks
+                   for value in (self._styled_cell(ws, title, Font(bold=True)), None, None)])
+        for i in range(params_height):
+            ws.append([value for _, lines in blocks
+                       for value in (lines[i] if i < len(lines) else None, None, None)])
+        ws.append([])
+        
+        # Заголовки таблицы данных
+        ws.append([value for _ in columns
+                   for value in (self._styled_cell(ws, "Частота (Гц)", Font(bold=True)),
+                                 self._styled_cell(ws, "Амплитуда (В)", Font(bold=True)), None)])
+        
+        # Записываем ВСЕ точки данных целыми строками через ws.append;
+        # короткие каналы дополняются пустыми ячейками
+        total_rows = max((len(points) for points in columns), default=0)
+        progress_step = max(total_rows // 100, 1)
+        # Массив канала переводится в список пар [частота, амплитуда] одним
+        # вызовом tolist(), без упаковки каждого скаляра numpy через float()
+        channel_points = [points.tolist() for points in columns]
+        for row, points in enumerate(zip_longest(*channel_points, fillvalue=(None, None))):
+            ws.append([value for freq, amp in points for value in (freq, amp, None)])
+            if row % progress_step == 0:
+                self.progress_signal.emit(row * 100 // total_rows)
+        
+        # Добавляем изображение графика СПРАВА от данных
+        try:
+            img = XLImage(io.BytesIO(self.image_data))
+            # Размещаем изображение справа от данных (колонка после последней группы данных)
+            image_start_col = 3 * len(columns) + 2
+            img.anchor = f'{get_column_letter(image_start_col)}3'  # Например, 'E3' для одного канала
+            ws.add_image(img)
+        except Exception as e:
+            logger.error(f"Ошибка при добавлении изображения в Excel: {str(e)}")
+        
+        # Сохраняем файл
+        wb.save(self.file_name)
+        self.progress_signal.emit(100)
+
+
 class SummaryDialog(QDialog):
     """Диалог для построения сводного графика АЧХ из выбранных анализов"""
     
@@ -94,8 +279,13 @@ class SummaryDialog(QDialog):
         self.setGeometry(100, 100, 1400, 900)
         
         # Данные для графиков
-        self.frequency_responses = {}  # (subject_code, analysis_index, channel_name) -> (freqs, response)
-        self.lines = {}  # (subject_code, analysis_index, channel_name) -> line object
+        # (subject_code, analysis_index, channel_name) -> массив (N, 2) частота/амплитуда,
+        # все точки; линии графика строятся по прореженным копиям
+        self.frequency_responses = {}
+        self.lines = {}  # (subject_code, analysis_index, channel_name) -> line object, только построенные линии
+        self.line_bounds = {}  # (subject_code, analysis_index, channel_name) -> массив [x_min, x_max, y_min, y_max]
+        self._lines_background = None  # Фон оси без линий для перерисовки при переключении легенды
+        self._export_thread = None
         
         self.setup_ui()
         self.load_selected_analyses()
@@ -148,6 +338,9 @@ class SummaryDialog(QDialog):
         self.ax.set_title('Амплитудно-частотная характеристика')
         self.ax.grid(True, alpha=0.3)
         
+        # Любая полная перерисовка (масштаб, размер окна, новые данные) делает фон устаревшим
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
+        
         # Сохраняем исходные пределы осей
         self.original_xlim = None
         self.original_ylim = None
@@ -164,12 +357,17 @@ class SummaryDialog(QDialog):
         self.auto_update_cb = QCheckBox("Автообновление масштаба")
         self.auto_update_cb.setChecked(True)
         
+        # Отложенное построение: остальные линии строятся при первом включении в легенде
+        self.first_lines_cb = QCheckBox(f"Строить сразу только первые {INITIAL_VISIBLE_LINES} графиков")
+        self.first_lines_cb.setChecked(False)
+        
         # Кнопка сброса масштаба
         self.reset_zoom_btn = QPushButton('Сбросить масштаб')
         self.reset_zoom_btn.clicked.connect(self.reset_zoom)
         
         controls_layout.addWidget(self.progress_bar)
         controls_layout.addWidget(self.auto_update_cb)
+        controls_layout.addWidget(self.first_lines_cb)
         controls_layout.addWidget(self.reset_zoom_btn)
         controls_layout.addStretch()
         
@@ -187,12 +385,17 @@ class SummaryDialog(QDialog):
         self.export_btn = QPushButton('Экспорт в Excel')
         self.export_btn.clicked.connect(self.export_to_excel)
         
+        # Быстрый экспорт только точек АЧХ, без оформления и картинки
+        self.export_csv_btn = QPushButton('Экспорт CSV')
+        self.export_csv_btn.clicked.connect(self.export_to_csv)
+        
         # Кнопка закрытия
         self.close_btn = QPushButton('Закрыть')
         self.close_btn.clicked.connect(self.close)
         
         buttons_layout.addWidget(self.update_btn)
         buttons_layout.addWidget(self.export_btn)
+        buttons_layout.addWidget(self.export_csv_btn)
         buttons_layout.addStretch()
         buttons_layout.addWidget(self.close_btn)
         
@@ -203,13 +406,41 @@ class SummaryDialog(QDialog):
         if self.original_xlim and self.original_ylim:
             self.ax.set_xlim(self.original_xlim)
             self.ax.set_ylim(self.original_ylim)
-            self.canvas.draw()
+            self.canvas.draw_idle()
     
     def on_legend_visibility_changed(self):
         """Обработка изменения видимости через легенду"""
         if self.auto_update_cb.isChecked():
+            # Пределы осей могли измениться - полная перерисовка, объединяемая Qt
             self.auto_adjust_axes()
-        self.canvas.draw()
+            self.canvas.draw_idle()
+        else:
+            self._blit_lines()
+    
+    def _blit_lines(self):
+        """
+        Перерисовка одних линий графика поверх сохранённого фона оси.
+        
+        Фон снимается один раз полной отрисовкой со скрытыми линиями и
+        сбрасывается при следующей полной перерисовке холста.
+        """
+        if self._lines_background is None:
+            visibility = {line: line.get_visible() for line in self.lines.values()}
+            for line in visibility:
+                line.set_visible(False)
+            self.canvas.draw()
+            for line, visible in visibility.items():
+                line.set_visible(visible)
+            self._lines_background = self.canvas.copy_from_bbox(self.ax.bbox)
+        
+        self.canvas.restore_region(self._lines_background)
+        for line in self.lines.values():
+            if line.get_visible():
+                self.ax.draw_artist(line)
+        self.canvas.blit(self.ax.bbox)
+    
+    def _on_canvas_draw(self, event):
+        self._lines_background = None
     
     def load_selected_analyses(self):
         """Загрузка выбранных анализов и построение графиков в абсолютных величинах"""
@@ -227,20 +458,16 @@ class SummaryDialog(QDialog):
             # Очищаем предыдущие данные
             self.frequency_responses.clear()
             self.lines.clear()
-            self.legend_widget.checkboxes.clear()
-            self.legend_widget.lines_mapping.clear()
-            
-            # Очищаем layout легенды
-            for i in reversed(range(self.legend_widget.checkbox_layout.count())):
-                widget = self.legend_widget.checkbox_layout.itemAt(i).widget()
-                if widget:
-                    widget.deleteLater()
+            self.line_bounds.clear()
+            self.legend_widget.clear()
             
             self.ax.clear()
             
             processed_count = 0
             valid_analyses = 0
             
+            lazy_lines = self.first_lines_cb.isChecked()
+            
             for i, (subject_code, analysis_index) in enumerate(selected_analyses):
                 self.progress_bar.setValue(i)
                 
@@ -270,40 +497,40 @@ class SummaryDialog(QDialog):
                         amplitude = channel_data['amplitude']  # Абсолютные величины в Вольтах
                         
                         # Проверяем валидность данных
-                        if (freqs is not None and amplitude is not None and 
-                            len(freqs) > 0 and len(amplitude) > 0 and
-                            not np.all(np.isnan(amplitude)) and not np.all(np.isinf(amplitude))):
-                            
-                            # Заменяем inf/nan на минимальное/максимальное значение
-                            valid_mask = np.isfinite(amplitude)
-                            if np.any(valid_mask):
-                                # Используем только валидные точки
-                                valid_freqs = freqs[valid_mask]
-                                valid_amplitude = amplitude[valid_mask]
-                                
-                                # Заменяем оставшиеся inf/nan
-                                if len(valid_amplitude) > 0:
-                                    min_amp = np.min(valid_amplitude)
-                                    max_amp = np.max(valid_amplitude)
-                                    valid_amplitude = np.where(
-                                        np.isinf(valid_amplitude) | np.isnan(valid_amplitude), 
-                                        min_amp, valid_amplitude
-                                    )
-                                
-                                # Сохраняем данные
-                                key = (subject_code, analysis_index, channel_name)
-                                self.frequency_responses[key] = (valid_freqs, valid_amplitude)
-                                valid_analyses += 1
-                                
-                                # Строим график
-                                label = f"{subject_code}_{analysis_index}_{channel_name}"
-                                line, = self.ax.plot(valid_freqs, valid_amplitude, linewidth=2)
-                                self.lines[key] = line
-                                
-                                # Добавляем в легенду
-                                color = line.get_color()
-                                self.legend_widget.add_line(label, line, color)
-                            
+                        if freqs is None or amplitude is None or len(freqs) == 0 or len(amplitude) == 0:
+                            continue
+                        
+                        # Частота и амплитуда хранятся одним массивом (N, 2): все потребители
+                        # читают их вместе. Один проход np.isfinite: точки с inf/nan отбрасываются
+                        points = np.column_stack((freqs, amplitude)).astype(np.float64, copy=False)
+                        valid_mask = np.isfinite(points[:, 1])
+                        if not valid_mask.any():
+                            continue
+                        if not valid_mask.all():
+                            points = points[valid_mask]
+                        
+                        # Сохраняем данные
+                        key = (subject_code, analysis_index, channel_name)
+                        self.frequency_responses[key] = points
+                        (x_min, y_min), (x_max, y_max) = points.min(axis=0), points.max(axis=0)
+                        self.line_bounds[key] = np.array((x_min, x_max, y_min, y_max))
+                        valid_analyses += 1
+                        
+                        # Строим график; в режиме отложенного построения линии сверх
+                        # первых INITIAL_VISIBLE_LINES строятся при включении в легенде
+                        label = f"{subject_code}_{analysis_index}_{channel_name}"
+                        color = LINE_COLORS[(valid_analyses - 1) % len(LINE_COLORS)]
+                        if lazy_lines and valid_analyses > INITIAL_VISIBLE_LINES:
+                            line = None
+                        else:
+                            line = self._create_line(key, color)
+                        
+                        # Добавляем в легенду
+                        self.legend_widget.add_line(
+                            label, line, color,
+                            create_line=lambda key=key, color=color: self._create_line(key, color)
+                        )
+                        
                     processed_count += 1
                     
                 except Exception as e:
@@ -322,6 +549,9 @@ class SummaryDialog(QDialog):
                 self.ax.set_title(f'Сводный график АЧХ')
                 self.ax.grid(True, alpha=0.3)
                 
+                # Один автомасштаб по всем добавленным линиям
+                self.ax.autoscale_view()
+                
                 # Сохраняем исходные пределы осей
                 self.original_xlim = self.ax.get_xlim()
                 self.original_ylim = self.ax.get_ylim()
@@ -329,7 +559,8 @@ class SummaryDialog(QDialog):
                 # Автоматически настраиваем масштаб
                 self.auto_adjust_axes()
             
-            self.canvas.draw()
+            # Перерисовка откладывается до цикла событий и объединяется с другими
+            self.canvas.draw_idle()
             self.progress_bar.setVisible(False)
             
             logger.info(f"Обработано {processed_count} анализов, построено {valid_analyses} графиков")
@@ -339,40 +570,41 @@ class SummaryDialog(QDialog):
             QMessageBox.critical(self, 'Ошибка', f'Не удалось построить график: {str(e)}')
             self.progress_bar.setVisible(False)
     
+    def _create_line(self, key, color):
+        """
+        Построение линии канала по прореженной копии его точек.
+        
+        Линия создаётся напрямую и добавляется через add_line: без разбора
+        аргументов ax.plot и без запроса автомасштаба на каждую линию.
+        """
+        points = self.frequency_responses[key]
+        line = Line2D(*_decimate_for_display(points[:, 0], points[:, 1]),
+                      linewidth=2, color=color)
+        self.ax.add_line(line)
+        self.lines[key] = line
+        return line
+    
     def auto_adjust_axes(self):
         """Автоматическая подстройка масштаба осей для видимых линий"""
         if not self.auto_update_cb.isChecked():
             return
             
         try:
-            # Собираем все видимые данные
-            all_visible_freqs = []
-            all_visible_responses = []
-            
-            for key, line in self.lines.items():
-                if line.get_visible():
-                    freqs, response = self.frequency_responses[key]
-                    all_visible_freqs.extend(freqs)
-                    all_visible_responses.extend(response)
-            
-            if not all_visible_freqs or not all_visible_responses:
-                return
-            
-            # Преобразуем в numpy arrays для вычислений
-            all_visible_freqs = np.array(all_visible_freqs)
-            all_visible_responses = np.array(all_visible_responses)
-            
-            # Убираем NaN и inf значения
-            valid_mask = np.isfinite(all_visible_responses) & np.isfinite(all_visible_freqs)
-            if not np.any(valid_mask):
+            # Пределы каждой линии посчитаны при загрузке, здесь они только
+            # сводятся по видимым линиям - переключение легенды не трогает точки
+            visible_bounds = [
+                self.line_bounds[key]
+                for key, line in self.lines.items() if line.get_visible()
+            ]
+            
+            if not visible_bounds:
                 return
             
-            all_visible_freqs = all_visible_freqs[valid_mask]
-            all_visible_responses = all_visible_responses[valid_mask]
-            
-            # Вычисляем пределы с небольшим отступом
-            x_min, x_max = np.min(all_visible_freqs), np.max(all_visible_freqs)
-            y_min, y_max = np.min(all_visible_responses), np.max(all_visible_responses)
+            # Вычисляем пределы с небольшим отступом: две редукции по столбцам
+            # матрицы (линии, 4) вместо четырёх отдельных проходов
+            bounds = np.vstack(visible_bounds)
+            x_min, _, y_min, _ = bounds.min(axis=0)
+            _, x_max, _, y_max = bounds.max(axis=0)
             
             # Добавляем отступы (5% от диапазона)
             x_range = x_max - x_min
@@ -388,10 +620,11 @@ class SummaryDialog(QDialog):
             logger.error(f"Ошибка при автоматической подстройке осей: {str(e)}")
     
     def get_visible_analyses(self):
-        """Получение списка видимых анализов"""
+        """Получение списка видимых анализов в порядке загрузки (линии могут строиться позже)"""
         visible_keys = []
-        for key, line in self.lines.items():
-            if line.get_visible():
+        for key in self.frequency_responses:
+            line = self.lines.get(key)
+            if line is not None and line.get_visible():
                 visible_keys.append(key)
         return visible_keys
     
@@ -417,8 +650,33 @@ class SummaryDialog(QDialog):
         
         return text
     
+    def _get_export_params(self, subject_code, analysis_index):
+        """Параметры анализа и словарь параметров его каналов для экспорта, None - анализа нет"""
+        analysis_data = self.data_manager.get_analysis_data(subject_code, analysis_index)
+        if not analysis_data:
+            return None
+        
+        processor = analysis_data.get('processor')
+        if not processor:
+            return None
+        
+        # Получаем параметры анализа
+        params = analysis_data.get('params', {})
+        if not isinstance(params, dict):
+            params = {}
+        
+        # Получаем параметры каналов
+        channel_params_dict = getattr(processor, 'channel_parameters', None)
+        if not isinstance(channel_params_dict, dict):
+            channel_params_dict = {}
+        
+        return params, channel_params_dict
+    
     def export_to_excel(self):
         """Экспорт данных в Excel - только видимые графики в абсолютных величинах со всеми точками"""
+        if self._export_thread is not None:
+            return  # Предыдущий экспорт ещё записывается
+        
         # Получаем только видимые анализы
         visible_keys = self.get_visible_analyses()
         
@@ -438,178 +696,133 @@ class SummaryDialog(QDialog):
             if not file_name:
                 return
             
+            # Картинка графика рендерится в память одним проходом: без bbox_inches='tight',
+            # который требует второго рендера, и без временного файла на диске.
+            # Фигура принадлежит GUI, поэтому рендер остаётся в основном потоке
+            image_buffer = io.BytesIO()
+            self.figure.savefig(image_buffer, format='png', dpi=EXPORT_IMAGE_DPI)
+            
+            blocks, columns = self._collect_export_data(visible_keys)
+            
             self.progress_bar.setVisible(True)
-            total_items = len(visible_keys)
-            self.progress_bar.setRange(0, total_items + 2)
-            
-            # Создаем временное изображение графика
-            temp_img_path = os.path.join(tempfile.gettempdir(), 'summary_plot.png')
-            self.figure.savefig(temp_img_path, dpi=150, bbox_inches='tight')
-            
-            # Создаем Excel workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Сводный анализ АЧХ"
-            
-            # Устанавливаем ширину колонок
-            ws.column_dimensions['A'].width = 25
-            ws.column_dimensions['B'].width = 20
-            ws.column_dimensions['C'].width = 15
-            ws.column_dimensions['D'].width = 15
-            
-            # Заголовок
-            title_cell = ws['A1']
-            title_cell.value = "Сводный анализ АЧХ (только видимые графики, абсолютные величины)"
-            title_cell.font = Font(bold=True, size=16)
-            ws.merge_cells('A1:D1')
-            title_cell.alignment = Alignment(horizontal='center')
-            
-            current_row = 3
-            progress_count = 0
-            
-            # Определяем максимальное количество точек среди всех каналов
-            max_points = 0
-            all_data = {}  # Сохраняем все данные для второго прохода
-            
-            # Первый проход: собираем данные и находим максимальное количество точек
-            for key in visible_keys:
-                subject_code, analysis_index, channel_name = key
-                
-                analysis_data = self.data_manager.get_analysis_data(subject_code, analysis_index)
-                if not analysis_data:
-                    continue
-                
-                processor = analysis_data.get('processor')
-                if not processor:
-                    continue
-                
-                # Получаем параметры анализа
-                params = analysis_data.get('params', {})
-                if not isinstance(params, dict):
-                    params = {}
-                
-                # Получаем параметры канала
-                channel_params = {}
-                if hasattr(processor, 'channel_parameters'):
-                    channel_params_dict = processor.channel_parameters
-                    if isinstance(channel_params_dict, dict):
-                        channel_params = channel_params_dict.get(channel_name, {})
-                
-                # Получаем линейные данные АЧХ (абсолютные величины) - ВСЕ точки
-                linear_data = {}
-                if hasattr(processor, 'freqresponse_linear'):
-                    linear_response_data = processor.freqresponse_linear
-                    if channel_name in linear_response_data:
-                        linear_data = linear_response_data[channel_name]
-                
-                if linear_data and 'freq' in linear_data and 'amplitude' in linear_data:
-                    freqs = linear_data['freq']
-                    amplitudes = linear_data['amplitude']
-                    
-                    if len(freqs) > 0 and len(amplitudes) > 0:
-                        max_points = max(max_points, len(freqs))
-                        
-                        # Сохраняем данные для второго прохода
-                        all_data[key] = {
-                            'freqs': freqs,
-                            'amplitudes': amplitudes,
-                            'subject_code': subject_code,
-                            'analysis_index': analysis_index,
-                            'channel_name': channel_name,
-                            'params': params,
-                            'channel_params': channel_params
-                        }
-            
-            # Второй проход: записываем данные в Excel по горизонтали
-            current_col = 1  # Начинаем с колонки A (индекс 1)
-            
-            for key in visible_keys:
-                if key not in all_data:
-                    continue
-                    
-                progress_count += 1
-                self.progress_bar.setValue(progress_count)
-                
-                data = all_data[key]
-                freqs = data['freqs']
-                amplitudes = data['amplitudes']
-                subject_code = data['subject_code']
-                analysis_index = data['analysis_index']
-                channel_name = data['channel_name']
-                params = data['params']
-                channel_params = data['channel_params']
-                
-                # Заголовок анализа и канала
-                title_cell = ws.cell(row=current_row, column=current_col)
-                title_cell.value = f"Анализ: {subject_code}_{analysis_index} - Канал: {channel_name}"
-                title_cell.font = Font(bold=True)
-                current_row += 1
-                
-                # Форматируем параметры канала (полная версия из исходного кода)
-                fixedlevel = params.get('fixedlevel', 0.6)
-                parameters_text = self.format_channel_parameters(channel_params, fixedlevel)
-                
-                # Разбиваем текст параметров на строки и записываем в Excel
-                lines = parameters_text.split('\n')
-                for i, line in enumerate(lines):
-                    param_cell = ws.cell(row=current_row + i, column=current_col)
-                    param_cell.value = line
-                
-                current_row += len(lines) + 1  # Отступ после параметров
-                
-                # Заголовки таблицы данных
-                freq_header = ws.cell(row=current_row, column=current_col)
-                freq_header.value = "Частота (Гц)"
-                freq_header.font = Font(bold=True)
-                
-                amp_header = ws.cell(row=current_row, column=current_col + 1)
-                amp_header.value = "Амплитуда (В)"
-                amp_header.font = Font(bold=True)
-                
-                current_row += 1
-                
-                # Записываем ВСЕ точки данных
-                for i in range(len(freqs)):
-                    freq_cell = ws.cell(row=current_row + i, column=current_col)
-                    amp_cell = ws.cell(row=current_row + i, column=current_col + 1)
-                    
-                    freq_cell.value = float(freqs[i])
-                    amp_cell.value = float(amplitudes[i])
-                
-                # Переходим к следующей группе колонок (с отступом в 2 колонки)
-                current_col += 3
-                # Сбрасываем строку для следующего канала
-                current_row = 3
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(0)
+            self.export_btn.setEnabled(False)
             
-            # Добавляем изображение графика СПРАВА от данных
-            if os.path.exists(temp_img_path):
-                try:
-                    img = XLImage(temp_img_path)
-                    # Размещаем изображение справа от данных (колонка после последней группы данных)
-                    image_start_col = current_col + 1
-                    img.anchor = f'{chr(64 + image_start_col)}3'  # Например, 'E3' если current_col=4
-                    ws.add_image(img)
-                except Exception as e:
-                    logger.error(f"Ошибка при добавлении изображения в Excel: {str(e)}")
-            
-            # Сохраняем файл
-            try:
-                wb.save(file_name)
-                logger.info(f"Файл успешно сохранен: {file_name}")
-            except Exception as e:
-                logger.error(f"Ошибка при сохранении Excel файла: {str(e)}")
-                raise
-            
-            # Удаляем временный файл
-            try:
-                os.remove(temp_img_path)
-            except Exception as e:
-                logger.warning(f"Не удалось удалить временный файл: {str(e)}")
+            # Книга строится и сохраняется в фоновом потоке, интерфейс не блокируется
+            self._export_thread = ExcelExportThread(
+                file_name, blocks, columns, image_buffer.getvalue(), self
+            )
+            self._export_thread.progress_signal.connect(self.progress_bar.setValue)
+            self._export_thread.finished_signal.connect(self._on_export_finished)
+            self._export_thread.error_signal.connect(self._on_export_error)
+            self._export_thread.finished.connect(self._on_export_thread_finished)
+            self._export_thread.start()
             
+        except Exception as e:
+            logger.error(f"Ошибка при экспорте в Excel: {str(e)}", exc_info=True)
+            QMessageBox.critical(self, 'Ошибка', f'Не удалось экспортировать данные: {str(e)}')
             self.progress_bar.setVisible(False)
+    
+    def _collect_export_data(self, visible_keys):
+        """
+        Сбор заголовков и точек видимых каналов для экспорта за один проход.
+        
+        Точки АЧХ берутся из уже очищенных массивов графика, от анализа нужны
+        только параметры для заголовка. Возвращает списки blocks - (заголовок,
+        строки параметров) и columns - массивы (N, 2) в порядке групп колонок.
+        """
+        blocks = []
+        columns = []
+        analysis_params = {}  # (subject_code, analysis_index) -> (params, параметры каналов)
+        
+        for key in visible_keys:
+            subject_code, analysis_index, channel_name = key
+            
+            points = self.frequency_responses[key]
+            if len(points) == 0:
+                continue
+            
+            # Анализ и параметры его каналов запрашиваются один раз на все его каналы
+            analysis_key = (subject_code, analysis_index)
+            if analysis_key not in analysis_params:
+                analysis_params[analysis_key] = self._get_export_params(subject_code, analysis_index)
+            if analysis_params[analysis_key] is None:
+                continue
+            params, channel_params_dict = analysis_params[analysis_key]
+            channel_params = channel_params_dict.get(channel_name, {})
+            
+            # Форматируем параметры канала (полная версия из исходного кода)
+            fixedlevel = params.get('fixedlevel', 0.6)
+            parameters_text = self.format_channel_parameters(channel_params, fixedlevel)
+            
+            blocks.append((
+                f"Анализ: {subject_code}_{analysis_index} - Канал: {channel_name}",
+                parameters_text.split('\n')
+            ))
+            columns.append(points)
+        
+        return blocks, columns
+    
+    def export_to_csv(self):
+        """
+        Быстрый экспорт точек видимых графиков в CSV.
+        
+        Пишутся только пары столбцов частота/амплитуда каналов, без параметров
+        и картинки графика, - на порядки быстрее построения книги xlsx.
+        Разделители под русскую локаль Excel: столбцы через ';', дробная часть через ','.
+        """
+        visible_keys = self.get_visible_analyses()
+        
+        if not visible_keys:
+            QMessageBox.warning(self, 'Предупреждение', 'Нет видимых графиков для экспорта')
+            return
+        
+        try:
+            file_name, _ = QFileDialog.getSaveFileName(
+                self, 
+                'Экспорт в CSV', 
+                'summary_analysis.csv', 
+                'CSV Files (*.csv)'
+            )
+            
+            if not file_name:
+                return
+            
+            # Столбцы разной длины дополняются пустыми значениями при склейке
+            series = []
+            for subject_code, analysis_index, channel_name in visible_keys:
+                points = self.frequency_responses[(subject_code, analysis_index, channel_name)]
+                label = f"{subject_code}_{analysis_index}_{channel_name}"
+                series.append(pd.Series(points[:, 0], name=f"{label} Частота (Гц)"))
+                series.append(pd.Series(points[:, 1], name=f"{label} Амплитуда (В)"))
+            
+            pd.concat(series, axis=1).to_csv(
+                file_name, index=False, sep=';', decimal=',',
+                float_format='%.10g', encoding='utf-8-sig'
+            )
+            logger.info(f"Файл успешно сохранен: {file_name}")
             QMessageBox.information(self, 'Успех', f'Данные экспортированы в {file_name}\n(только видимые графики, абсолютные величины, все точки)')
             
         except Exception as e:
-            logger.error(f"Ошибка при экспорте в Excel: {str(e)}", exc_info=True)
+            logger.error(f"Ошибка при экспорте в CSV: {str(e)}", exc_info=True)
             QMessageBox.critical(self, 'Ошибка', f'Не удалось экспортировать данные: {str(e)}')
-            self.progress_bar.setVisible(False)
\ No newline at end of file
+    
+    def _on_export_finished(self, file_name):
+        self.progress_bar.setVisible(False)
+        QMessageBox.information(self, 'Успех', f'Данные экспортированы в {file_name}\n(только видимые графики, абсолютные величины, все точки)')
+    
+    def _on_export_error(self, message):
+        self.progress_bar.setVisible(False)
+        QMessageBox.critical(self, 'Ошибка', f'Не удалось экспортировать данные: {message}')
+    
+    def _on_export_thread_finished(self):
+        self._export_thread.deleteLater()
+        self._export_thread = None
+        self.export_btn.setEnabled(True)
+    
+    def done(self, result):
+        # Файл должен быть дописан до закрытия диалога
+        if self._export_thread is not None:
+            self._export_thread.wait()
+        super().done(result)
@@ -1,179 +1,380 @@
 #gui/table_manager.py
-from PyQt6.QtWidgets import (
-    QTableWidget, QTableWidgetItem, QHeaderView, QPushButton,
-    QFileDialog, QMessageBox
-)
-from PyQt6.QtCore import pyqtSignal, QObject
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 
-from utils.constants import TABLE_HEADERS, BUTTON_STYLE_NORMAL, BUTTON_STYLE_SUCCESS, BUTTON_STYLE_ERROR, BUTTON_STYLE_WARNING
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView, QFileDialog, QMessageBox
+from PyQt6.QtCore import pyqtSignal, QObject, Qt, QAbstractTableModel, QModelIndex, QThreadPool
+
+from gui.button_delegate import ButtonDelegate, BUTTON_STATE_ROLE
+from gui.file_load_task import FileLoadTask
+from utils.constants import TABLE_HEADERS, OPEN_DIALOG_OPTIONS
+
+# Параметры анализа в столбцах 3-6 таблицы
+PARAM_KEYS = ('start_freq', 'end_freq', 'record_time', 'cut_second')
+PARAMS_COLUMN = 3
+FILE_COLUMN = 1
+GRAPH_COLUMN = 2
+# Минимальные ширины столбцов: код, файл, кнопка графиков и 4 параметра
+MIN_COLUMN_WIDTHS = (80, 200, 160, 80, 80, 80, 80)
+COLUMN_PADDING = 24  # Запас к ширине заголовка на отступы и индикатор сортировки
+
+
+@dataclass(slots=True)
+class RowData:
+    '''Строка таблицы файлов'''
+    subject_code: str = ''
+    file_path: str = ''
+    file_name: str = 'Добавить файл'  # Надпись кнопки файла
+    status: str = 'normal'  # Стиль кнопки файла: normal, success, warning, error
+    params: dict = field(default_factory=lambda: dict.fromkeys(PARAM_KEYS, 0))
+
+
+class FileTableModel(QAbstractTableModel):
+    """Модель таблицы файлов: строки хранятся списком RowData, ячейки не создаются"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(TABLE_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return TABLE_HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == BUTTON_STATE_ROLE:
+            if column == FILE_COLUMN:
+                return row.status
+            if column == GRAPH_COLUMN:
+                # Графики доступны только для успешно загруженного файла
+                return '' if row.status == 'success' else None
+            return None
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+
+        if column == 0:
+            return row.subject_code
+        if column == FILE_COLUMN:
+            return row.file_name
+        if column == GRAPH_COLUMN:
+            return 'Открыть графики'
+        return str(row.params[PARAM_KEYS[column - PARAMS_COLUMN]])
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+
+        row = self._rows[index.row()]
+        column = index.column()
+        if column == 0:
+            row.subject_code = value
+        elif column >= PARAMS_COLUMN:
+            row.params[PARAM_KEYS[column - PARAMS_COLUMN]] = value
+        else:
+            return False
+
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        return True
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == 0 or index.column() >= PARAMS_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def append_row(self, row_data=None):
+        """Добавление строки в конец таблицы, возвращает её номер"""
+        return self.append_rows([row_data if row_data is not None else RowData()])
+
+    def append_rows(self, rows):
+        """Добавление нескольких строк одной вставкой, возвращает номер первой"""
+        first = len(self._rows)
+        if rows:
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+        return first
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or count <= 0 or row + count > len(self._rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._rows[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def set_row_params(self, row, params):
+        """Обновление параметров строки одним сигналом dataChanged на столбцы 3-6"""
+        row_params = self._rows[row].params
+        for key in PARAM_KEYS:
+            row_params[key] = params[key]
+        self.dataChanged.emit(
+            self.index(row, PARAMS_COLUMN),
+            self.index(row, PARAMS_COLUMN + len(PARAM_KEYS) - 1),
+            [Qt.ItemDataRole.DisplayRole]
+        )
+
+    def refresh_buttons(self, row):
+        """Перерисовка только ячеек-кнопок строки"""
+        self.dataChanged.emit(
+            self.index(row, FILE_COLUMN),
+            self.index(row, GRAPH_COLUMN),
+            [Qt.ItemDataRole.DisplayRole, BUTTON_STATE_ROLE]
+        )
+
+    def clear(self):
+        """Удаление всех строк"""
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
+
+    def row_of(self, row_data):
+        """Текущий номер строки с данными row_data или -1, если строку удалили"""
+        for row, data in enumerate(self._rows):
+            if data is row_data:
+                return row
+        return -1
+
+    def row_data(self, row):
+        """Данные строки или None, если строки нет"""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
 
 
 class TableManager(QObject):
     """Управление таблицей файлов и связанными операциями"""
-    
+
     # Сигналы
-    file_loaded = pyqtSignal(int, str)  # row, file_path
+    file_loaded = pyqtSignal(int, str)  # row, file_path (файл прочитан, данные - в file_data_ready)
+    file_data_ready = pyqtSignal(int, object)  # row, {'channels', 'params'}
     row_added = pyqtSignal(int)  # row
+    rows_added_bulk = pyqtSignal(list)  # list of rows, добавленных одной операцией
     rows_deleted = pyqtSignal(list)  # list of rows
     graph_requested = pyqtSignal(int)  # row
-    
-    def __init__(self, table_widget):
+
+    def __init__(self, table_view=None):
         super().__init__()
-        self.table = table_widget
+        self.table = table_view if table_view is not None else QTableView()
+        self.model = FileTableModel(self)
+        # Кнопки файла и графиков рисуются делегатами, строка определяется в момент нажатия
+        self._file_delegate = ButtonDelegate(self)
+        self._file_delegate.clicked.connect(self._on_file_button_clicked)
+        self._graph_delegate = ButtonDelegate(self)
+        self._graph_delegate.clicked.connect(self._on_graph_button_clicked)
+        self._pending_loads = {}  # номер загрузки -> (RowData, FileLoadTask), файлы которых читаются в пуле
+        self._load_counter = 0
         self.setup_table()
-    
+
     def setup_table(self):
         """Настройка таблицы"""
-        self.table.setColumnCount(len(TABLE_HEADERS))
-        self.table.setHorizontalHeaderLabels(TABLE_HEADERS)
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(FILE_COLUMN, self._file_delegate)
+        self.table.setItemDelegateForColumn(GRAPH_COLUMN, self._graph_delegate)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        # Ширины считаются один раз по заголовкам: в режиме Interactive вставка и удаление
+        # строк не пересчитывают раскладку столбцов
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        font_metrics = header.fontMetrics()
+        for column, title in enumerate(TABLE_HEADERS):
+            title_width = max(font_metrics.horizontalAdvance(line) for line in title.split('\n'))
+            self.table.setColumnWidth(column, max(title_width + COLUMN_PADDING, MIN_COLUMN_WIDTHS[column]))
+        # Строки одной высоты: представлению не нужно опрашивать содержимое для раскладки
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.table.verticalHeader().setVisible(False)
-    
+
+    @contextmanager
+    def _bulk_update(self):
+        """
+        Пакетное изменение таблицы: на время операции отключаются сортировка
+        и перерисовка, после - одна перерисовка области.
+        Ширины столбцов заданы заранее (см. setup_table), их переключать не нужно.
+        """
+        sorting_enabled = self.table.isSortingEnabled()
+        self.table.setSortingEnabled(False)
+        self.table.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.table.setSortingEnabled(sorting_enabled)
+            self.table.setUpdatesEnabled(True)
+            self.table.viewport().update()
+
     def add_table_row(self):
         """Добавление новой строки в таблицу"""
-        row_position = self.table.rowCount()
-        self.table.insertRow(row_position)
-        
-        # Поле для кода предмета
-        subject_item = QTableWidgetItem('')
-        self.table.setItem(row_position, 0, subject_item)
-        
-        # Кнопка добавления файла
-        file_button = QPushButton('Добавить файл')
-        file_button.clicked.connect(lambda: self.load_file_for_row(row_position))
-        self.set_button_style(file_button, 'normal')
-        self.table.setCellWidget(row_position, 1, file_button)
-        
-        # Кнопка для открытия графика
-        graph_button = QPushButton('Открыть графики')
-        graph_button.setEnabled(False)
-        graph_button.clicked.connect(lambda: self.graph_requested.emit(row_position))
-        self.table.setCellWidget(row_position, 2, graph_button)
-        
-        # Параметры (нули)
-        for col in range(3, 7):
-            param_item = QTableWidgetItem('0')
-            self.table.setItem(row_position, col, param_item)
-        
+        row_position = self.model.append_row()
+
         self.row_added.emit(row_position)
         return row_position
-    
+
+    def _on_file_button_clicked(self, index):
+        """Кнопка файла: строка берётся из ячейки на момент нажатия"""
+        self.load_file_for_row(index.row())
+
+    def _on_graph_button_clicked(self, index):
+        """Кнопка графиков: строка берётся из ячейки на момент нажатия"""
+        self.graph_requested.emit(index.row())
+
     def load_file_for_row(self, row):
         """Загрузка файла для конкретной строки"""
         file_path, _ = QFileDialog.getOpenFileName(
-            None, 
-            'Выберите файл данных', 
-            '', 
-            'Excel Files (*.xlsx *.xls *.csv);;All Files (*)'
+            None,
+            'Выберите файл данных',
+            '',
+            'Excel Files (*.xlsx *.xls *.csv);;All Files (*)',
+            options=OPEN_DIALOG_OPTIONS
         )
-        
+
         if file_path:
-            self.file_loaded.emit(row, file_path)
-    
+            self._start_file_load(row, file_path)
+
     def load_multiple_files(self):
         """Загрузка нескольких файлов одновременно"""
         file_paths, _ = QFileDialog.getOpenFileNames(
             None,
-            'Выберите файлы данных', 
-            '', 
-            'Excel Files (*.xlsx *.xls *.csv);;All Files (*)'
+            'Выберите файлы данных',
+            '',
+            'Excel Files (*.xlsx *.xls *.csv);;All Files (*)',
+            options=OPEN_DIALOG_OPTIONS
+        )
+
+        if not file_paths:
+            return
+
+        # Все строки вставляются одной транзакцией модели, перерисовка - одна после загрузки
+        with self._bulk_update():
+            first = self.model.append_rows([RowData(file_path=file_path) for file_path in file_paths])
+            rows = range(first, first + len(file_paths))
+
+            for row, file_path in zip(rows, file_paths):
+                self._start_file_load(row, file_path)
+
+        self.model.dataChanged.emit(
+            self.model.index(first, 0),
+            self.model.index(rows[-1], self.model.columnCount() - 1),
+            [Qt.ItemDataRole.DisplayRole]
         )
-        
-        for file_path in file_paths:
-            row = self.add_table_row()
+        # Обработчики получают все новые строки одним сигналом, а не по одному на файл
+        self.rows_added_bulk.emit(list(rows))
+
+    def _start_file_load(self, row, file_path):
+        """Запуск чтения файла строки в глобальном пуле потоков"""
+        row_data = self.model.row_data(row)
+        if row_data is None:
+            return
+
+        row_data.file_path = file_path
+        row_data.file_name = 'Загрузка...'
+        self.model.refresh_buttons(row)
+
+        # Строка запоминается объектом: пока файл читается, строки выше могут удалить
+        self._load_counter += 1
+        key = self._load_counter
+        task = FileLoadTask(key, file_path)
+        task.signals.finished.connect(self._on_file_load_finished)
+        # Задача вместе с объектом сигналов хранится до получения результата
+        self._pending_loads[key] = (row_data, task)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_file_load_finished(self, key, success, file_path, result):
+        """Результат чтения файла из пула потоков"""
+        row_data, _ = self._pending_loads.pop(key, (None, None))
+        row = self.model.row_of(row_data) if row_data is not None else -1
+        if row < 0:
+            return
+
+        file_name = os.path.basename(file_path)
+        if success:
+            self.update_row_after_file_load(row, True, file_name)
+            self.update_row_params(row, result['params'])
             self.file_loaded.emit(row, file_path)
-    
+            # Разобранные каналы передаются дальше, повторно файл читать не нужно
+            self.file_data_ready.emit(row, result)
+        else:
+            self.update_row_after_file_load(row, False, file_name, result)
+
     def update_row_after_file_load(self, row, success, file_name, message=None):
         """Обновление строки после загрузки файла"""
-        file_button = self.table.cellWidget(row, 1)
-        graph_button = self.table.cellWidget(row, 2)
-        
-        if file_button is None or graph_button is None:
+        row_data = self.model.row_data(row)
+        if row_data is None:
             return
-            
+
         if success:
-            file_button.setText(file_name)
-            self.set_button_style(file_button, 'success')
-            graph_button.setEnabled(True)
-            graph_button.setText('Открыть графики')
+            row_data.file_name = file_name
+            row_data.status = 'success'
         else:
             if message and 'вручную' in message:
-                file_button.setText(f'Установите параметры\nвручную: {file_name}')
-                self.set_button_style(file_button, 'warning')
+                row_data.file_name = f'Установите параметры\nвручную: {file_name}'
+                row_data.status = 'warning'
             else:
-                file_button.setText('Ошибка загрузки')
-                self.set_button_style(file_button, 'error')
-                if message:
-                    QMessageBox.warning(None, 'Ошибка', message)
-    
+                row_data.file_name = 'Ошибка загрузки'
+                row_data.status = 'error'
+
+        # Перерисовываются только две ячейки-кнопки этой строки
+        self.model.refresh_buttons(row)
+
+        if not success and row_data.status == 'error' and message:
+            QMessageBox.warning(None, 'Ошибка', message)
+
     def update_row_params(self, row, params):
         """Обновление параметров в строке таблицы"""
-        if row >= self.table.rowCount():
+        if row >= self.model.rowCount():
             return
-            
-        item_3 = self.table.item(row, 3)
-        item_4 = self.table.item(row, 4)
-        item_5 = self.table.item(row, 5)
-        item_6 = self.table.item(row, 6)
-        
-        if item_3 is not None:
-            item_3.setText(str(params['start_freq']))
-        if item_4 is not None:
-            item_4.setText(str(params['end_freq']))
-        if item_5 is not None:
-            item_5.setText(str(params['record_time']))
-        if item_6 is not None:
-            item_6.setText(str(params['cut_second']))
-    
+
+        self.model.set_row_params(row, params)
+
     def update_row_subject_code(self, row, subject_code):
         """Обновление кода предмета в строке"""
-        if row < self.table.rowCount():
-            item = self.table.item(row, 0)
-            if item is not None:
-                item.setText(subject_code)
-    
+        if row < self.model.rowCount():
+            self.model.setData(self.model.index(row, 0), subject_code)
+
     def get_subject_code(self, row):
         """Получение кода предмета из строки"""
-        if row < self.table.rowCount():
-            item = self.table.item(row, 0)
-            if item is not None:
-                return item.text()
+        row_data = self.model.row_data(row)
+        if row_data is not None:
+            return row_data.subject_code
         return ""
-    
+
     def delete_selected_rows(self):
         """Удаление выбранных строк"""
-        selected_rows = set()
-        for item in self.table.selectedItems():
-            selected_rows.add(item.row())
-        
-        if not selected_rows:
+        sorted_rows = self.get_selected_rows(reverse=True)
+
+        if not sorted_rows:
             QMessageBox.information(None, 'Информация', 'Пожалуйста, выберите строки для удаления')
             return
-        
-        sorted_rows = sorted(selected_rows, reverse=True)
-        for row in sorted_rows:
-            self.table.removeRow(row)
-        
+
+        # Подряд идущие строки удаляются одним вызовом removeRows, снизу вверх
+        with self._bulk_update():
+            last = first = sorted_rows[0]
+            for row in sorted_rows[1:]:
+                if row == first - 1:
+                    first = row
+                    continue
+                self.model.removeRows(first, last - first + 1)
+                last = first = row
+            self.model.removeRows(first, last - first + 1)
+
         self.rows_deleted.emit(sorted_rows)
-    
-    def get_selected_rows(self):
+
+    def get_selected_rows(self, reverse=False):
         """Получение списка выбранных строк"""
-        selected_rows = set()
-        for item in self.table.selectedItems():
-            selected_rows.add(item.row())
-        return sorted(selected_rows)
-    
+        return sorted({index.row() for index in self.table.selectionModel().selectedRows()}, reverse=reverse)
+
     def clear_table(self):
         """Очистка таблицы"""
-        self.table.setRowCount(0)
-    
-    def set_button_style(self, button, style_type='normal'):
-        """Установка стиля для кнопки"""
-        if style_type == 'success':
-            button.setStyleSheet(BUTTON_STYLE_SUCCESS)
-        elif style_type == 'error':
-            button.setStyleSheet(BUTTON_STYLE_ERROR)
-        elif style_type == 'warning':
-            button.setStyleSheet(BUTTON_STYLE_WARNING)
-        else:
-            button.setStyleSheet(BUTTON_STYLE_NORMAL)
\ No newline at end of file
+        self.model.clear()
+        self._pending_loads.clear()
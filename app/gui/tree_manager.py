@@ -1,15 +1,15 @@
 # gui/tree_manager.py
 
-from PyQt6.QtWidgets import (
-    QTreeWidgetItem, QHeaderView, QPushButton, 
-    QFileDialog, QMessageBox, QMenu, QCheckBox, QHBoxLayout, QWidget
-)
-from PyQt6.QtCore import pyqtSignal, QObject, Qt
+from PyQt6.QtWidgets import QHeaderView, QPushButton, QFileDialog, QMessageBox, QMenu
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QObject, Qt, QPoint, QModelIndex, QThreadPool
 from PyQt6.QtGui import QAction
 
+from gui.button_delegate import ButtonDelegate
+from gui.file_load_task import FileLoadTask
+from gui.tree_model import TreeModel, CHECK_COLUMN, GRAPH_COLUMN, GRAPH_BUTTON_TEXT
 from gui.tree_widget import TreeWidget
 from gui.tree_items import SubjectItem, AnalysisItem
-from utils.constants import BUTTON_STYLE_NORMAL, BUTTON_STYLE_SUCCESS, BUTTON_STYLE_ERROR, BUTTON_STYLE_WARNING
+from utils.constants import OPEN_DIALOG_OPTIONS
 
 import logging
 
@@ -20,7 +20,8 @@ class TreeManager(QObject):
     """Управление древовидной таблицей с предметами и анализами"""
     
     # Сигналы
-    file_loaded = pyqtSignal(str, str)  # subject_code, file_path
+    # subject_code, analysis_index, success, file_path, {'channels', 'params'} или текст ошибки
+    file_data_ready = pyqtSignal(str, int, bool, str, object)
     subject_added = pyqtSignal(str)  # subject_code
     analysis_added = pyqtSignal(str, int)  # subject_code, analysis_index
     item_selected = pyqtSignal(str, int)  # subject_code, analysis_index (-1 для предмета)
@@ -29,40 +30,58 @@ class TreeManager(QObject):
     def __init__(self):
         super().__init__()
         self.tree = TreeWidget()
+        # Данные строк хранит модель, дерево рисует только видимые строки
+        self.model = TreeModel(self)
+        # Кнопка графиков рисуется делегатом, анализ определяется в момент нажатия
+        self._graph_delegate = ButtonDelegate(self)
+        self._graph_delegate.clicked.connect(self._on_graph_button_clicked)
         self.setup_tree()
         
-        # Данные для хранения связи между элементами дерева и данными
+        # Данные для хранения связи между кодами предметов и элементами модели
         self.subject_items = {}  # subject_code -> SubjectItem
+        self._bulk_depth = 0  # Глубина вложенных begin_bulk_update
+        self._bulk_sorting = False  # Состояние сортировки до начала пакетного обновления
+        self._pending_loads = {}  # номер загрузки -> (AnalysisItem, FileLoadTask), файлы которых читаются в пуле
+        self._load_counter = 0
+        # Кэши ответов get_selected_analyses и get_all_subject_names, None - устарел.
+        # Сбрасываются при изменении структуры дерева и любом изменении данных модели
+        self._selected_cache = None
+        self._name_cache = None
         
         # Подключаем сигнал перемещения
         self.tree.analysis_moved.connect(self.handle_analysis_moved)
-        self.tree.itemChanged.connect(self.on_item_changed)
+        # Чекбоксы и имена предметов пользователь меняет через модель
+        self.model.dataChanged.connect(self._on_model_data_changed)
         
         logger.debug("TreeManager инициализирован")
     
     def setup_tree(self):
         """Настройка древовидной таблицы"""
         logger.debug("Настройка древовидной таблицы")
-        self.tree.setColumnCount(7)
-        self.tree.setHeaderLabels([
-            'Выбор', 
-            'Код предмета', 
-            'Файл анализа', 
-            'Графики и \nподстройка значений', 
-            'Начальная частота (Гц)', 
-            'Конечная частота (Гц)', 
-            'Время записи (сек)'
-        ])
-        
-        self.tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.tree.setModel(self.model)
+        self.tree.setItemDelegateForColumn(GRAPH_COLUMN, self._graph_delegate)
+        
+        header = self.tree.header()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        # Ширина чекбокса и кнопки графиков не зависит от данных, столбцы фиксированные
+        header.setSectionResizeMode(CHECK_COLUMN, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(GRAPH_COLUMN, QHeaderView.ResizeMode.Fixed)
+        self.tree.setColumnWidth(GRAPH_COLUMN, QPushButton(GRAPH_BUTTON_TEXT).sizeHint().width())
+        
+        # Все строки одной высоты (ячейки без кнопки делегат выравнивает по кнопке),
+        # поэтому представлению не нужно опрашивать sizeHint каждой строки при раскладке
+        self.tree.setUniformRowHeights(True)
+        self.tree.setItemsExpandable(True)
+        
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         
         # Подключаем контекстное меню
         self.tree.customContextMenuRequested.connect(self.show_context_menu)
     
+    @pyqtSlot(str, str, int)
     def handle_analysis_moved(self, old_subject, new_subject, analysis_index):
         """Обработка перемещения анализа между предметами"""
-        logger.debug(f"Обработка перемещения: {old_subject} -> {new_subject}, индекс: {analysis_index}")
+        logger.debug("Обработка перемещения: %s -> %s, индекс: %s", old_subject, new_subject, analysis_index)
         
         if old_subject in self.subject_items and new_subject in self.subject_items:
             old_subject_item = self.subject_items[old_subject]
@@ -70,58 +89,59 @@ class TreeManager(QObject):
             
             analysis_item = old_subject_item.get_analysis(analysis_index)
             if analysis_item:
-                # Перемещаем анализ
-                moved_item = old_subject_item.move_analysis_to(analysis_item, new_subject)
-                new_subject_item.analyses[analysis_index] = moved_item
-                new_subject_item.addChild(moved_item)
-                
-                # Обновляем кнопку графиков
-                self.update_graph_button(moved_item, new_subject, analysis_index)
-                
-                # Обновляем чекбокс
-                self.update_checkbox(moved_item, new_subject, analysis_index)
+                # Перемещаем строку анализа в модели, код предмета меняется там же
+                self.model.move_analysis(analysis_item, new_subject_item)
+                self._invalidate_caches()
+                self.tree.expand(self.model.index_of(new_subject_item))
                 
                 # Испускаем сигнал для обновления DataManager
                 self.analysis_moved.emit(old_subject, new_subject, analysis_index)
-                logger.debug(f"Перемещение завершено успешно")
+                logger.debug("Перемещение завершено успешно")
             else:
-                logger.warning(f"Не найден анализ для перемещения: {old_subject}, {analysis_index}")
+                logger.warning("Не найден анализ для перемещения: %s, %s", old_subject, analysis_index)
         else:
-            logger.warning(f"Предметы не найдены: {old_subject} или {new_subject}")
+            logger.warning("Предметы не найдены: %s или %s", old_subject, new_subject)
     
-    def update_graph_button(self, analysis_item, subject_code, analysis_index):
-        """Обновление кнопки открытия графиков после перемещения"""
-        logger.debug(f"Обновление кнопки графиков: {subject_code}, {analysis_index}")
-        
-        # Создаем новую кнопку с правильными параметрами
-        new_graph_button = QPushButton('Открыть графики')
-        new_graph_button.clicked.connect(lambda: self.item_selected.emit(subject_code, analysis_index))
-        self.set_button_style(new_graph_button, 'normal')
-        
-        # Заменяем кнопку в дереве
-        self.tree.setItemWidget(analysis_item, 3, new_graph_button)
-        analysis_item.graph_button = new_graph_button
+    def begin_bulk_update(self):
+        """
+        Начало пакетного добавления строк: дерево не перерисовывается и не сортируется
+        до парного end_bulk_update (вызовы могут вкладываться). Сигналы модели и
+        представления не блокируются: вставки идут через TreeModel, выделение работает
+        """
+        self._bulk_depth += 1
+        if self._bulk_depth > 1:
+            return
+        self._bulk_sorting = self.tree.isSortingEnabled()
+        self.tree.setSortingEnabled(False)
+        self.tree.setUpdatesEnabled(False)
+    
+    def end_bulk_update(self):
+        """Завершение пакетного добавления: одна перерисовка дерева"""
+        if self._bulk_depth == 0:
+            return
+        self._bulk_depth -= 1
+        if self._bulk_depth > 0:
+            return
+        self.tree.setSortingEnabled(self._bulk_sorting)
+        self.tree.setUpdatesEnabled(True)
+        self.tree.viewport().update()
     
-    def update_checkbox(self, analysis_item, subject_code, analysis_index):
-        """Обновление чекбокса после перемещения"""
-        logger.debug(f"Обновление чекбокса: {subject_code}, {analysis_index}")
-        
-        # Сохраняем состояние старого чекбокса
-        old_checked = analysis_item.get_checkbox_state()
-        
-        # Создаем новый чекбокс
-        checkbox_widget = QWidget()
-        checkbox_layout = QHBoxLayout(checkbox_widget)
-        checkbox_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        checkbox_layout.setContentsMargins(0, 0, 0, 0)
-        
-        checkbox = QCheckBox()
-        checkbox.setChecked(old_checked)  # Сохраняем состояние
-        checkbox_layout.addWidget(checkbox)
-        
-        self.tree.setItemWidget(analysis_item, 0, checkbox_widget)
-        analysis_item.checkbox_widget = checkbox_widget
-        analysis_item.checkbox = checkbox
+    @pyqtSlot(QModelIndex)
+    def _on_graph_button_clicked(self, index):
+        """Кнопка графиков: предмет и индекс берутся из строки на момент нажатия"""
+        analysis_item = self.model.item_from_index(index)
+        if isinstance(analysis_item, AnalysisItem):
+            self.item_selected.emit(analysis_item.subject_code, analysis_item.analysis_index)
+    
+    def _invalidate_caches(self):
+        """Сброс кэшей выбранных анализов и имён предметов"""
+        self._selected_cache = None
+        self._name_cache = None
+    
+    @pyqtSlot(QModelIndex, QModelIndex, 'QList<int>')
+    def _on_model_data_changed(self, top_left, bottom_right, roles):
+        """Изменение данных модели (чекбокс, имя предмета, отображение анализа)"""
+        self._invalidate_caches()
     
     def add_subject(self, subject_code=None):
         """Добавление нового предмета"""
@@ -135,78 +155,125 @@ class TreeManager(QObject):
         
         # Создаем элемент предмета
         subject_item = SubjectItem(subject_code)
-        self.tree.addTopLevelItem(subject_item)
+        self.model.add_subject(subject_item)
         
         # Сохраняем ссылку
         self.subject_items[subject_code] = subject_item
+        self._invalidate_caches()
         
-        logger.debug(f"Предмет добавлен: {subject_code}. Всего предметов: {len(self.subject_items)}")
+        logger.debug("Предмет добавлен: %s. Всего предметов: %s", subject_code, len(self.subject_items))
         
         self.subject_added.emit(subject_code)
         return subject_code
     
-    def add_analysis_to_subject(self, subject_code, file_data, analysis_index=None):
-        """Добавление анализа к предмету"""
-        logger.debug(f"Добавление анализа к предмету: {subject_code}, индекс: {analysis_index}")
+    def add_analysis_to_subject(self, subject_code, file_data, analysis_index=None, expand=True):
+        """
+        Добавление анализа к предмету (expand=False - не разворачивать предмет:
+        строки свёрнутого предмета модель отдаст дереву только при разворачивании)
+        """
+        logger.debug("Добавление анализа к предмету: %s, индекс: %s", subject_code, analysis_index)
         
         if subject_code not in self.subject_items:
-            logger.error(f"Предмет {subject_code} не найден")
+            logger.error("Предмет %s не найден", subject_code)
             QMessageBox.warning(None, 'Ошибка', f'Предмет {subject_code} не найден')
             return None
         
         subject_item = self.subject_items[subject_code]
         
-        # Добавляем анализ через SubjectItem
-        analysis_item, actual_index = subject_item.add_analysis(file_data, analysis_index)
+        # Индекс выдаёт SubjectItem, строку вставляет модель
+        analysis_item = subject_item.create_analysis(file_data, analysis_index)
+        actual_index = analysis_item.analysis_index
+        self.model.add_analyses(subject_item, [analysis_item])
+        self._invalidate_caches()
         
-        # Устанавливаем виджеты в дереве
-        self.tree.setItemWidget(analysis_item, 0, analysis_item.checkbox_widget)
-        
-        # Настраиваем кнопку графиков
-        analysis_item.graph_button.clicked.connect(
-            lambda: self.item_selected.emit(subject_code, actual_index)
-        )
-        self.set_button_style(analysis_item.graph_button, 'normal')
-        self.tree.setItemWidget(analysis_item, 3, analysis_item.graph_button)
+        # Разворачиваем предмет, чтобы показать анализы
+        if expand:
+            self.tree.expand(self.model.index_of(subject_item))
         
-        logger.debug(f"Анализ добавлен: {subject_code}, индекс: {actual_index}")
+        logger.debug("Анализ добавлен: %s, индекс: %s", subject_code, actual_index)
         
         self.analysis_added.emit(subject_code, actual_index)
         return actual_index
     
     def load_files_to_subject(self, subject_code, file_paths):
         """Загрузка файлов в указанный предмет"""
-        logger.debug(f"Загрузка {len(file_paths)} файлов в предмет: {subject_code}")
+        logger.debug("Загрузка %s файлов в предмет: %s", len(file_paths), subject_code)
         
         if subject_code not in self.subject_items:
-            logger.error(f"Предмет {subject_code} не найден")
+            logger.error("Предмет %s не найден", subject_code)
             QMessageBox.warning(None, 'Ошибка', f'Предмет {subject_code} не найден')
             return
         
-        for file_path in file_paths:
-            logger.debug(f"Загрузка файла: {file_path}")
-            self.file_loaded.emit(subject_code, file_path)
+        # Строки всех файлов вставляются одной вставкой, файлы читаются в пуле потоков
+        subject_item = self.subject_items[subject_code]
+        analysis_items = [
+            subject_item.create_analysis({
+                'file_name': 'Загрузка...',
+                'params': {
+                    'start_freq': 0,
+                    'end_freq': 0,
+                    'record_time': 0
+                }
+            })
+            for _ in file_paths
+        ]
+        self.model.add_analyses(subject_item, analysis_items)
+        self._invalidate_caches()
+        self.tree.expand(self.model.index_of(subject_item))
+        
+        for analysis_item, file_path in zip(analysis_items, file_paths):
+            logger.debug("Загрузка файла: %s", file_path)
+            self.analysis_added.emit(subject_code, analysis_item.analysis_index)
+            self._start_file_load(analysis_item, file_path)
+    
+    def _start_file_load(self, analysis_item, file_path):
+        """Запуск чтения файла в пуле потоков, GUI не блокируется"""
+        # Анализ запоминается объектом: пока файл читается, его могут переместить или удалить
+        self._load_counter += 1
+        key = self._load_counter
+        task = FileLoadTask(key, file_path)
+        task.signals.finished.connect(self._on_file_load_finished)
+        # Задача вместе с объектом сигналов хранится до получения результата
+        self._pending_loads[key] = (analysis_item, task)
+        QThreadPool.globalInstance().start(task)
+    
+    @pyqtSlot(int, bool, str, object)
+    def _on_file_load_finished(self, key, success, file_path, result):
+        """Результат чтения файла из пула потоков"""
+        analysis_item, _ = self._pending_loads.pop(key, (None, None))
+        if analysis_item is None or not self._contains_analysis(analysis_item):
+            return
+        
+        # Код предмета и индекс берутся из анализа на момент получения результата
+        self.file_data_ready.emit(
+            analysis_item.subject_code, analysis_item.analysis_index, success, file_path, result
+        )
+    
+    def _contains_analysis(self, analysis_item):
+        """Анализ всё ещё в дереве (не удалён вместе с предметом или отдельно)"""
+        subject_item = self.subject_items.get(analysis_item.subject_code)
+        return subject_item is analysis_item.subject and analysis_item in subject_item.analyses
     
     def get_selected_subject(self):
         """Получение выбранного предмета"""
-        current_item = self.tree.currentItem()
+        current_item = self.model.item_from_index(self.tree.currentIndex())
         if isinstance(current_item, SubjectItem):
             subject_code = current_item.subject_code
-            logger.debug(f"Выбран предмет: {subject_code}")
+            logger.debug("Выбран предмет: %s", subject_code)
             return subject_code
         elif isinstance(current_item, AnalysisItem):
             subject_code = current_item.subject_code
-            logger.debug(f"Выбран анализ в предмете: {subject_code}")
+            logger.debug("Выбран анализ в предмете: %s", subject_code)
             return subject_code
         logger.debug("Ничего не выбрано")
         return None
     
     def get_selected_analysis_index(self):
         """Получение индекса выбранного анализа"""
-        current_item = self.tree.currentItem()
+        current_item = self.model.item_from_index(self.tree.currentIndex())
         if isinstance(current_item, AnalysisItem):
             analysis_index = current_item.analysis_index
-            logger.debug(f"Выбран анализ с индексом: {analysis_index}")
+            logger.debug("Выбран анализ с индексом: %s", analysis_index)
             return analysis_index
         logger.debug("Анализ не выбран")
         return -1
@@ -218,75 +285,82 @@ class TreeManager(QObject):
             analysis_item = subject_item.get_analysis(analysis_index)
             if analysis_item:
                 state = analysis_item.get_checkbox_state()
-                logger.debug(f"Состояние чекбокса {subject_code}, {analysis_index}: {state}")
+                # Вызывается на каждый анализ при обходе дерева: без отладки запись не собирается
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Состояние чекбокса %s, %s: %s", subject_code, analysis_index, state)
                 return state
-        logger.warning(f"Анализ не найден: {subject_code}, {analysis_index}")
+        logger.warning("Анализ не найден: %s, %s", subject_code, analysis_index)
         return False
     
     def get_all_subjects(self):
         """Получение списка всех предметов"""
         subjects = list(self.subject_items.keys())
-        logger.debug(f"Всего предметов: {len(subjects)}")
+        logger.debug("Всего предметов: %s", len(subjects))
         return subjects
     
     def get_subject_analyses(self, subject_code):
         """Получение списка анализов предмета"""
         if subject_code in self.subject_items:
             analyses = self.subject_items[subject_code].get_all_analyses()
-            logger.debug(f"Предмет {subject_code} имеет {len(analyses)} анализов")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Предмет %s имеет %s анализов", subject_code, len(analyses))
             return analyses
-        logger.warning(f"Предмет {subject_code} не найден")
+        logger.warning("Предмет %s не найден", subject_code)
         return []
     
     def get_selected_analyses(self):
-        """Получение списка выбранных анализов (с включенными чекбоксами)"""
-        selected = []
-        for subject_code, subject_item in self.subject_items.items():
-            selected_analyses = subject_item.get_selected_analyses()
-            for analysis_index in selected_analyses:
-                selected.append((subject_code, analysis_index))
-        
-        logger.debug(f"Выбрано анализов: {len(selected)}")
-        return selected
+        """
+        Получение списка выбранных анализов (с включенными чекбоксами).
+        Дерево обходится только после изменений, иначе возвращается копия кэша
+        """
+        if self._selected_cache is None:
+            self._selected_cache = [
+                (subject_code, analysis_index)
+                for subject_code, subject_item in self.subject_items.items()
+                for analysis_index in subject_item.iter_selected_analyses()
+            ]
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Выбрано анализов: %s", len(self._selected_cache))
+        return list(self._selected_cache)
+    
+    def has_selected_analyses(self):
+        """Есть ли хотя бы один выбранный анализ (без сбора полного списка)"""
+        if self._selected_cache is not None:
+            return bool(self._selected_cache)
+        return any(subject_item.any_selected() for subject_item in self.subject_items.values())
     
     def update_analysis_display(self, subject_code, analysis_index, success, file_name, message=None):
         """Обновление отображения анализа после загрузки"""
-        logger.debug(f"Обновление отображения анализа: {subject_code}, {analysis_index}, успех: {success}")
+        logger.debug("Обновление отображения анализа: %s, %s, успех: %s", subject_code, analysis_index, success)
         
         if subject_code in self.subject_items:
-            subject_item = self.subject_items[subject_code]
-            subject_item.update_analysis_display(analysis_index, success, file_name, message)
-            
-            # Обновляем стиль кнопки
-            analysis_item = subject_item.get_analysis(analysis_index)
-            if analysis_item and analysis_item.graph_button:
-                if success:
-                    self.set_button_style(analysis_item.graph_button, 'success')
-                    logger.debug(f"Отображение обновлено успешно для {subject_code}, {analysis_index}")
-                else:
-                    if message and 'вручную' in message:
-                        self.set_button_style(analysis_item.graph_button, 'warning')
-                        logger.debug(f"Отображение обновлено с предупреждением для {subject_code}, {analysis_index}")
-                    else:
-                        self.set_button_style(analysis_item.graph_button, 'error')
-                        logger.debug(f"Отображение обновлено с ошибкой для {subject_code}, {analysis_index}")
+            analysis_item = self.subject_items[subject_code].get_analysis(analysis_index)
+            if analysis_item:
+                # Текст файла и стиль кнопки графиков меняются в данных, строка перерисовывается
+                analysis_item.update_display(success, file_name, message)
+                self.model.analysis_changed(analysis_item)
+                logger.debug("Отображение обновлено для %s, %s: %s", subject_code, analysis_index, analysis_item.graph_style)
         else:
-            logger.error(f"Предмет {subject_code} не найден при обновлении отображения")
+            logger.error("Предмет %s не найден при обновлении отображения", subject_code)
     
     def update_analysis_params(self, subject_code, analysis_index, params):
         """Обновление параметров анализа"""
-        logger.debug(f"Обновление параметров анализа: {subject_code}, {analysis_index}")
+        logger.debug("Обновление параметров анализа: %s, %s", subject_code, analysis_index)
         
         if subject_code in self.subject_items:
-            subject_item = self.subject_items[subject_code]
-            subject_item.update_analysis_params(analysis_index, params)
-            logger.debug(f"Параметры обновлены для {subject_code}, {analysis_index}")
+            analysis_item = self.subject_items[subject_code].get_analysis(analysis_index)
+            if analysis_item:
+                analysis_item.update_params(params)
+                self.model.analysis_changed(analysis_item)
+            logger.debug("Параметры обновлены для %s, %s", subject_code, analysis_index)
         else:
-            logger.error(f"Предмет {subject_code} не найден при обновлении параметров")
+            logger.error("Предмет %s не найден при обновлении параметров", subject_code)
     
+    @pyqtSlot(QPoint)
     def show_context_menu(self, position):
         """Показать контекстное меню"""
-        item = self.tree.itemAt(position)
+        item = self.model.item_from_index(self.tree.indexAt(position))
         if not item:
             return
         
@@ -309,6 +383,7 @@ class TreeManager(QObject):
         
         menu.exec(self.tree.mapToGlobal(position))
     
+    @pyqtSlot()
     def load_files_to_current_subject(self):
         """Загрузка файлов в текущий выбранный предмет"""
         subject_code = self.get_selected_subject()
@@ -320,7 +395,8 @@ class TreeManager(QObject):
             None,
             'Выберите файлы данных', 
             '', 
-            'Excel Files (*.xlsx *.xls *.csv);;All Files (*)'
+            'Excel Files (*.xlsx *.xls *.csv);;All Files (*)',
+            options=OPEN_DIALOG_OPTIONS
         )
         
         if file_paths:
@@ -328,6 +404,7 @@ class TreeManager(QObject):
 
         
     
+    @pyqtSlot()
     def delete_current_subject(self):
         """Удаление текущего выбранного предмета"""
         subject_code = self.get_selected_subject()
@@ -344,11 +421,11 @@ class TreeManager(QObject):
         if reply == QMessageBox.StandardButton.Yes:
             if subject_code in self.subject_items:
                 subject_item = self.subject_items.pop(subject_code)
-                index = self.tree.indexOfTopLevelItem(subject_item)
-                if index >= 0:
-                    self.tree.takeTopLevelItem(index)
-                logger.debug(f"Предмет {subject_code} удален")
+                self.model.remove_subject(subject_item)
+                self._invalidate_caches()
+                logger.debug("Предмет %s удален", subject_code)
     
+    @pyqtSlot()
     def delete_current_analysis(self):
         """Удаление текущего выбранного анализа"""
         subject_code = self.get_selected_subject()
@@ -358,23 +435,20 @@ class TreeManager(QObject):
             return
         
         if subject_code in self.subject_items:
-            subject_item = self.subject_items[subject_code]
-            if subject_item.remove_analysis(analysis_index):
-                logger.debug(f"Анализ удален: {subject_code}, {analysis_index}")
+            analysis_item = self.subject_items[subject_code].get_analysis(analysis_index)
+            if analysis_item:
+                self.model.remove_analysis(analysis_item)
+                self._invalidate_caches()
+                logger.debug("Анализ удален: %s, %s", subject_code, analysis_index)
     
     def clear_tree(self):
         """Очистка всего дерева"""
-        self.tree.clear()
+        self.model.clear()
         self.subject_items.clear()
+        self._pending_loads.clear()
+        self._invalidate_caches()
         logger.debug("Дерево очищено")
 
-    def on_item_changed(self, item, column):
-        """Просто обновляем отображаемое имя при редактировании"""
-        if column == 1 and isinstance(item, SubjectItem):
-            new_name = item.text(1).strip()
-            if new_name:
-                item.subject_name = new_name
-
     def get_subject_name(self, subject_code):
         """Получение отображаемого имени предмета"""
         if subject_code in self.subject_items:
@@ -382,22 +456,14 @@ class TreeManager(QObject):
         return subject_code
     
     def get_all_subject_names(self):
-        """Получение всех имен предметов"""
-        return {code: item.subject_name for code, item in self.subject_items.items()}
+        """Получение всех имен предметов (копия кэша, словарь строится только после изменений)"""
+        if self._name_cache is None:
+            self._name_cache = {code: item.subject_name for code, item in self.subject_items.items()}
+        return dict(self._name_cache)
     
     def set_subject_name(self, subject_code, subject_name):
         """Установка имени для предмета"""
         if subject_code in self.subject_items:
-            self.subject_items[subject_code].subject_name = subject_name
-            self.subject_items[subject_code].setText(1, subject_name)
-    
-    def set_button_style(self, button, style_type='normal'):
-        """Установка стиля для кнопки"""
-        if style_type == 'success':
-            button.setStyleSheet(BUTTON_STYLE_SUCCESS)
-        elif style_type == 'error':
-            button.setStyleSheet(BUTTON_STYLE_ERROR)
-        elif style_type == 'warning':
-            button.setStyleSheet(BUTTON_STYLE_WARNING)
-        else:
-            button.setStyleSheet(BUTTON_STYLE_NORMAL)
\ No newline at end of file
+            subject_item = self.subject_items[subject_code]
+            subject_item.subject_name = subject_name
+            self.model.subject_changed(subject_item)
@@ -0,0 +1,272 @@
+# gui/tree_model.py
+
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+from gui.button_delegate import BUTTON_STATE_ROLE
+from gui.tree_items import SubjectItem, AnalysisItem
+from utils.constants import TREE_HEADERS, TREE_HEADER_TOOLTIPS
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHECK_COLUMN = 0
+NAME_COLUMN = 1
+FILE_COLUMN = 2
+GRAPH_COLUMN = 3
+# Параметры анализа в столбцах 4-6 дерева
+PARAM_KEYS = ('start_freq', 'end_freq', 'record_time')
+PARAMS_COLUMN = 4
+GRAPH_BUTTON_TEXT = 'Открыть графики'
+
+
+class TreeModel(QAbstractItemModel):
+    """
+    Модель дерева предметов и анализов: данные лежат в списке SubjectItem
+    с анализами внутри, ячейки и виджеты на строку не создаются.
+    Внутренний указатель индекса анализа - его предмет, у индекса предмета - None.
+    Строки анализов отдаются представлению по запросу (canFetchMore/fetchMore):
+    пока предмет не развернут, его анализы существуют только в списке данных.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._subjects = []
+
+    # Чтение модели
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column)
+        return self.createIndex(row, column, self._subjects[parent.row()])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        subject_item = index.internalPointer()
+        if subject_item is None:
+            return QModelIndex()
+        return self.createIndex(self._subjects.index(subject_item), 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._subjects)
+        if parent.internalPointer() is None and parent.column() == 0:
+            return self._subjects[parent.row()].fetched or 0
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(TREE_HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        # Стрелка разворачивания нужна и предмету, строки которого ещё не запрошены
+        if not parent.isValid():
+            return bool(self._subjects)
+        if parent.internalPointer() is None and parent.column() == 0:
+            return bool(self._subjects[parent.row()].analyses)
+        return False
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or parent.internalPointer() is not None:
+            return False
+        subject_item = self._subjects[parent.row()]
+        return (subject_item.fetched or 0) < len(subject_item.analyses)
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        # Все оставшиеся строки сразу: QTreeView догружает при прокрутке только
+        # последний развернутый элемент, порции в середине дерева остались бы недоступны
+        subject_item = self._subjects[parent.row()]
+        first = subject_item.fetched or 0
+        self.beginInsertRows(parent, first, len(subject_item.analyses) - 1)
+        subject_item.fetched = len(subject_item.analyses)
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return TREE_HEADERS[section]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return TREE_HEADER_TOOLTIPS.get(section)
+        return None
+
+    def item_from_index(self, index):
+        """SubjectItem или AnalysisItem строки индекса, None для корня"""
+        if not index.isValid():
+            return None
+        subject_item = index.internalPointer()
+        if subject_item is None:
+            return self._subjects[index.row()]
+        return subject_item.analyses[index.row()]
+
+    def index_of(self, item, column=0):
+        """Индекс строки предмета или анализа"""
+        if isinstance(item, AnalysisItem):
+            return self.createIndex(item.subject.analyses.index(item), column, item.subject)
+        return self.createIndex(self._subjects.index(item), column)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        item = self.item_from_index(index)
+        column = index.column()
+
+        if isinstance(item, SubjectItem):
+            if column == NAME_COLUMN and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+                return item.subject_name
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == FILE_COLUMN:
+                return item.display_name
+            if column == GRAPH_COLUMN:
+                return GRAPH_BUTTON_TEXT
+            if column >= PARAMS_COLUMN:
+                return str(item.file_data['params'][PARAM_KEYS[column - PARAMS_COLUMN]])
+        elif role == Qt.ItemDataRole.CheckStateRole and column == CHECK_COLUMN:
+            return Qt.CheckState.Checked if item.checked else Qt.CheckState.Unchecked
+        elif role == BUTTON_STATE_ROLE and column == GRAPH_COLUMN:
+            return item.graph_style
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.internalPointer() is None:
+            # Предмет: переименование и приём перетаскиваемых анализов
+            flags |= Qt.ItemFlag.ItemIsDropEnabled
+            if index.column() == NAME_COLUMN:
+                flags |= Qt.ItemFlag.ItemIsEditable
+        else:
+            # Анализ: перетаскивание, чекбокс рисует делегат по умолчанию
+            flags |= Qt.ItemFlag.ItemIsDragEnabled
+            if index.column() == CHECK_COLUMN:
+                flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def dropMimeData(self, data, action, row, column, parent):
+        # Перетаскиваемый анализ переносит TreeManager (move_analysis), сама модель
+        # строк из перетаскивания не вставляет
+        return False
+
+    # Изменение данных
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+
+        item = self.item_from_index(index)
+        column = index.column()
+
+        if isinstance(item, SubjectItem):
+            if column == NAME_COLUMN and role == Qt.ItemDataRole.EditRole:
+                new_name = str(value).strip()
+                if not new_name:
+                    return False
+                item.subject_name = new_name
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+                return True
+            return False
+
+        if column == CHECK_COLUMN and role == Qt.ItemDataRole.CheckStateRole:
+            item.checked = Qt.CheckState(value) == Qt.CheckState.Checked
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+            return True
+        return False
+
+    def subject_changed(self, subject_item):
+        """Перерисовка имени предмета после изменения subject_name"""
+        index = self.index_of(subject_item, NAME_COLUMN)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+    def analysis_changed(self, analysis_item):
+        """Перерисовка строки анализа после изменения его данных"""
+        subject_item = analysis_item.subject
+        if subject_item.analyses.index(analysis_item) >= (subject_item.fetched or 0):
+            return  # Строка ещё не отдана представлению
+        self.dataChanged.emit(
+            self.index_of(analysis_item, CHECK_COLUMN),
+            self.index_of(analysis_item, len(TREE_HEADERS) - 1)
+        )
+
+    # Изменение структуры
+
+    def add_subject(self, subject_item):
+        """Добавление предмета в конец списка"""
+        row = len(self._subjects)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._subjects.append(subject_item)
+        self.endInsertRows()
+
+    def remove_subject(self, subject_item):
+        """Удаление предмета вместе с анализами"""
+        row = self._subjects.index(subject_item)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._subjects[row]
+        self.endRemoveRows()
+
+    def add_analyses(self, subject_item, analysis_items):
+        """
+        Добавление анализов в конец предмета. Строки вставляются сразу одной вставкой,
+        только если представлению уже отданы все анализы предмета, иначе их отдаст fetchMore
+        """
+        if not analysis_items:
+            return
+        first = len(subject_item.analyses)
+        if subject_item.fetched != first:
+            subject_item.analyses.extend(analysis_items)
+            return
+        self.beginInsertRows(self.index_of(subject_item), first, first + len(analysis_items) - 1)
+        subject_item.analyses.extend(analysis_items)
+        subject_item.fetched = len(subject_item.analyses)
+        self.endInsertRows()
+
+    def remove_analysis(self, analysis_item):
+        """Удаление анализа из его предмета"""
+        subject_item = analysis_item.subject
+        row = subject_item.analyses.index(analysis_item)
+        if row >= (subject_item.fetched or 0):
+            del subject_item.analyses[row]
+            return
+        self.beginRemoveRows(self.index_of(subject_item), row, row)
+        del subject_item.analyses[row]
+        subject_item.fetched -= 1
+        self.endRemoveRows()
+
+    def move_analysis(self, analysis_item, new_subject_item):
+        """Перенос анализа в конец другого предмета"""
+        old_subject_item = analysis_item.subject
+        row = old_subject_item.analyses.index(analysis_item)
+        destination = len(new_subject_item.analyses)
+        if row >= (old_subject_item.fetched or 0) or new_subject_item.fetched != destination:
+            # Одна из строк не отдана представлению: удаление и добавление по отдельности
+            self.remove_analysis(analysis_item)
+            new_subject_item.adopt_analysis(analysis_item)
+            self.add_analyses(new_subject_item, [analysis_item])
+            return True
+        if not self.beginMoveRows(self.index_of(old_subject_item), row, row,
+                                  self.index_of(new_subject_item), destination):
+            return False
+        del old_subject_item.analyses[row]
+        old_subject_item.fetched -= 1
+        new_subject_item.analyses.append(analysis_item)
+        new_subject_item.fetched += 1
+        new_subject_item.adopt_analysis(analysis_item)
+        self.endMoveRows()
+        return True
+
+    def clear(self):
+        """Удаление всех предметов"""
+        self.beginResetModel()
+        self._subjects.clear()
+        self.endResetModel()
@@ -1,6 +1,6 @@
 # gui/tree_widget.py
 
-from PyQt6.QtWidgets import QTreeWidget
+from PyQt6.QtWidgets import QTreeView
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QDropEvent
 
@@ -10,45 +10,56 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class TreeWidget(QTreeWidget):
+class TreeWidget(QTreeView):
     """Кастомное дерево с поддержкой drag & drop между предметами"""
     
     analysis_moved = pyqtSignal(str, str, int)  # old_subject, new_subject, analysis_index
     
     def __init__(self):
         super().__init__()
-        self.setDragDropMode(QTreeWidget.DragDropMode.DragDrop)
+        self.setDragDropMode(QTreeView.DragDropMode.DragDrop)
         self.setDefaultDropAction(Qt.DropAction.MoveAction)
-        self.setSelectionMode(QTreeWidget.SelectionMode.SingleSelection)
+        self.setSelectionMode(QTreeView.SelectionMode.SingleSelection)
     
     def dropEvent(self, event: QDropEvent):
-        """Обработка события drop для перемещения анализов между предметами"""
+        """
+        Обработка события drop для перемещения анализов между предметами.
+        Строку переносит TreeManager по сигналу analysis_moved, модель сама
+        строки из перетаскивания не вставляет
+        """
         try:
+            model = self.model()
             # Получаем источник и целевой элемент
-            source_item = self.currentItem()
+            source_item = model.item_from_index(self.currentIndex())
+            target_item = model.item_from_index(self.indexAt(event.position().toPoint()))
             
-            # ИСПРАВЛЕНИЕ: используем position().toPoint() вместо pos() для PyQt6
-            target_item = self.itemAt(event.position().toPoint())
+            # Анализ, брошенный на строку другого анализа, попадает в его предмет
+            if isinstance(target_item, AnalysisItem):
+                target_item = target_item.subject
             
-            # Проверяем, что перетаскиваем анализ и бросаем на предмет
-            if (isinstance(source_item, AnalysisItem) and 
-                isinstance(target_item, SubjectItem)):
+            # Проверяем, что перетаскиваем анализ и бросаем на другой предмет
+            if (isinstance(source_item, AnalysisItem) and
+                isinstance(target_item, SubjectItem) and
+                source_item.subject is not target_item):
                 
                 old_subject = source_item.subject_code
                 new_subject = target_item.subject_code
                 analysis_index = source_item.analysis_index
                 
-                logger.debug(f"Перемещение анализа: {old_subject} -> {new_subject}, индекс: {analysis_index}")
+                logger.debug("Перемещение анализа: %s -> %s, индекс: %s", old_subject, new_subject, analysis_index)
                 
-                # Вызываем родительский метод для фактического перемещения в дереве
-                super().dropEvent(event)
+                event.setDropAction(Qt.DropAction.MoveAction)
+                event.accept()
                 
                 # Испускаем сигнал о перемещении
                 self.analysis_moved.emit(old_subject, new_subject, analysis_index)
             else:
-                # Для других случаев используем стандартное поведение
-                super().dropEvent(event)
-                
+                event.ignore()
+        
         except Exception as e:
-            logger.error(f"Ошибка при обработке drop: {e}")
-            super().dropEvent(event)
\ No newline at end of file
+            logger.error("Ошибка при обработке drop: %s", e)
+            event.ignore()
+        
+        # Базовая обработка останавливает автопрокрутку и сбрасывает состояние
+        # перетаскивания, строк она не вставляет (TreeModel.dropMimeData)
+        super().dropEvent(event)
@@ -108,7 +108,7 @@ class MainWindow(QMainWindow):
     
     def connect_tree_signals(self):
         """Подключение сигналов древовидной таблицы"""
-        self.tree_manager.file_loaded.connect(self.on_file_loaded)
+        self.tree_manager.file_data_ready.connect(self.on_file_data_ready)
         self.tree_manager.subject_added.connect(self.on_subject_added)
         self.tree_manager.analysis_added.connect(self.on_analysis_added)
         self.tree_manager.item_selected.connect(self.on_item_selected)
@@ -136,40 +136,28 @@ class MainWindow(QMainWindow):
         """Добавление нового предмета"""
         self.tree_manager.add_subject()
     
-    def on_file_loaded(self, subject_code, file_path):
-        """Обработка загрузки файла"""
-        # Создаем новый анализ в дереве
-        analysis_index = self.tree_manager.add_analysis_to_subject(subject_code, {
-            'file_name': 'Загрузка...',
-            'params': {
-                'start_freq': 0,
-                'end_freq': 0,
-                'record_time': 0
-            }
-        })
-        
-        if analysis_index is not None:
-            # Парсим файл
-            success, result = self.data_manager.parse_file(subject_code, file_path, analysis_index)
-            
-            if success:
-                if isinstance(result, str) and 'вручную' in result:
-                    # Файл загружен, но нужна ручная настройка параметров
-                    self.tree_manager.update_analysis_display(subject_code, analysis_index, True, result, result)
-                else:
-                    # Успешная загрузка
-                    file_name = result
-                    self.tree_manager.update_analysis_display(subject_code, analysis_index, True, file_name)
-                    
-                    # Обновляем параметры в дереве
-                    analysis_data = self.data_manager.get_analysis_data(subject_code, analysis_index)
-                    if analysis_data:
-                        self.tree_manager.update_analysis_params(subject_code, analysis_index, analysis_data['params'])
-
-
+    def on_file_data_ready(self, subject_code, analysis_index, success, file_path, result):
+        """Обработка файла, прочитанного в пуле потоков (строка анализа уже в дереве)"""
+        if success:
+            # Сохраняем данные в DataManager
+            success, result = self.data_manager.store_file_data(subject_code, file_path, analysis_index, result)
+        
+        if success:
+            if isinstance(result, str) and 'вручную' in result:
+                # Файл загружен, но нужна ручная настройка параметров
+                self.tree_manager.update_analysis_display(subject_code, analysis_index, True, result, result)
             else:
-                # Ошибка загрузки
-                self.tree_manager.update_analysis_display(subject_code, analysis_index, False, None, result)
+                # Успешная загрузка
+                file_name = result
+                self.tree_manager.update_analysis_display(subject_code, analysis_index, True, file_name)
+                
+                # Обновляем параметры в дереве
+                analysis_data = self.data_manager.get_analysis_data(subject_code, analysis_index)
+                if analysis_data:
+                    self.tree_manager.update_analysis_params(subject_code, analysis_index, analysis_data['params'])
+        else:
+            # Ошибка загрузки
+            self.tree_manager.update_analysis_display(subject_code, analysis_index, False, None, result)
     
     def on_subject_added(self, subject_code):
         """Обработка добавления нового предмета"""
@@ -193,7 +181,7 @@ class MainWindow(QMainWindow):
         logger.debug("=== ПРОВЕРКА ДАННЫХ ПЕРЕД ОТКРЫТИЕМ ГРАФИКА ===")
         has_valid_data = False
         for channel_name, channel in analysis_data['channels'].items():
-            if hasattr(channel, 'data') and channel.data is not None and not channel.data.empty:
+            if hasattr(channel, 'amplitude') and channel.amplitude.size:
                 logger.debug(f"Канал {channel_name}: данные валидны")
                 has_valid_data = True
                 break
@@ -219,11 +207,19 @@ class MainWindow(QMainWindow):
         # Регистрируем диалог
         self.data_manager.register_dialog(subject_code, analysis_index, dialog)
         
-        # Подключаем сигнал закрытия
-        dialog.finished.connect(lambda: self.on_graph_dialog_closed(subject_code, analysis_index))
+        # Подключаем сигнал закрытия: анализ диалога хранится в его свойствах,
+        # все диалоги подключены к одному обработчику без замыканий
+        dialog.setProperty('subject_code', subject_code)
+        dialog.setProperty('analysis_index', analysis_index)
+        dialog.finished.connect(self.on_graph_dialog_finished)
         
         dialog.show()
     
+    def on_graph_dialog_finished(self, result):
+        """Закрытие диалога с графиками: анализ берётся из свойств диалога-отправителя"""
+        dialog = self.sender()
+        self.on_graph_dialog_closed(dialog.property('subject_code'), dialog.property('analysis_index'))
+    
     def on_graph_dialog_closed(self, subject_code, analysis_index):
         """Обработка закрытия диалога с графиками"""
         key = (subject_code, analysis_index)
@@ -394,40 +390,45 @@ class MainWindow(QMainWindow):
         # Очищаем дерево перед загрузкой
         self.tree_manager.clear_tree()
         
-        # Загружаем предметы и анализы
-        for item in loaded_data:
-            
-            subject_code = item['subject_code']
-            subject_name = item['subject_name']
-            analysis_index = item['analysis_index']  # Индекс из DataManager
-            analysis_info = item['analysis_info']
-            file_exists = item['file_exists']
-            
-            logger.debug(f"Загрузка анализа: {subject_code}, {analysis_index}, {subject_name}")
-            
-            # Добавляем предмет, если его нет
-            if subject_code not in self.tree_manager.subject_items:
-                self.tree_manager.add_subject(subject_code)
-                logger.debug(f"Добавлен предмет: {subject_code} с именем {subject_name}")
-            
-            # Добавляем анализ с ПРАВИЛЬНЫМ индексом из DataManager
-            added_index = self.tree_manager.add_analysis_to_subject(subject_code, {
-                'file_name': analysis_info['file_name'],
-                'params': analysis_info['params']
-            }, analysis_index)  # Явно передаем индекс
-            
-            logger.debug(f"Анализ добавлен: {subject_code}, запрошенный индекс: {analysis_index}, фактический: {added_index}")
-            
-            self.tree_manager.set_subject_name(subject_code, subject_name)
+        # Загружаем предметы и анализы, дерево перерисовывается один раз в конце
+        self.tree_manager.begin_bulk_update()
+        try:
+            for item in loaded_data:
+                
+                subject_code = item['subject_code']
+                subject_name = item['subject_name']
+                analysis_index = item['analysis_index']  # Индекс из DataManager
+                analysis_info = item['analysis_info']
+                file_exists = item['file_exists']
+                
+                logger.debug(f"Загрузка анализа: {subject_code}, {analysis_index}, {subject_name}")
+                
+                # Добавляем предмет, если его нет
+                if subject_code not in self.tree_manager.subject_items:
+                    self.tree_manager.add_subject(subject_code)
+                    logger.debug(f"Добавлен предмет: {subject_code} с именем {subject_name}")
+                
+                # Добавляем анализ с ПРАВИЛЬНЫМ индексом из DataManager. Предметы остаются
+                # свёрнутыми: строки анализов создаются, когда предмет развернут
+                added_index = self.tree_manager.add_analysis_to_subject(subject_code, {
+                    'file_name': analysis_info['file_name'],
+                    'params': analysis_info['params']
+                }, analysis_index, expand=False)  # Явно передаем индекс
+                
+                logger.debug(f"Анализ добавлен: {subject_code}, запрошенный индекс: {analysis_index}, фактический: {added_index}")
+                
+                self.tree_manager.set_subject_name(subject_code, subject_name)
 
-            # Обновляем отображение
-            if file_exists:
-                self.tree_manager.update_analysis_display(subject_code, added_index, True, analysis_info['file_name'])
-            else:
-                self.tree_manager.update_analysis_display(subject_code, added_index, False, 
-                                                        analysis_info['file_name'], "Файл не найден")
-            
-            self.tree_manager.update_analysis_params(subject_code, added_index, analysis_info['params'])
+                # Обновляем отображение
+                if file_exists:
+                    self.tree_manager.update_analysis_display(subject_code, added_index, True, analysis_info['file_name'])
+                else:
+                    self.tree_manager.update_analysis_display(subject_code, added_index, False, 
+                                                            analysis_info['file_name'], "Файл не найден")
+                
+                self.tree_manager.update_analysis_params(subject_code, added_index, analysis_info['params'])
+        finally:
+            self.tree_manager.end_bulk_update()
     
     def eventFilter(self, obj, event):
         """Обработка событий"""
@@ -484,6 +485,12 @@ class MainWindow(QMainWindow):
         if success:
             self.on_log_message(f"Анализ перемещен из {old_subject} в {new_subject}")
             
+            # Открытый диалог графиков не пересоздаётся: меняются только его ключ и свойство
+            dialog = self.data_manager.open_dialogs.pop((old_subject, analysis_index), None)
+            if dialog is not None:
+                dialog.setProperty('subject_code', new_subject)
+                self.data_manager.register_dialog(new_subject, analysis_index, dialog)
+            
             # Обновляем отображение в дереве
             analysis_data = self.data_manager.get_analysis_data(new_subject, analysis_index)
             if analysis_data:
@@ -501,8 +508,7 @@ class MainWindow(QMainWindow):
         """Показать диалог сводного графика АЧХ"""
         try:
             # Проверяем, есть ли выбранные анализы
-            selected_analyses = self.tree_manager.get_selected_analyses()
-            if not selected_analyses:
+            if not self.tree_manager.has_selected_analyses():
                 QMessageBox.information(self, 'Информация', 
                                     'Выберите анализы для построения сводного графика (используйте чекбоксы)')
                 return
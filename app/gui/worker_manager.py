@@ -27,9 +27,14 @@ class WorkerManager(QObject):
     
     def start_instrument_detection(self):
         """Запуск обнаружения приборов в отдельном потоке"""
-        self.detection_thread = InstrumentDetectorThread()
-        self.detection_thread.detection_finished.connect(self.instruments_detected.emit)
-        self.detection_thread.detection_error.connect(self.instruments_detection_error.emit)
+        if self.is_detection_running():
+            return
+        
+        # Поток создаётся один раз и перезапускается, сигналы подключаются только при создании
+        if self.detection_thread is None:
+            self.detection_thread = InstrumentDetectorThread()
+            self.detection_thread.detection_finished.connect(self.instruments_detected.emit)
+            self.detection_thread.detection_error.connect(self.instruments_detection_error.emit)
         self.detection_thread.start()
     
     def start_measurement(self, generator_resource, oscilloscope_resource, 
@@ -45,13 +50,19 @@ class WorkerManager(QObject):
         
         # Подключаем сигналы
         self.measurement_thread.update_signal.connect(self.log_message.emit)
-        self.measurement_thread.progress_signal.connect(self.progress_updated.emit)
+        self.measurement_thread.progress_signal.connect(self._on_measurement_progress)
         self.measurement_thread.finished_signal.connect(self.measurement_finished.emit)
         self.measurement_thread.error_signal.connect(self.measurement_error.emit)
         
         # Запускаем поток
         self.measurement_thread.start()
     
+    def _on_measurement_progress(self, value, message):
+        """Разбор совмещённого сигнала прогресса на прогресс-бар и лог"""
+        self.progress_updated.emit(value)
+        if message:
+            self.log_message.emit(message)
+    
     def start_oscilloscope_reading(self, oscilloscope_resource, oscilloscope_type):
         """Запуск чтения данных с осциллографа"""
         self.reader_thread = OscilloscopeReaderThread(
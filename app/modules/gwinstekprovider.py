@@ -1,10 +1,9 @@
 # modules/gwinstekprovider.py
-import pandas as pd
 import logging
 from typing import Dict, Any, List, Tuple, Optional
 from core.com_provider import COMProvider
 from core.parser import Channel
-from struct import unpack
+import threading
 import time
 import re
 
@@ -35,6 +34,9 @@ class GWInstekProvider:
         self.chnum = 4
         self.connection_status = 0
         self.model_name = ""
+        # Обмен по порту последовательный: запрос и ответ канала не должны
+        # перемежаться с другими, если каналы читаются из нескольких потоков
+        self._io_lock = threading.Lock()
         
     def connect(self) -> bool:
         """Установка соединения с прибором"""
@@ -128,33 +130,35 @@ class GWInstekProvider:
             if not 1 <= ch <= self.chnum:
                 raise ValueError(f"Invalid channel number: {ch}")
                 
-            if not self.is_channel_on(ch):
-                logger.info(f"Channel {ch} is disabled")
-                return None
-            
-            # Устанавливаем заголовок ответа
-            self.com.write(":HEAD ON\n")
-            
-            # Проверяем статус acquisition
-            self._check_acq_state(ch)
-            
-            # Запрашиваем данные
-            self.com.write(f":ACQ{ch}:MEM?\n")
-            
-            # Читаем и парсим заголовок с метаданными
-            header = self._read_ascii_header()
-            metadata = self._parse_header(header)
-            
-            # Читаем бинарные данные
-            raw_data = self._read_binary_data()
+            # Под блокировкой только обмен с прибором, преобразование данных
+            # ниже может идти параллельно с чтением следующего канала
+            with self._io_lock:
+                if not self.is_channel_on(ch):
+                    logger.info(f"Channel {ch} is disabled")
+                    return None
+                
+                # Устанавливаем заголовок ответа
+                self.com.write(":HEAD ON\n")
+                
+                # Проверяем статус acquisition
+                self._check_acq_state(ch)
+                
+                # Запрашиваем данные
+                self.com.write(f":ACQ{ch}:MEM?\n")
+                
+                # Читаем и парсим заголовок с метаданными
+                header = self._read_ascii_header()
+                metadata = self._parse_header(header)
+                
+                # Читаем бинарные данные
+                raw_data = self._read_binary_data()
             
             # Создаем канал и заполняем данными
             channel = Channel(f"CH{ch}")
             channel.set_metadata_from_dict(metadata)
             
             # Преобразуем сырые данные в напряжения и временные метки
-            time_data, amplitude_data = self._convert_raw_data(raw_data, metadata)
-            channel.set_data(time_data, amplitude_data)
+            self._convert_raw_data(channel, raw_data, metadata)
             
             return channel
             
@@ -165,8 +169,7 @@ class GWInstekProvider:
                 try:
                     channel = Channel(f"CH{ch}")
                     channel.set_metadata_from_dict(metadata)
-                    time_data, amplitude_data = self._convert_raw_data(raw_data, metadata)
-                    channel.set_data(time_data, amplitude_data)
+                    self._convert_raw_data(channel, raw_data, metadata)
                     return channel
                 except Exception as inner_e:
                     logger.error(f"Failed to process partial data: {str(inner_e)}")
@@ -265,22 +268,14 @@ class GWInstekProvider:
         except Exception as e:
             raise GWInstekAcquisitionError(f"Binary data read failed: {str(e)}")
         
-    def _convert_raw_data(self, raw_data: bytes, metadata: Dict[str, Any]) -> Tuple[pd.Series, pd.Series]:
-        """Конвертация сырых данных в физические величины"""
+    def _convert_raw_data(self, channel: Channel, raw_data: bytes, metadata: Dict[str, Any]) -> None:
+        """Конвертация сырых данных в физические величины и запись в канал"""
         try:
-            points_num = len(raw_data) // 2
-            raw_values = unpack(f'>{points_num}h', raw_data)
-            
             vdiv = float(metadata.get('Vertical Scale', 1))
             dt = float(metadata.get('Sampling Period', 1))
-            vpos = float(metadata.get('Vertical Position', 0))
-            
-            dv = vdiv / 25
-            amplitudes = [float(value) * dv for value in raw_values]
-            
-            times = [i * dt for i in range(points_num)]
             
-            return pd.Series(times), pd.Series(amplitudes)
+            # 25 отсчётов АЦП на деление; байты big-endian int16 разбираются np.frombuffer
+            channel.set_raw_data(raw_data, dt, scale=vdiv / 25)
             
         except Exception as e:
             raise GWInstekAcquisitionError(f"Data conversion failed: {str(e)}")
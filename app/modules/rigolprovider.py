@@ -312,4 +312,10 @@ class RigolProvider:
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Выход не оставляем включённым, даже если работа прервалась ошибкой
+        if self.connection_status:
+            try:
+                self.set_output(False)
+            except Exception as e:
+                logger.error(f"Failed to disable output: {str(e)}")
         self.disconnect()
\ No newline at end of file
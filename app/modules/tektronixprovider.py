@@ -1,14 +1,16 @@
 # modules/tektronixprovider.py
-import pandas as pd
+import numpy as np
 import logging
 from typing import Dict, Any, List, Tuple, Optional
-from struct import unpack
+import threading
 from tm_devices import DeviceManager
 from tm_devices.drivers import MDO3K
 from core.parser import Channel
 
 logger = logging.getLogger(__name__)
 
+VISA_CHUNK_SIZE = 1024 * 1024  # Блок осциллограммы читается за несколько вызовов, а не за сотни
+
 class TektronixError(Exception):
     """Базовое исключение для ошибок Tektronix"""
     pass
@@ -31,12 +33,16 @@ class TektronixProvider:
         self.chnum = 4
         self.connection_status = 0
         self.model_name = ""
+        # DATa:SOURce и CURVe? работают с общим состоянием прибора, поэтому
+        # обмен по одному каналу не должен перемежаться с другими потоками
+        self._io_lock = threading.Lock()
         
     def connect(self) -> bool:
         """Установка соединения с прибором"""
         try:
             self.device_manager = DeviceManager(verbose=False)
             self.scope = self.device_manager.add_scope(self.resource_name)
+            self.scope.visa_resource.chunk_size = VISA_CHUNK_SIZE
             
             # Получаем информацию о устройстве
             self.model_name = self.scope.model
@@ -85,58 +91,38 @@ class TektronixProvider:
             if not 1 <= ch <= self.chnum:
                 raise ValueError(f"Invalid channel number: {ch}")
                 
-            if not self.is_channel_on(ch):
-                logger.warning(f"Channel {ch} is disabled")
-                return None
-            
-            # Настраиваем параметры данных
-            self.scope.commands.data.source.write(f"CH{ch}")
-            self.scope.commands.data.encdg.write("RIBINARY")  # Signed integer binary
-            self.scope.commands.data.width.write(2)  # 2 bytes per point
-            self.scope.commands.data.start.write(1)
-            
-            # Получаем количество точек
-            record_length = int(self.scope.commands.horizontal.recordlength.query())
-            self.scope.commands.data.stop.write(record_length)
-            
-            # Получаем параметры waveform
-            ymult = float(self.scope.commands.wfmoutpre.ymult.query())
-            yzero = float(self.scope.commands.wfmoutpre.yzero.query())
-            yoff = float(self.scope.commands.wfmoutpre.yoff.query())
-            xincr = float(self.scope.commands.wfmoutpre.xincr.query())
-            
-            # Используем низкоуровневые методы для чтения бинарных данных
-            self.scope.write("CURVe?")
-            
-            # Читаем сырые бинарные данные
-            raw_data = self.scope.read_raw()
-            
-            # Обрабатываем бинарный формат TEKTRONIX
-            if not raw_data.startswith(b'#'):
-                raise TektronixAcquisitionError("Invalid binary data format")
-            
-            # Получаем количество цифр в длине данных
-            n_digits = int(raw_data[1:2])
-            
-            # Извлекаем длину данных
-            data_length_str = raw_data[2:2+n_digits].decode('ascii')
-            data_length = int(data_length_str)
-            
-            # Извлекаем бинарные данные (пропускаем заголовок)
-            header_length = 2 + n_digits
-            binary_data = raw_data[header_length:header_length + data_length]
-            
-            # Преобразуем сырые данные в напряжения
-            points_num = len(binary_data) // 2
-            raw_values = unpack(f'>{points_num}h', binary_data)
-            amplitudes = [(value - yoff) * ymult + yzero for value in raw_values]
-            
-            # Создаем временную ось
-            times = [i * xincr for i in range(points_num)]
+            # Под блокировкой только обмен с прибором, разбор данных ниже
+            # может идти параллельно с чтением следующего канала
+            with self._io_lock:
+                if not self.is_channel_on(ch):
+                    logger.warning(f"Channel {ch} is disabled")
+                    return None
+                
+                # Настраиваем параметры данных
+                self.scope.commands.data.source.write(f"CH{ch}")
+                self.scope.commands.data.encdg.write("RIBINARY")  # Signed integer binary
+                self.scope.commands.data.width.write(2)  # 2 bytes per point
+                self.scope.commands.data.start.write(1)
+                
+                # Получаем количество точек
+                record_length = int(self.scope.commands.horizontal.recordlength.query())
+                self.scope.commands.data.stop.write(record_length)
+                
+                # Получаем параметры waveform
+                ymult = float(self.scope.commands.wfmoutpre.ymult.query())
+                yzero = float(self.scope.commands.wfmoutpre.yzero.query())
+                yoff = float(self.scope.commands.wfmoutpre.yoff.query())
+                xincr = float(self.scope.commands.wfmoutpre.xincr.query())
+                
+                # Блок IEEE-488.2 разбирает pyvisa: заголовок #<n><длина> проверяется
+                # и отбрасывается, отсчёты int16 (MSB first) приходят сразу массивом
+                raw_values = self.scope.visa_resource.query_binary_values(
+                    "CURVe?", datatype='h', is_big_endian=True, container=np.ndarray
+                )
             
-            # Создаем канал и заполняем данными
+            # Создаем канал: напряжения и временная ось считаются векторно по отсчётам
             channel = Channel(f"CH{ch}")
-            channel.set_data(pd.Series(times), pd.Series(amplitudes))
+            channel.set_raw_data(raw_values, xincr, scale=ymult, offset=yzero, raw_offset=yoff)
             
             return channel
             
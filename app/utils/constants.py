@@ -1,11 +1,20 @@
 #utils/constants.py
 
+from PyQt6.QtWidgets import QFileDialog
+
 # Стили кнопок
 BUTTON_STYLE_SUCCESS = 'background-color: rgba(76, 150, 80, 60);'
 BUTTON_STYLE_ERROR = 'background-color: rgba(160, 80, 80, 60);'
 BUTTON_STYLE_NORMAL = 'background-color: rgba(200, 200, 200, 60);'
 BUTTON_STYLE_WARNING = 'background-color: rgba(252, 215, 3, 60);'
 BUTTON_STYLE_ACTIVE = 'background-color: rgba(70, 130, 180, 60);'
+# Стили кнопок по состоянию загрузки файла
+BUTTON_STYLES = {
+    'success': BUTTON_STYLE_SUCCESS,
+    'error': BUTTON_STYLE_ERROR,
+    'warning': BUTTON_STYLE_WARNING,
+    'normal': BUTTON_STYLE_NORMAL,
+}
 BUTTON_STYLE_MEASURE = '''
     QPushButton {
         background-color: rgba(70, 130, 180, 180);
@@ -49,6 +58,22 @@ TABLE_HEADERS = [
     'Параметр 4'
 ]
 
+# Заголовки дерева предметов и анализов
+TREE_HEADERS = [
+    'Выбор', 
+    'Код предмета', 
+    'Файл анализа', 
+    'Графики', 
+    'Начальная частота (Гц)', 
+    'Конечная частота (Гц)', 
+    'Время записи (сек)'
+]
+# Полные названия столбцов дерева во всплывающих подсказках: перенос строки
+# в заголовке делает высоту заголовка переменной
+TREE_HEADER_TOOLTIPS = {
+    3: 'Графики и подстройка значений',
+}
+
 # Параметры по умолчанию
 DEFAULT_PARAMS = {
     'start_freq': 100,
@@ -65,4 +90,7 @@ DEFAULT_PARAMS = {
 # Пути и файлы
 MEASUREMENTS_DIR = 'measurements'
 TABLES_DIR = 'tables'
-ANALYSIS_EXTENSION = '*.analysis'
\ No newline at end of file
+ANALYSIS_EXTENSION = '*.analysis'
+# Диалог выбора файлов данных: без запроса значков папок у системы и без операций
+# переименования/удаления, на Windows и macOS остаётся нативным
+OPEN_DIALOG_OPTIONS = QFileDialog.Option.DontUseCustomDirectoryIcons | QFileDialog.Option.ReadOnly
\ No newline at end of file
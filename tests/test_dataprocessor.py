@@ -0,0 +1,34 @@
+# tests/test_dataprocessor.py
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from core.dataprocessor import _trailing_mean, SMOOTHING_WINDOW
+
+
+def _pandas_trailing_mean(values, window, absolute):
+    """Прежний расчёт через pandas: rolling по развёрнутой строке"""
+    rows = np.abs(values) if absolute else values
+    return np.vstack([
+        pd.Series(row.astype(np.float64))[::-1].rolling(window, min_periods=1).mean()[::-1].to_numpy()
+        for row in rows
+    ])
+
+
+@pytest.mark.parametrize('absolute', [False, True])
+@pytest.mark.parametrize('with_nan', [False, True])
+def test_trailing_mean_matches_pandas(absolute, with_nan):
+    values = np.random.default_rng(0).normal(size=(3, 200)).astype(np.float32)
+    if with_nan:
+        values[0, 50] = np.nan  # Одиночный пропуск
+        values[1, 100:140] = np.nan  # Пропуск длиннее окна
+        values[2, -3:] = np.nan  # Пропуск на хвосте
+
+    result = _trailing_mean(values, SMOOTHING_WINDOW, np.empty(values.shape), absolute=absolute)
+
+    np.testing.assert_allclose(result, _pandas_trailing_mean(values, SMOOTHING_WINDOW, absolute))